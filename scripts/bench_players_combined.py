@@ -0,0 +1,333 @@
+import os
+import re
+import time
+import argparse
+from typing import Dict, List
+
+import duckdb
+
+from utils import logger
+from utils.duckdb_sink import retype_table
+
+
+# ============================================================
+# CONFIG
+# ============================================================
+
+# Timing comparison for base.players_combined: the legacy single-query combine
+# (TRY_CAST joins + SELECT DISTINCT over the raw tables) vs the keyed combine over the
+# typed staging views (sqlmesh/models/staging). Runs in an in-memory DuckDB; the raw
+# tables are either generated (--synthetic-seasons; legacy all-VARCHAR, or typed the way
+# utils.duckdb_sink stores them with --typed) or read from an existing database (READ_ONLY).
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(REPO_ROOT, "sqlmesh", "models")
+
+DEFAULT_DUCKDB_PATH = os.getenv(
+    "DUCKDB_PATH",
+    "/Users/dhite/Documents/GitHub/nba26duckdb/database/nba.duckdb",
+)
+
+ENDPOINTS = ["traditional", "advanced", "fourfactors", "scoring", "misc"]
+STAGING_MODELS = ["log_table"] + [f"players_{endpoint}" for endpoint in ENDPOINTS]
+
+# base.players_combined before the staging layer, kept verbatim for the comparison
+LEGACY_COMBINE_SQL = """
+WITH joined AS (
+  SELECT DISTINCT
+    TRY_CAST(lt.season_id AS BIGINT) AS seasonId,
+    TRY_CAST(lt.team_id AS BIGINT) AS teamId,
+    lt.team_abbreviation AS teamAbbreviation,
+    lt.team_name AS teamName,
+    CAST(lt.game_id AS VARCHAR) AS gameId,
+    TRY_CAST(lt.game_date AS DATE) AS gameDate,
+    lt.matchup AS matchup,
+    lt.wl AS winLoss,
+    TRY_CAST(COALESCE(pf.personid, pa.personid, pm.personid, ps.personid, pt.personid) AS BIGINT) AS personId,
+    COALESCE(pf.firstname, pa.firstname, pm.firstname, ps.firstname, pt.firstname) AS firstName,
+    COALESCE(pf.familyname, pa.familyname, pm.familyname, ps.familyname, pt.familyname) AS familyName,
+    COALESCE(pf.playerslug, pa.playerslug, pm.playerslug, ps.playerslug, pt.playerslug) AS playerSlug,
+    COALESCE(pf.position, pa.position, pm.position, ps.position, pt.position) AS position,
+    COALESCE(pf.comment, pa.comment, pm.comment, ps.comment, pt.comment) AS comment,
+    COALESCE(pf.teamcity, pa.teamcity, pm.teamcity, ps.teamcity, pt.teamcity) AS teamCity,
+    COALESCE(pf.minutes, pa.minutes, pm.minutes, ps.minutes, pt.minutes) AS minutes,
+    TRY_CAST(pt.points AS DOUBLE) AS points,
+    TRY_CAST(pt.fieldgoalsmade AS DOUBLE) AS fieldGoalsMade,
+    TRY_CAST(pt.fieldgoalsattempted AS DOUBLE) AS fieldGoalsAttempted,
+    TRY_CAST(pt.fieldgoalspercentage AS DOUBLE) AS fieldGoalsPercentage,
+    TRY_CAST(pt.threepointersmade AS DOUBLE) AS threePointersMade,
+    TRY_CAST(pt.threepointersattempted AS DOUBLE) AS threePointersAttempted,
+    TRY_CAST(pt.threepointerspercentage AS DOUBLE) AS threePointersPercentage,
+    TRY_CAST(pt.freethrowsmade AS DOUBLE) AS freeThrowsMade,
+    TRY_CAST(pt.freethrowsattempted AS DOUBLE) AS freeThrowsAttempted,
+    TRY_CAST(pt.freethrowspercentage AS DOUBLE) AS freeThrowsPercentage,
+    TRY_CAST(pt.reboundsoffensive AS DOUBLE) AS reboundsOffensive,
+    TRY_CAST(pt.reboundsdefensive AS DOUBLE) AS reboundsDefensive,
+    TRY_CAST(pt.reboundstotal AS DOUBLE) AS reboundsTotal,
+    TRY_CAST(pt.assists AS DOUBLE) AS assists,
+    TRY_CAST(pt.steals AS DOUBLE) AS steals,
+    COALESCE(TRY_CAST(pm.blocks AS DOUBLE), TRY_CAST(pt.blocks AS DOUBLE)) AS blocks,
+    COALESCE(TRY_CAST(pm.foulspersonal AS DOUBLE), TRY_CAST(pt.foulspersonal AS DOUBLE)) AS foulsPersonal,
+    TRY_CAST(pt.turnovers AS DOUBLE) AS turnovers,
+    TRY_CAST(pt.plusminuspoints AS DOUBLE) AS plusMinusPoints,
+    TRY_CAST(pa.estimatedoffensiverating AS DOUBLE) AS estimatedOffensiveRating,
+    TRY_CAST(pa.offensiverating AS DOUBLE) AS offensiveRating,
+    TRY_CAST(pa.estimateddefensiverating AS DOUBLE) AS estimatedDefensiveRating,
+    TRY_CAST(pa.defensiverating AS DOUBLE) AS defensiveRating,
+    TRY_CAST(pa.estimatednetrating AS DOUBLE) AS estimatedNetRating,
+    TRY_CAST(pa.netrating AS DOUBLE) AS netRating,
+    TRY_CAST(pa.assistpercentage AS DOUBLE) AS assistPercentage,
+    TRY_CAST(pa.assisttoturnover AS DOUBLE) AS assistToTurnover,
+    TRY_CAST(pa.assistratio AS DOUBLE) AS assistRatio,
+    COALESCE(TRY_CAST(pf.offensivereboundpercentage AS DOUBLE), TRY_CAST(pa.offensivereboundpercentage AS DOUBLE)) AS offensiveReboundPercentage,
+    TRY_CAST(pa.defensivereboundpercentage AS DOUBLE) AS defensiveReboundPercentage,
+    TRY_CAST(pa.reboundpercentage AS DOUBLE) AS reboundPercentage,
+    TRY_CAST(pf.teamturnoverpercentage AS DOUBLE) AS teamTurnoverPercentage,
+    COALESCE(TRY_CAST(pf.effectivefieldgoalpercentage AS DOUBLE), TRY_CAST(pa.effectivefieldgoalpercentage AS DOUBLE)) AS effectiveFieldGoalPercentage,
+    TRY_CAST(pa.trueshootingpercentage AS DOUBLE) AS trueShootingPercentage,
+    TRY_CAST(pa.usagepercentage AS DOUBLE) AS usagePercentage,
+    TRY_CAST(pa.estimatedusagepercentage AS DOUBLE) AS estimatedUsagePercentage,
+    TRY_CAST(pa.estimatedpace AS DOUBLE) AS estimatedPace,
+    TRY_CAST(pa.pace AS DOUBLE) AS pace,
+    TRY_CAST(pa.paceper40 AS DOUBLE) AS pacePer40,
+    TRY_CAST(pa.possessions AS DOUBLE) AS possessions,
+    TRY_CAST(pa.pie AS DOUBLE) AS PIE,
+    TRY_CAST(pf.freethrowattemptrate AS DOUBLE) AS freeThrowAttemptRate,
+    TRY_CAST(pf.oppeffectivefieldgoalpercentage AS DOUBLE) AS oppEffectiveFieldGoalPercentage,
+    TRY_CAST(pf.oppfreethrowattemptrate AS DOUBLE) AS oppFreeThrowAttemptRate,
+    TRY_CAST(pf.oppteamturnoverpercentage AS DOUBLE) AS oppTeamTurnoverPercentage,
+    TRY_CAST(pf.oppoffensivereboundpercentage AS DOUBLE) AS oppOffensiveReboundPercentage,
+    TRY_CAST(pm.pointsoffturnovers AS DOUBLE) AS pointsOffTurnovers,
+    TRY_CAST(pm.pointssecondchance AS DOUBLE) AS pointsSecondChance,
+    TRY_CAST(pm.pointsfastbreak AS DOUBLE) AS pointsFastBreak,
+    TRY_CAST(pm.pointspaint AS DOUBLE) AS pointsPaint,
+    TRY_CAST(pm.opppointsoffturnovers AS DOUBLE) AS oppPointsOffTurnovers,
+    TRY_CAST(pm.opppointssecondchance AS DOUBLE) AS oppPointsSecondChance,
+    TRY_CAST(pm.opppointsfastbreak AS DOUBLE) AS oppPointsFastBreak,
+    TRY_CAST(pm.opppointspaint AS DOUBLE) AS oppPointsPaint,
+    TRY_CAST(pm.blocksagainst AS DOUBLE) AS blocksAgainst,
+    TRY_CAST(pm.foulsdrawn AS DOUBLE) AS foulsDrawn,
+    TRY_CAST(ps.percentagefieldgoalsattempted2pt AS DOUBLE) AS percentageFieldGoalsAttempted2pt,
+    TRY_CAST(ps.percentagefieldgoalsattempted3pt AS DOUBLE) AS percentageFieldGoalsAttempted3pt,
+    TRY_CAST(ps.percentagepoints2pt AS DOUBLE) AS percentagePoints2pt,
+    TRY_CAST(ps.percentagepointsmidrange2pt AS DOUBLE) AS percentagePointsMidrange2pt,
+    TRY_CAST(ps.percentagepoints3pt AS DOUBLE) AS percentagePoints3pt,
+    TRY_CAST(ps.percentagepointsfastbreak AS DOUBLE) AS percentagePointsFastBreak,
+    TRY_CAST(ps.percentagepointsfreethrow AS DOUBLE) AS percentagePointsFreeThrow,
+    TRY_CAST(ps.percentagepointsoffturnovers AS DOUBLE) AS percentagePointsOffTurnovers,
+    TRY_CAST(ps.percentagepointspaint AS DOUBLE) AS percentagePointsPaint,
+    TRY_CAST(ps.percentageassisted2pt AS DOUBLE) AS percentageAssisted2pt,
+    TRY_CAST(ps.percentageunassisted2pt AS DOUBLE) AS percentageUnassisted2pt,
+    TRY_CAST(ps.percentageassisted3pt AS DOUBLE) AS percentageAssisted3pt,
+    TRY_CAST(ps.percentageunassisted3pt AS DOUBLE) AS percentageUnassisted3pt,
+    TRY_CAST(ps.percentageassistedfgm AS DOUBLE) AS percentageAssistedFGM,
+    TRY_CAST(ps.percentageunassistedfgm AS DOUBLE) AS percentageUnassistedFGM
+  FROM raw.log_table lt
+  LEFT JOIN raw.players_traditional pt
+    ON TRY_CAST(lt.game_id AS BIGINT) = TRY_CAST(pt.gameid AS BIGINT)
+   AND lt.team_abbreviation = pt.teamtricode
+  LEFT JOIN raw.players_advanced pa
+    ON TRY_CAST(pt.gameid AS BIGINT) = TRY_CAST(pa.gameid AS BIGINT)
+   AND TRY_CAST(pt.personid AS BIGINT) = TRY_CAST(pa.personid AS BIGINT)
+  LEFT JOIN raw.players_fourfactors pf
+    ON TRY_CAST(pa.gameid AS BIGINT) = TRY_CAST(pf.gameid AS BIGINT)
+   AND TRY_CAST(pa.personid AS BIGINT) = TRY_CAST(pf.personid AS BIGINT)
+  LEFT JOIN raw.players_scoring ps
+    ON TRY_CAST(pf.gameid AS BIGINT) = TRY_CAST(ps.gameid AS BIGINT)
+   AND TRY_CAST(pf.personid AS BIGINT) = TRY_CAST(ps.personid AS BIGINT)
+  LEFT JOIN raw.players_misc pm
+    ON TRY_CAST(ps.gameid AS BIGINT) = TRY_CAST(pm.gameid AS BIGINT)
+   AND TRY_CAST(ps.personid AS BIGINT) = TRY_CAST(pm.personid AS BIGINT)
+)
+SELECT * FROM joined WHERE gameDate IS NOT NULL
+"""
+
+
+# ============================================================
+# MODEL RENDERING
+# ============================================================
+
+def render_model(relpath: str, start: str, end: str) -> str:
+    """Model query with the MODEL block stripped and @start_date / @end_date filled in."""
+    with open(os.path.join(MODELS_DIR, relpath)) as f:
+        sql = f.read()
+    sql = re.sub(r"^MODEL \(.*?\n\);\n", "", sql, count=1, flags=re.S)
+    sql = sql.replace("@start_date", f"DATE '{start}'").replace("@end_date", f"DATE '{end}'")
+    return sql.strip().rstrip(";")
+
+
+def _raw_columns(endpoint: str) -> List[str]:
+    """Raw player columns a staging model reads (p.<col>)."""
+    with open(os.path.join(MODELS_DIR, "staging", f"players_{endpoint}.sql")) as f:
+        cols = re.findall(r"\bp\.(\w+)", f.read())
+    return list(dict.fromkeys(["gameid"] + cols))
+
+
+# ============================================================
+# DATA
+# ============================================================
+
+def generate_raw(conn, seasons: int, players_per_team: int = 13) -> None:
+    """
+    Legacy all-VARCHAR raw tables: 1230 regular season games per season from 2015-16 on,
+    two log rows per game and `players_per_team` player rows per team-game per endpoint.
+    """
+    conn.execute("CREATE SCHEMA IF NOT EXISTS raw;")
+    conn.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _games AS
+        SELECT
+            s,
+            gi,
+            2015 + s AS y,
+            '002' || RIGHT(CAST(2015 + s AS VARCHAR), 2) || LPAD(CAST(gi + 1 AS VARCHAR), 5, '0') AS game_id,
+            CAST(MAKE_DATE(2015 + s, 10, 20) + CAST(gi * 170 // 1230 AS INTEGER) AS VARCHAR) AS game_date,
+            gi % 30 + 1 AS home,
+            (gi % 30 + 1 + gi % 29) % 30 + 1 AS away
+        FROM range({seasons}) r1(s), range(1230) r2(gi);
+        """
+    )
+    conn.execute(
+        """
+        CREATE OR REPLACE TABLE raw.log_table AS
+        SELECT
+            '2' || CAST(y AS VARCHAR) AS season_id,
+            CAST(team AS VARCHAR) AS team_id,
+            'T' || LPAD(CAST(team AS VARCHAR), 2, '0') AS team_abbreviation,
+            'Team ' || CAST(team AS VARCHAR) AS team_name,
+            game_id,
+            game_date,
+            'T' || LPAD(CAST(team AS VARCHAR), 2, '0') || CASE WHEN is_home THEN ' vs. ' ELSE ' @ ' END
+                || 'T' || LPAD(CAST(opp AS VARCHAR), 2, '0') AS matchup,
+            CASE WHEN (hash(game_id) % 2 = 0) = is_home THEN 'W' ELSE 'L' END AS wl
+        FROM (
+            SELECT y, game_id, game_date, home AS team, away AS opp, TRUE AS is_home FROM _games
+            UNION ALL
+            SELECT y, game_id, game_date, away AS team, home AS opp, FALSE AS is_home FROM _games
+        );
+        """
+    )
+    text_cols = {"firstname", "familyname", "playerslug", "position", "comment", "teamcity", "minutes", "teamtricode"}
+    for endpoint in ENDPOINTS:
+        select = []
+        for col in _raw_columns(endpoint):
+            if col == "gameid":
+                select.append("l.game_id AS gameid")
+            elif col == "teamid":
+                select.append("l.team_id AS teamid")
+            elif col == "personid":
+                select.append("CAST(CAST(l.team_id AS INTEGER) * 100 + k AS VARCHAR) AS personid")
+            elif col == "teamtricode":
+                select.append("l.team_abbreviation AS teamtricode")
+            elif col == "minutes":
+                select.append("CAST(10 + k AS VARCHAR) || ':00' AS minutes")
+            elif col in text_cols:
+                select.append(f"'{col}_' || CAST(k AS VARCHAR) AS {col}")
+            else:
+                select.append(f"CAST(ROUND(random() * 30, 1) AS VARCHAR) AS {col}")
+        conn.execute(
+            f"""
+            CREATE OR REPLACE TABLE raw.players_{endpoint} AS
+            SELECT {', '.join(select)}
+            FROM raw.log_table l, range({players_per_team}) r(k);
+            """
+        )
+
+
+def attach_raw(conn, duckdb_path: str) -> None:
+    """Expose an existing database's raw tables as views (the source is opened READ_ONLY)."""
+    conn.execute(f"ATTACH '{duckdb_path}' AS src (READ_ONLY);")
+    conn.execute("CREATE SCHEMA IF NOT EXISTS raw;")
+    for table in ["log_table"] + [f"players_{endpoint}" for endpoint in ENDPOINTS]:
+        conn.execute(f"CREATE OR REPLACE VIEW raw.{table} AS SELECT * FROM src.raw.{table};")
+
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+
+def _timed(conn, label: str, sql: str, timings: Dict[str, float]) -> None:
+    start = time.perf_counter()
+    conn.execute(sql)
+    timings[label] = time.perf_counter() - start
+
+
+def create_staging_views(conn) -> None:
+    conn.execute("CREATE SCHEMA IF NOT EXISTS staging;")
+    conn.execute("CREATE SCHEMA IF NOT EXISTS base;")
+    for model in STAGING_MODELS:
+        conn.execute(f"CREATE OR REPLACE VIEW staging.{model} AS {render_model(f'staging/{model}.sql', '', '')}")
+
+
+def _build_staged(conn, start: str, end: str, timings: Dict[str, float], prefix: str) -> None:
+    _timed(
+        conn,
+        f"{prefix} keyed combine",
+        f"CREATE OR REPLACE TABLE base.players_combined AS {render_model('base/players_combined.sql', start, end)}",
+        timings,
+    )
+
+
+def run_benchmark(conn, repeat: int = 3) -> Dict[str, float]:
+    """
+    Best-of-`repeat` wall times for:
+      - legacy combine over all history (what every run used to pay)
+      - keyed combine over the staging views, all history (full rebuild)
+      - keyed combine for the latest game date only (nightly run)
+    """
+    first, last = conn.execute("SELECT MIN(TRY_CAST(game_date AS DATE)), MAX(TRY_CAST(game_date AS DATE)) FROM raw.log_table").fetchone()
+    first, last = str(first), str(last)
+    n_log, n_players = conn.execute(
+        "SELECT (SELECT COUNT(*) FROM raw.log_table), (SELECT COUNT(*) FROM raw.players_traditional)"
+    ).fetchone()
+    logger.info(f"Raw data: {n_log} log rows, {n_players} player rows per endpoint ({first} .. {last})")
+
+    create_staging_views(conn)
+    best: Dict[str, float] = {}
+    for _ in range(max(1, repeat)):
+        timings: Dict[str, float] = {}
+        _timed(conn, "legacy combine (full)", f"CREATE OR REPLACE TEMP TABLE legacy_combined AS {LEGACY_COMBINE_SQL}", timings)
+        _build_staged(conn, first, last, timings, "full:")
+        _build_staged(conn, last, last, timings, "nightly:")
+        for label, seconds in timings.items():
+            best[label] = min(best.get(label, seconds), seconds)
+
+    _build_staged(conn, first, last, {}, "check:")
+    legacy_rows = conn.execute("SELECT COUNT(*) FROM legacy_combined").fetchone()[0]
+    staged_rows = conn.execute("SELECT COUNT(*) FROM base.players_combined").fetchone()[0]
+    logger.info(f"Row check: legacy {legacy_rows}, staged {staged_rows}")
+    return best
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Time base.players_combined: legacy TRY_CAST joins vs typed staging views")
+    parser.add_argument("--duckdb-path", default="", help=f"Benchmark an existing database (read-only), e.g. {DEFAULT_DUCKDB_PATH}.")
+    parser.add_argument("--synthetic-seasons", type=int, default=5, help="Seasons of generated data when no --duckdb-path is given.")
+    parser.add_argument("--typed", action="store_true", help="Convert the generated raw tables to typed columns first (as ingest --retype-raw).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per step (best time is reported).")
+    args = parser.parse_args()
+
+    conn = duckdb.connect()
+    try:
+        if args.duckdb_path:
+            attach_raw(conn, args.duckdb_path)
+        else:
+            generate_raw(conn, args.synthetic_seasons)
+            if args.typed:
+                for table in ["log_table"] + [f"players_{endpoint}" for endpoint in ENDPOINTS]:
+                    retype_table(conn, "raw", table)
+
+        best = run_benchmark(conn, repeat=args.repeat)
+        width = max(len(label) for label in best)
+        for label, seconds in best.items():
+            logger.info(f"{label.ljust(width)}  {seconds:8.3f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
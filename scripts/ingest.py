@@ -1,27 +1,59 @@
 import os
-import time
-import random
+import json
 import argparse
 from datetime import datetime
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import pandas as pd
 from dotenv import load_dotenv, find_dotenv
-from requests.exceptions import Timeout
-from urllib3.exceptions import ReadTimeoutError
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-import nba_api.stats.endpoints as ep
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from utils import logger
+from utils.rate_limit import STATS_LIMITER, FetchError
+from utils.payload_cache import PAYLOAD_CACHE
 from utils.duckdb_sink import (
     get_duckdb_conn,
     upsert_delete_insert,
     existing_gameids,
+    manifest_hashes,
+    recent_gameids,
+    record_failed,
+    merge_manifest,
+    reset_manifest,
     table_info,
     upsert_log,
+    log_game_dates,
+    missing_log_rows,
+    backing_off,
+    clear_retries,
+    due_retries,
+    enqueue_retries,
+    merge_retry_queue,
+    replace_table_from_parquet,
+    retype_table,
     DUCKDB_SCHEMA,
 )
+from utils.league_game_log import fetch_bulk_traditional
+from utils.nba_fetch import (
+    ENDPOINTS,
+    NBA_FETCH_WORKERS,
+    NBA_LOG_OVERLAP_DAYS,
+    SEASON_TYPES,
+    FlushPolicy,
+    fetch_games_all_endpoints,
+    fetch_log_delta,
+    filter_season_types,
+    game_dates_from_log,
+    get_nba_season,
+    payload_hashes,
+)
+from utils.parquet_archive import (
+    archive_files,
+    archived_gameids,
+    compact_season,
+    season_from_gameid,
+)
+from utils.sinks import SINK_ERROR, ArchiveSink, DuckDBSink, SinkFanout, SnowflakeSink
 
 # ============================================================
 # CONFIG
@@ -30,46 +62,66 @@ from utils.duckdb_sink import (
 load_dotenv(find_dotenv())
 BASE_PATH = os.getcwd()
 
-ENDPOINTS = ["advanced", "fourfactors", "misc", "scoring", "traditional"]
-FD = {
-    "advanced": ep.boxscoreadvancedv3.BoxScoreAdvancedV3,
-    "fourfactors": ep.boxscorefourfactorsv3.BoxScoreFourFactorsV3,
-    "misc": ep.boxscoremiscv3.BoxScoreMiscV3,
-    "scoring": ep.boxscorescoringv3.BoxScoreScoringV3,
-    "traditional": ep.boxscoretraditionalv3.BoxScoreTraditionalV3,
-}
-
 DEFAULT_DUCKDB_PATH = os.getenv(
     "DUCKDB_PATH",
     "/Users/dhite/Documents/GitHub/nba26duckdb/database/nba.duckdb",
 )
 
-NBA_FETCH_WORKERS = int(os.getenv("NBA_FETCH_WORKERS", "8"))
+# Correction sweep (--sweep-corrections): re-check games played in the last N days
+NBA_SWEEP_DAYS = int(os.getenv("NBA_SWEEP_DAYS", "3"))
 
-# ============================================================
-# PATH HELPERS
-# ============================================================
-
-def get_nba_season(date=None) -> str:
-    date = date or datetime.today()
-    year = date.year
-    start = year - 1 if date.month <= 7 else year
-    end = start + 1
-    return f"{start}-{str(end)[-2:]}"
+# Bulk-first mode (--bulk-first): traditional box scores come from league-wide
+# LeagueGameLog pulls (a few requests per run); per-game calls only for games it lacks.
+# Bulk rows are final: they have no starters/bench split (one 'Totals' team row), no DNP
+# players and no position / comment / jerseyNum / playerSlug. Games inside the correction
+# sweep window still get their full box score from --sweep-corrections.
+NBA_BULK_FIRST = os.getenv("NBA_BULK_FIRST", "0") == "1"
 
+# Multi-season backfill (--seasons): one season per worker process, each writing its own
+# staging DuckDB; the request-rate budget is split evenly between the processes.
+NBA_BACKFILL_PROCS = int(os.getenv("NBA_BACKFILL_PROCS", "4"))
+NBA_STAGING_DIR = os.getenv("NBA_STAGING_DIR", os.path.join(BASE_PATH, "data", "staging"))
 
-def _local_file_paths(endpoint: str, season: str) -> Tuple[str, str]:
-    team_path = os.path.join(BASE_PATH, "data", "raw", "teams", endpoint, f"teams_{endpoint}{season}.csv")
-    players_path = os.path.join(BASE_PATH, "data", "raw", "players", endpoint, f"players_{endpoint}{season}.csv")
-    return team_path, players_path
-
+# ============================================================
+# SINKS / FETCH RESULTS
+# ============================================================
 
-def _append_df_to_csv(df: pd.DataFrame, path: str) -> None:
-    if df is None or df.empty:
-        return
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    write_header = not os.path.exists(path)
-    df.to_csv(path, mode="a", index=False, header=write_header)
+def _sink_fanout(duck_conn, game_dates: Dict[str, str], sf_pool=None) -> SinkFanout:
+    """DuckDB raw tables + Parquet archive, plus Snowflake NBA.RAW when a pool is given."""
+    sinks = [DuckDBSink(duck_conn), ArchiveSink(game_dates)]
+    if sf_pool is not None:
+        sinks.append(SnowflakeSink(sf_pool))
+    return SinkFanout(sinks)
+
+
+def _record_fetch_results(
+    duck_conn,
+    work: Dict[str, List[str]],
+    ok: Dict[str, List[str]],
+    failures: Optional[Dict[str, Dict[str, Tuple[str, str]]]] = None,
+    sink_failures: Optional[Dict[str, Dict[str, List[str]]]] = None,
+) -> None:
+    """
+    Failed (endpoint, game) pairs: manifest attempt + raw.fetch_retry_queue entry with the
+    error class (backoff grows across runs). Fetched pairs leave the retry queue.
+    Games fetched but not written by the DuckDB sink (SinkFanout.close()) count as failed,
+    with the SINK_ERROR class.
+    """
+    failures = failures or {}
+    unwritten = (sink_failures or {}).get(DuckDBSink.name, {})
+    for endpoint, gids in work.items():
+        not_written = set(unwritten.get(endpoint, []))
+        fetched = sorted(set(ok.get(endpoint, [])) - not_written)
+        failed = sorted(set(gids) - set(fetched))
+        try:
+            clear_retries(duck_conn, endpoint, fetched)
+            if failed:
+                record_failed(duck_conn, endpoint, failed)
+                errors = dict(failures.get(endpoint, {}))
+                errors.update({g: (SINK_ERROR, "DuckDB write failed") for g in not_written})
+                enqueue_retries(duck_conn, endpoint, {g: errors.get(g, ("unknown", "not stored")) for g in failed})
+        except Exception as e:
+            logger.error(f"{endpoint}: manifest / retry queue update failed: {e}")
 
 
 # ============================================================
@@ -105,125 +157,40 @@ def ingest_lines_simple(duck_conn) -> None:
 # LOG
 # ============================================================
 
-def fetch_log() -> Tuple[pd.DataFrame, Set[str]]:
-    """
-    Fetch full season log, write to local cached CSV, return (log_df, distinct_game_ids)
-    """
-    season = get_nba_season()
-    log_dir = os.path.join(BASE_PATH, "data", "raw", "log")
-    log_file = os.path.join(log_dir, f"log{season}.csv")
-
-    try:
-        result = ep.leaguegamefinder.LeagueGameFinder(season_nullable=season)
-        all_games = result.get_data_frames()[0]
-
-        rs = all_games[(all_games.SEASON_ID == "2" + season[:4]) & (all_games.GAME_ID.str.startswith("002"))]
-        ps = all_games[(all_games.SEASON_ID == "4" + season[:4]) & (all_games.GAME_ID.str.startswith("004"))]
-        cup = all_games[(all_games.SEASON_ID == "6" + season[:4]) & (all_games.GAME_ID.str.startswith("006"))]
-
-        log_df = pd.concat([rs, ps, cup], ignore_index=True)
-        game_ids = {str(g).zfill(10) for g in log_df["GAME_ID"]}
-
-        os.makedirs(log_dir, exist_ok=True)
-        log_df.to_csv(log_file, index=False)
-        logger.info(f"Wrote log CSV {log_file} ({len(log_df)} team-rows).")
-
-        return log_df, game_ids
-
-    except Exception as e:
-        logger.error(f"Failed live fetch; loading cached log {season}: {e}")
-        if not os.path.exists(log_file):
-            raise
-        log_df = pd.read_csv(log_file, dtype={"GAME_ID": str})
-        game_ids = {str(g).zfill(10) for g in log_df["GAME_ID"]}
-        return log_df, game_ids
-
-
-# ============================================================
-# NBA API FETCH (RETRIES) + PARALLEL BATCH FETCH
-# ============================================================
-
-def get_game(func, gid: str):
-    retries = 0
-    max_retries = 3
-
-    while retries < max_retries:
-        try:
-            game = func(game_id=gid).get_data_frames()
-            return game[0], game[1]  # players_df, teams_df
-        except (TimeoutError, Timeout, ReadTimeoutError):
-            retries += 1
-            time.sleep(random.uniform(0.2, 0.8) * (retries + 1))
-        except Exception as e:
-            logger.error(f"Permanent fail for {gid}: {e}")
-            return None, None
-
-    logger.error(f"Max retries exceeded for {gid}")
-    return None, None
-
-
-def fetch_games_for_endpoint(endpoint: str, gids: List[str], max_workers: int) -> Tuple[pd.DataFrame, pd.DataFrame, List[str]]:
+def refresh_log(
+    duck_conn,
+    season: Optional[str] = None,
+    season_types: Optional[List[str]] = None,
+    overlap_days: int = NBA_LOG_OVERLAP_DAYS,
+) -> Tuple[pd.DataFrame, Set[str]]:
     """
-    Fetch many gameids in parallel for one endpoint.
-    Returns: (players_df, teams_df, ok_gids)
+    fetch_log + raw.log_table upsert of only new/changed rows (plus any cached rows
+    raw.log_table is missing, e.g. a fresh database). Returns (log_df, distinct_game_ids).
     """
-    func = FD[endpoint]
-
-    players_frames: List[pd.DataFrame] = []
-    teams_frames: List[pd.DataFrame] = []
-    ok: List[str] = []
-
-    def _fetch(gid: str):
-        p, t = get_game(func, gid)
-        return gid, p, t
-
-    with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futures = {ex.submit(_fetch, gid): gid for gid in gids}
-        for fut in as_completed(futures):
-            gid, p, t = fut.result()
-            if p is None or t is None or p.empty or t.empty:
-                continue
-            players_frames.append(p)
-            teams_frames.append(t)
-            ok.append(gid)
-
-    players_df = pd.concat(players_frames, ignore_index=True) if players_frames else pd.DataFrame()
-    teams_df = pd.concat(teams_frames, ignore_index=True) if teams_frames else pd.DataFrame()
-
-    return players_df, teams_df, ok
-
+    season = season or get_nba_season()
+    season_types = season_types or list(SEASON_TYPES)
+    full_df, changed = fetch_log_delta(season, overlap_days=overlap_days)
 
-# ============================================================
-# DUCKDB UPSERT (BATCH)
-# ============================================================
-
-def upsert_endpoint_batch(duck_conn, endpoint: str, teams_df: pd.DataFrame, players_df: pd.DataFrame) -> None:
-    """
-    Batch upsert for an endpoint (one call per table).
-    """
-    ts, tt, tkeys = table_info(endpoint, is_team=True)
-    ps, pt, pkeys = table_info(endpoint, is_team=False)
+    log_df = filter_season_types(full_df, season, season_types)
+    missing = missing_log_rows(duck_conn, log_df)
+    changed = filter_season_types(changed, season, season_types)
+    to_upsert = pd.concat([changed, missing], ignore_index=True) if not missing.empty else changed
+    upsert_log(duck_conn, to_upsert)
 
-    if teams_df is not None and not teams_df.empty:
-        upsert_delete_insert(duck_conn, teams_df, schema=ts, table=tt, key_cols=tkeys)
-    if players_df is not None and not players_df.empty:
-        upsert_delete_insert(duck_conn, players_df, schema=ps, table=pt, key_cols=pkeys)
+    game_ids = {str(g).zfill(10) for g in log_df["GAME_ID"]}
+    return log_df, game_ids
 
 
 # ============================================================
 # FAST INGEST + FAST RESCRAPE
 # ============================================================
 
-def ingest_daily(duck_conn) -> None:
+def ingest_daily(duck_conn, stream: bool = False, bulk_first: bool = NBA_BULK_FIRST, sf_pool=None) -> None:
     """
     Fast ingest:
-      - log upsert
       - lines ingest (DuckDB reads dir)
-      - per endpoint:
-          * compute needed gids
-          * fetch all needed gids in parallel
-          * batch upsert once per table
-          * write CSV backup directly from fetched dfs (no DuckDB readback)
+      - due retry-queue fetches, then the current season via ingest_season
+      - sf_pool (utils.snowflake_sink.SnowflakePool): also MERGE every batch into Snowflake
     """
     # DuckDB performance knobs (safe)
     try:
@@ -232,62 +199,139 @@ def ingest_daily(duck_conn) -> None:
     except Exception:
         pass
 
-    season = get_nba_season()
-    log_df, season_games = fetch_log()
-    upsert_log(duck_conn, log_df)
-
     # lines
     try:
         ingest_lines_simple(duck_conn)
     except Exception as e:
         logger.error(f"Lines ingest failed: {e}")
 
-    logger.info(f"--- Ingest start (season={season}) ---")
-
-    for endpoint in ENDPOINTS:
-        stored = existing_gameids(duck_conn, endpoint)
-        needed = sorted(season_games - stored)
+    drain_retry_queue(duck_conn, stream=stream, sf_pool=sf_pool)
+    ingest_season(duck_conn, get_nba_season(), stream=stream, bulk_first=bulk_first, sf_pool=sf_pool)
 
-        logger.info(f"{endpoint}: {len(needed)} games missing")
 
-        if not needed:
-            continue
+def drain_retry_queue(duck_conn, stream: bool = False, sf_pool=None) -> int:
+    """
+    Re-fetch queued failures whose backoff has expired (raw.fetch_retry_queue, any season),
+    in priority order. Games that fail again are re-queued with a longer backoff.
+    Returns the number of (endpoint, game) pairs recovered.
+    """
+    work = due_retries(duck_conn, ENDPOINTS)
+    if not work:
+        return 0
 
-        # 1) fetch all missing games (parallel)
-        players_df, teams_df, ok_gids = fetch_games_for_endpoint(endpoint, needed, max_workers=NBA_FETCH_WORKERS)
+    logger.info(f"--- Retry queue: {sum(len(g) for g in work.values())} due fetches ---")
+    game_dates = log_game_dates(duck_conn, sorted({g for gids in work.values() for g in gids}))
 
-        if not ok_gids:
-            logger.warning(f"{endpoint}: no games fetched successfully")
-            continue
+    fanout = _sink_fanout(duck_conn, game_dates, sf_pool)
+    failures: Dict[str, Dict[str, Tuple[str, str]]] = {}
+    policy = FlushPolicy.streaming() if stream else FlushPolicy.pipelined()
+    try:
+        ok = fetch_games_all_endpoints(
+            work, max_workers=NBA_FETCH_WORKERS, on_batch=fanout, policy=policy, failures=failures
+        )
+    finally:
+        sink_failures = fanout.close()
+    _record_fetch_results(duck_conn, work, ok, failures, sink_failures)
+
+    unwritten = sink_failures.get(DuckDBSink.name, {})
+    recovered = sum(len(set(g) - set(unwritten.get(endpoint, []))) for endpoint, g in ok.items())
+    logger.info(f"--- Retry queue: {recovered} recovered ---")
+    return recovered
+
+
+def ingest_season(
+    duck_conn,
+    season: str,
+    season_types: Optional[List[str]] = None,
+    stream: bool = False,
+    bulk_first: bool = False,
+    sf_pool=None,
+) -> int:
+    """
+    Ingest one season's missing games:
+      - log upsert
+      - compute needed gids for every endpoint (season games minus raw.ingest_manifest,
+        minus failures still backing off in raw.fetch_retry_queue)
+      - bulk_first=True: traditional games from league-wide game logs (utils.league_game_log)
+      - fetch all (endpoint, gid) pairs through one shared pool
+      - per batch (every NBA_PIPELINE_GAMES games, or N games / M rows with stream=True)
+        the sinks (utils.sinks) write in parallel on their own threads while fetching
+        continues: DuckDB upsert + manifest, Parquet backup from the fetched dfs, and
+        Snowflake MERGE when sf_pool is given
+    Sink queues are bounded, so fetching pauses while writers catch up; stream=True also
+    caps the fetch buffers by memory.
+    Re-running skips games already stored, so an interrupted run resumes where it stopped.
+    Returns the number of season games still missing for some endpoint.
+    """
+    log_df, season_games = refresh_log(duck_conn, season, season_types)
+    PAYLOAD_CACHE.note_game_dates(log_df)
+    game_dates = game_dates_from_log(log_df)
 
-        # 2) one batch upsert per table
-        try:
-            upsert_endpoint_batch(duck_conn, endpoint, teams_df, players_df)
-        except Exception as e:
-            logger.error(f"{endpoint}: batch upsert failed: {e}")
-            continue
+    logger.info(f"--- Ingest start (season={season}, stream={stream}) ---")
 
-        # 3) CSV backup (fast: write from dfs we already have)
-        try:
-            team_file, player_file = _local_file_paths(endpoint, season)
-            _append_df_to_csv(teams_df, team_file)
-            _append_df_to_csv(players_df, player_file)
-        except Exception as e:
-            logger.error(f"{endpoint}: CSV backup failed: {e}")
+    work: Dict[str, List[str]] = {}
+    for endpoint in ENDPOINTS:
+        stored = existing_gameids(duck_conn, endpoint, sorted(season_games))
+        waiting = backing_off(duck_conn, endpoint, sorted(season_games - stored))
+        work[endpoint] = sorted(season_games - stored - waiting)
+        logger.info(f"{endpoint}: {len(work[endpoint])} games missing ({len(waiting)} in retry backoff)")
+
+    fanout = _sink_fanout(duck_conn, game_dates, sf_pool)
+    failures: Dict[str, Dict[str, Tuple[str, str]]] = {}
+    policy = FlushPolicy.streaming() if stream else FlushPolicy.pipelined()
+    try:
+        if bulk_first and work.get("traditional"):
+            try:
+                players_df, teams_df, bulk_ok = fetch_bulk_traditional(season, work["traditional"], game_dates)
+            except FetchError as e:
+                logger.error(f"Bulk traditional fetch failed, using box scores: {e}")
+                bulk_ok = []
+            if bulk_ok:
+                # no payload hash: the correction sweep treats these games as changed and
+                # replaces them with full box scores
+                fanout("traditional", players_df, teams_df, bulk_ok, hashes={})
+                work["traditional"] = sorted(set(work["traditional"]) - set(bulk_ok))
+                logger.info(f"traditional: {len(work['traditional'])} games left for box score requests")
+
+        ok = fetch_games_all_endpoints(
+            work, max_workers=NBA_FETCH_WORKERS, on_batch=fanout, policy=policy, failures=failures
+        )
+    finally:
+        sink_failures = fanout.close()
+    _record_fetch_results(duck_conn, work, ok, failures, sink_failures)
 
-        logger.info(f"{endpoint}: inserted {len(set(ok_gids))} games")
+    missing = set()
+    for endpoint, gids in work.items():
+        missing |= set(gids) - set(ok.get(endpoint, []))
+        missing |= set(gids) & set(sink_failures.get(DuckDBSink.name, {}).get(endpoint, []))
 
-    logger.info("--- Ingest done ---")
+    logger.info(f"--- Ingest done (season={season}, {len(missing)} games still missing) ---")
+    return len(missing)
 
 
-def rescrape_games(duck_conn, gameids: List[str]) -> None:
+def _only_gids(df: pd.DataFrame, gids: Set[str]) -> pd.DataFrame:
+    if df is None or df.empty:
+        return df
+    gid_col = next(c for c in df.columns if c.lower() == "gameid")
+    return df[df[gid_col].astype(str).str.zfill(10).isin(gids)]
+
+
+def rescrape_games(
+    duck_conn,
+    gameids: List[str],
+    stream: bool = False,
+    only_changed: bool = False,
+    sf_pool=None,
+) -> Dict[str, List[str]]:
     """
     Fast rescrape:
-      - for each endpoint:
-          * fetch all gids in parallel
-          * batch upsert once per table
+      - fetch all (endpoint, gid) pairs through one shared pool
+      - hand every batch to the sinks (see ingest_season; stream=True as in ingest_daily),
+        replacing the games' rows and Parquet archive files
       - refresh log (optional)
       - refresh lines (optional)
+    only_changed=True skips games whose payload hash matches raw.ingest_manifest
+    (nothing to rewrite). Returns {endpoint: rewritten gids}.
     """
     # DuckDB performance knobs (safe)
     try:
@@ -296,33 +340,58 @@ def rescrape_games(duck_conn, gameids: List[str]) -> None:
     except Exception:
         pass
 
-    season = get_nba_season()
     gids = [str(g).zfill(10) for g in gameids]
     gids_set = set(gids)
 
-    logger.info(f"--- Rescrape start: {len(gids_set)} games ---")
-
-    for endpoint in ENDPOINTS:
-        players_df, teams_df, ok_gids = fetch_games_for_endpoint(endpoint, gids, max_workers=NBA_FETCH_WORKERS)
-
-        if not ok_gids:
-            logger.warning(f"Rescrape {endpoint}: nothing fetched")
-            continue
-
-        try:
-            upsert_endpoint_batch(duck_conn, endpoint, teams_df, players_df)
-        except Exception as e:
-            logger.error(f"Rescrape {endpoint}: batch upsert failed: {e}")
-            continue
+    game_dates = log_game_dates(duck_conn, sorted(gids_set))
+    changed: Dict[str, List[str]] = {endpoint: [] for endpoint in ENDPOINTS}
+    # read before the sinks start writing the manifest
+    stored: Dict[str, Dict[str, str]] = {}
+    if only_changed:
+        stored = {endpoint: manifest_hashes(duck_conn, endpoint, sorted(gids_set)) for endpoint in ENDPOINTS}
+        for endpoint, known in stored.items():
+            unknown = sum(1 for g in gids_set if not known.get(g))
+            if unknown:
+                logger.warning(f"Rescrape {endpoint}: {unknown} games have no stored payload hash, rewriting them")
+
+    logger.info(f"--- Rescrape start: {len(gids_set)} games (only_changed={only_changed}) ---")
+
+    fanout = _sink_fanout(duck_conn, game_dates, sf_pool)
+
+    def _on_batch(endpoint: str, players_df: pd.DataFrame, teams_df: pd.DataFrame, ok_gids: List[str]) -> None:
+        hashes = payload_hashes(endpoint, ok_gids)
+        if only_changed:
+            dirty = {g for g in ok_gids if hashes.get(g) is None or hashes.get(g) != stored[endpoint].get(g)}
+            if not dirty:
+                logger.info(f"Rescrape {endpoint}: {len(set(ok_gids))} games unchanged")
+                return
+            teams_df, players_df = _only_gids(teams_df, dirty), _only_gids(players_df, dirty)
+            ok_gids = [g for g in ok_gids if g in dirty]
+
+        fanout(endpoint, players_df, teams_df, ok_gids, hashes=hashes)
+        changed[endpoint].extend(ok_gids)
+
+    work = {endpoint: sorted(gids_set) for endpoint in ENDPOINTS}
+    failures: Dict[str, Dict[str, Tuple[str, str]]] = {}
+    policy = FlushPolicy.streaming() if stream else FlushPolicy.pipelined()
+    try:
+        ok = fetch_games_all_endpoints(
+            work, max_workers=NBA_FETCH_WORKERS, on_batch=_on_batch, refresh=True, policy=policy, failures=failures
+        )
+    finally:
+        sink_failures = fanout.close()
+    _record_fetch_results(duck_conn, work, ok, failures, sink_failures)
 
-        # Optional: refresh CSVs for just these gids (your old logic read+rewrite CSVs).
-        # If you want speed over perfect CSV hygiene, you can skip rewriting.
-        logger.info(f"Rescrape {endpoint}: updated {len(set(ok_gids))} games")
+    # games the DuckDB sink could not write were not rewritten
+    for endpoint, failed in sink_failures.get(DuckDBSink.name, {}).items():
+        changed[endpoint] = [g for g in changed[endpoint] if g not in set(failed)]
+    for endpoint, gids in changed.items():
+        if gids:
+            logger.info(f"Rescrape {endpoint}: updated {len(set(gids))} games")
 
     # refresh log table
     try:
-        log_df, _ = fetch_log()
-        upsert_log(duck_conn, log_df)
+        refresh_log(duck_conn)
     except Exception as e:
         logger.error(f"Rescrape: log refresh failed: {e}")
 
@@ -333,6 +402,235 @@ def rescrape_games(duck_conn, gameids: List[str]) -> None:
         logger.error(f"Rescrape: lines refresh failed: {e}")
 
     logger.info("--- Rescrape done ---")
+    return changed
+
+
+def sweep_corrections(duck_conn, days: int = NBA_SWEEP_DAYS, out_path: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Nightly stat-correction sweep:
+      - refresh the log, then re-fetch every game played in the last `days` days
+      - rewrite only games whose payload hash changed (rescrape_games only_changed=True)
+      - write the changed gameIds / dates as JSON (for date-limited SQLMesh runs)
+    Returns {gameId: [endpoints rewritten]}.
+    """
+    log_df, _ = refresh_log(duck_conn, overlap_days=max(days, NBA_LOG_OVERLAP_DAYS))
+    PAYLOAD_CACHE.note_game_dates(log_df)
+
+    recent = recent_gameids(duck_conn, days)
+    logger.info(f"--- Correction sweep: {len(recent)} games in the last {days} days ---")
+    if not recent:
+        return {}
+
+    changed = rescrape_games(duck_conn, sorted(recent), only_changed=True)
+
+    by_game: Dict[str, List[str]] = {}
+    for endpoint, gids in changed.items():
+        for gid in gids:
+            by_game.setdefault(gid, []).append(endpoint)
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "days": days,
+        "games_checked": len(recent),
+        "dates": sorted({recent[g] for g in by_game if recent.get(g)}),
+        "changed": [{"gameId": g, "gameDate": recent.get(g), "endpoints": eps} for g, eps in sorted(by_game.items())],
+    }
+    out_path = out_path or os.path.join(BASE_PATH, "data", "corrections", f"corrections_{datetime.now():%Y%m%d}.json")
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    logger.info(f"Correction sweep: {len(by_game)} games changed on {report['dates']} -> {out_path}")
+    return by_game
+
+
+# ============================================================
+# MAINTENANCE (REBUILD FROM ARCHIVE / RETYPE)
+# ============================================================
+
+def rebuild_from_archive(duck_conn) -> None:
+    """
+    Reload every raw teams_/players_ table straight from the Parquet archive - no API calls.
+    Each season is compacted first, so every game lives in exactly one indexed file.
+    """
+    logger.info("--- Rebuild from archive start ---")
+
+    for endpoint in ENDPOINTS:
+        for is_team in (True, False):
+            kind = "teams" if is_team else "players"
+            schema, table, _ = table_info(endpoint, is_team=is_team)
+
+            try:
+                for season in {season_from_gameid(g) for g in archived_gameids(kind, endpoint)}:
+                    compact_season(kind, endpoint, season)
+                files = archive_files(kind, endpoint)
+                if not files:
+                    logger.warning(f"Rebuild {schema}.{table}: no archived files")
+                    continue
+                cnt = replace_table_from_parquet(duck_conn, schema, table, files)
+                logger.info(f"Rebuild {schema}.{table}: {cnt} rows")
+            except Exception as e:
+                logger.error(f"Rebuild {schema}.{table} failed: {e}")
+
+        # manifest is re-seeded from the rebuilt tables on next use
+        reset_manifest(duck_conn, endpoint)
+
+    logger.info("--- Rebuild from archive done ---")
+
+
+def retype_raw_tables(duck_conn) -> None:
+    """
+    One-off migration of legacy all-TEXT raw tables to typed storage
+    (see utils.duckdb_sink.retype_table).
+    """
+    tables = [table_info(endpoint, is_team=is_team)[:2] for endpoint in ENDPOINTS for is_team in (True, False)]
+    tables.append((DUCKDB_SCHEMA, "log_table"))
+
+    for schema, table in tables:
+        try:
+            types = retype_table(duck_conn, schema, table)
+            typed = sum(1 for t in types.values() if t != "VARCHAR")
+            logger.info(f"Retype {schema}.{table}: {typed}/{len(types)} columns typed")
+        except Exception as e:
+            logger.error(f"Retype {schema}.{table} failed: {e}")
+
+
+# ============================================================
+# MULTI-SEASON BACKFILL (PROCESS POOL + STAGING SHARDS)
+# ============================================================
+
+CHECKPOINT_TABLE = "backfill_checkpoint"
+
+
+def _season_range(arg: str) -> List[str]:
+    """
+    Accepts:
+      - "2015-16:2025-26"  (inclusive range)
+      - "2019-20,2021-22"  (comma or space separated)
+    """
+    seasons: List[str] = []
+    for part in arg.replace(",", " ").split():
+        first, _, last = part.partition(":")
+        start, end = int(first[:4]), int((last or first)[:4])
+        seasons.extend(f"{y}-{str(y + 1)[-2:]}" for y in range(start, end + 1))
+    return list(dict.fromkeys(seasons))
+
+
+def _staging_path(season: str, season_types: List[str]) -> str:
+    return os.path.join(NBA_STAGING_DIR, f"{season}_{'-'.join(season_types)}.duckdb")
+
+
+def _checkpoints(duck_conn, season_types: List[str]) -> Dict[str, str]:
+    duck_conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {DUCKDB_SCHEMA}.{CHECKPOINT_TABLE} (
+            season TEXT,
+            season_types TEXT,
+            status TEXT,
+            missing BIGINT,
+            updated_at TIMESTAMP,
+            PRIMARY KEY (season, season_types)
+        );
+        """
+    )
+    rows = duck_conn.execute(
+        f"SELECT season, status FROM {DUCKDB_SCHEMA}.{CHECKPOINT_TABLE} WHERE season_types = ?",
+        [",".join(season_types)],
+    ).fetchall()
+    return dict(rows)
+
+
+def _set_checkpoint(duck_conn, season: str, season_types: List[str], status: str, missing: int) -> None:
+    duck_conn.execute(
+        f"INSERT OR REPLACE INTO {DUCKDB_SCHEMA}.{CHECKPOINT_TABLE} VALUES (?, ?, ?, ?, now())",
+        [season, ",".join(season_types), status, missing],
+    )
+
+
+def _init_backfill_worker(n_procs: int) -> None:
+    STATS_LIMITER.share(n_procs)
+
+
+def _backfill_worker(season: str, season_types: List[str], staging_path: str, stream: bool) -> int:
+    """Runs in a worker process: ingest one season into its own staging DuckDB."""
+    conn = get_duckdb_conn(staging_path)
+    try:
+        return ingest_season(conn, season, season_types, stream=stream)
+    finally:
+        conn.close()
+
+
+def _merge_staging(duck_conn, staging_path: str) -> None:
+    """Upsert a season's staging shard (raw tables, log, manifest, retry queue) into the main DuckDB."""
+    duck_conn.execute(f"ATTACH '{staging_path}' AS stg (READ_ONLY);")
+    try:
+        tables = [table_info(endpoint, is_team=is_team) for endpoint in ENDPOINTS for is_team in (True, False)]
+        tables.append((DUCKDB_SCHEMA, "log_table", ["game_id", "team_id"]))
+
+        for schema, table, key_cols in tables:
+            try:
+                df = duck_conn.execute(f'SELECT * FROM stg.{schema}."{table}"').df()
+            except Exception:
+                continue
+            upsert_delete_insert(duck_conn, df, schema=schema, table=table, key_cols=key_cols)
+
+        merge_manifest(duck_conn, "stg")
+        merge_retry_queue(duck_conn, "stg")
+    finally:
+        duck_conn.execute("DETACH stg;")
+
+
+def backfill_seasons(
+    duck_conn,
+    seasons: List[str],
+    season_types: Optional[List[str]] = None,
+    procs: int = NBA_BACKFILL_PROCS,
+    stream: bool = False,
+) -> None:
+    """
+    Backfill many seasons, one season shard per worker process:
+      - each worker runs ingest_season into <NBA_STAGING_DIR>/<season>_<types>.duckdb
+        (Parquet segments are per season partition; appends to a table's shared
+        _index.log are serialized across the workers by its flock)
+      - the main process merges each shard as soon as its worker finishes
+      - raw.backfill_checkpoint records merged seasons; a complete shard is deleted
+    Re-running the same command resumes: merged seasons are skipped and unfinished
+    shards pick up from their own manifest.
+    """
+    season_types = season_types or list(SEASON_TYPES)
+    done = _checkpoints(duck_conn, season_types)
+    todo = [s for s in seasons if done.get(s) != "merged"]
+    logger.info(f"--- Backfill start: {len(todo)}/{len(seasons)} seasons to do ({','.join(season_types)}) ---")
+    if not todo:
+        return
+
+    os.makedirs(NBA_STAGING_DIR, exist_ok=True)
+    n_procs = max(1, min(procs, len(todo)))
+
+    with ProcessPoolExecutor(max_workers=n_procs, initializer=_init_backfill_worker, initargs=(n_procs,)) as ex:
+        futs = {
+            ex.submit(_backfill_worker, season, season_types, _staging_path(season, season_types), stream): season
+            for season in todo
+        }
+        for fut in as_completed(futs):
+            season = futs[fut]
+            staging_path = _staging_path(season, season_types)
+            try:
+                missing = fut.result()
+                _merge_staging(duck_conn, staging_path)
+            except Exception as e:
+                logger.error(f"Backfill {season} failed: {e}")
+                continue
+
+            status = "merged" if missing == 0 else "partial"
+            _set_checkpoint(duck_conn, season, season_types, status, missing)
+            if status == "merged":
+                for path in (staging_path, f"{staging_path}.wal"):
+                    if os.path.exists(path):
+                        os.remove(path)
+            logger.info(f"Backfill {season}: {status} ({missing} games missing)")
+
+    logger.info("--- Backfill done ---")
 
 
 # ============================================================
@@ -359,13 +657,88 @@ def main():
     parser.add_argument("--ingest", action="store_true", help="Run daily ingestion (fast).")
     parser.add_argument("--rescrape", default="", help="Rescrape games (comma or space separated gameIds).")
     parser.add_argument("--rescrape-file", default="", help="Path to text file with gameIds (one per line).")
+    parser.add_argument(
+        "--rebuild-from-archive",
+        action="store_true",
+        help="Reload raw teams_/players_ tables from the Parquet archive (no API calls).",
+    )
+    parser.add_argument(
+        "--retype-raw",
+        action="store_true",
+        help="Migrate legacy all-TEXT raw tables to typed columns (one-off).",
+    )
+    parser.add_argument(
+        "--sweep-corrections",
+        action="store_true",
+        help="Re-fetch recent games and rewrite only those whose stats changed.",
+    )
+    parser.add_argument("--sweep-days", type=int, default=NBA_SWEEP_DAYS, help="Window for --sweep-corrections.")
+    parser.add_argument("--corrections-out", default="", help="JSON path for changed gameIds/dates.")
+    parser.add_argument(
+        "--seasons",
+        default="",
+        help='Backfill seasons, e.g. "2015-16:2025-26" or "2019-20,2021-22" (resumable).',
+    )
+    parser.add_argument(
+        "--season-types",
+        default=",".join(SEASON_TYPES),
+        help=f"Comma separated season types for --seasons ({', '.join(SEASON_TYPES)}).",
+    )
+    parser.add_argument(
+        "--backfill-procs",
+        type=int,
+        default=NBA_BACKFILL_PROCS,
+        help="Worker processes for --seasons (one season per process).",
+    )
+    parser.add_argument(
+        "--bulk-first",
+        action="store_true",
+        default=NBA_BULK_FIRST,
+        help="With --ingest: traditional stats from league-wide game logs, box scores only for games they lack.",
+    )
+    parser.add_argument(
+        "--snowflake",
+        action="store_true",
+        help="With --ingest / --rescrape: also MERGE every fetched batch into Snowflake NBA.RAW (same fetch).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Bounded-memory mode: upsert every NBA_FLUSH_GAMES games / NBA_FLUSH_ROWS rows (for backfills).",
+    )
 
     args = parser.parse_args()
+
+    season_types = [t.strip() for t in args.season_types.split(",") if t.strip()]
+    unknown = [t for t in season_types if t not in SEASON_TYPES]
+    if unknown:
+        parser.error(f"unknown season type(s): {', '.join(unknown)}")
+
     duck_conn = get_duckdb_conn(args.duckdb_path)
+    sf_pool = None
+    if args.snowflake:
+        from utils.snowflake_sink import SnowflakePool
+
+        sf_pool = SnowflakePool()
 
     try:
+        if args.rebuild_from_archive:
+            rebuild_from_archive(duck_conn)
+
+        if args.retype_raw:
+            retype_raw_tables(duck_conn)
+
+        if args.seasons:
+            backfill_seasons(
+                duck_conn,
+                _season_range(args.seasons),
+                season_types=season_types,
+                procs=args.backfill_procs,
+                stream=args.stream,
+            )
+
         if args.ingest:
-            ingest_daily(duck_conn)
+            ingest_daily(duck_conn, stream=args.stream, bulk_first=args.bulk_first, sf_pool=sf_pool)
 
         gids: List[str] = []
         gids.extend(_parse_gameids_arg(args.rescrape))
@@ -375,9 +748,14 @@ def main():
                 gids.extend([line.strip() for line in f.readlines() if line.strip()])
 
         if gids:
-            rescrape_games(duck_conn, gids)
+            rescrape_games(duck_conn, gids, stream=args.stream, sf_pool=sf_pool)
+
+        if args.sweep_corrections:
+            sweep_corrections(duck_conn, days=args.sweep_days, out_path=args.corrections_out or None)
 
     finally:
+        if sf_pool is not None:
+            sf_pool.close()
         try:
             duck_conn.close()
         except Exception:
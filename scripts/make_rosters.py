@@ -19,31 +19,22 @@ select
     personid,
     firstname,
     familyname,
-    gamedate,
-    minuteszscore,
-    pointszscore,
-    assistszscore,
-    stealszscore,
-    blockszscore,
-    reboundszscore,
-    threeszscore,
-    doubledoublezscore,
-    efgpctzscore,
-    ftpctzscore,
-    totalz,
-    last_10_z
-from (
-    select 
-        t1.*,
-        t3.totalz as last_10_z
-    from nba.fantasy.zscoresaverages t1
-    inner join nba.fantasy.averages_current t2
-        on t1.personid = t2.personid
-       and t1.gamedate = t2.gamedate
-    join nba.fantasy.zscores_last10 t3
-        on t1.personid = t3.personid
-       and t1.gamedate = t3.gamedate
-)
+    avg_gamedate as gamedate,
+    avg_minuteszscore as minuteszscore,
+    avg_pointszscore as pointszscore,
+    avg_assistszscore as assistszscore,
+    avg_stealszscore as stealszscore,
+    avg_blockszscore as blockszscore,
+    avg_reboundszscore as reboundszscore,
+    avg_threeszscore as threeszscore,
+    avg_doubledoublezscore as doubledoublezscore,
+    avg_efgpctzscore as efgpctzscore,
+    avg_ftpctzscore as ftpctzscore,
+    avg_totalz as totalz,
+    last_10_totalz as last_10_z
+from nba.fantasy.zscores_overall_current
+where avg_gamedate is not null
+  and last10_gamedate is not null
 order by totalz desc
 """
 
@@ -0,0 +1,263 @@
+import os
+import uuid
+import shutil
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from dotenv import load_dotenv, find_dotenv
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils import logger
+from utils.duckdb_sink import DUCKDB_SCHEMA, QUARANTINE_COL, get_duckdb_conn, manifest_changes, table_info
+from utils.nba_fetch import ENDPOINTS
+from utils.snowflake_sink import (
+    ROW_HASH_COL,
+    SF_DATABASE,
+    SF_RAW_SCHEMA,
+    SF_STAGE_SCHEMA,
+    ensure_row_hash_column,
+    get_snowflake_conn,
+    merge_stage,
+    row_hash_sql,
+    sf_table_info,
+)
+
+
+# ============================================================
+# CONFIG
+# ============================================================
+
+load_dotenv(find_dotenv())
+BASE_PATH = os.getcwd()
+
+DEFAULT_DUCKDB_PATH = os.getenv(
+    "DUCKDB_PATH",
+    "/Users/dhite/Documents/GitHub/nba26duckdb/database/nba.duckdb",
+)
+
+# Parallel table loads (one PUT + COPY + MERGE per table per run)
+NBA_SF_WORKERS = int(os.getenv("NBA_SF_WORKERS", "4"))
+EXPORT_DIR = os.getenv("NBA_EXPORT_DIR", os.path.join(BASE_PATH, "data", "export"))
+
+SF_STAGE = f"{SF_DATABASE}.{SF_STAGE_SCHEMA}.REPLICATION"
+WATERMARK_TABLE = "replication_watermark"
+
+
+# ============================================================
+# WATERMARKS (DuckDB side)
+# ============================================================
+
+def _ensure_watermarks(duck_conn) -> None:
+    duck_conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {DUCKDB_SCHEMA}.{WATERMARK_TABLE} (
+            target TEXT PRIMARY KEY,
+            watermark TIMESTAMP,
+            rows_sent BIGINT,
+            updated_at TIMESTAMP
+        );
+        """
+    )
+
+
+def get_watermark(duck_conn, target: str) -> Optional[datetime]:
+    _ensure_watermarks(duck_conn)
+    row = duck_conn.execute(
+        f"SELECT watermark FROM {DUCKDB_SCHEMA}.{WATERMARK_TABLE} WHERE target = ?", [target]
+    ).fetchone()
+    return row[0] if row else None
+
+
+def set_watermark(duck_conn, target: str, watermark: Optional[datetime], rows_sent: int) -> None:
+    _ensure_watermarks(duck_conn)
+    duck_conn.execute(
+        f"INSERT OR REPLACE INTO {DUCKDB_SCHEMA}.{WATERMARK_TABLE} VALUES (?, ?, ?, now())",
+        [target, watermark, rows_sent],
+    )
+
+
+# ============================================================
+# EXPORT (DuckDB -> Parquet)
+# ============================================================
+
+def _targets() -> List[Tuple[Optional[str], str, str, str, List[str]]]:
+    """
+    (manifest endpoint, duckdb table, snowflake target table, gameId column, snowflake key cols)
+    LOG_TABLE follows the games of every endpoint (endpoint None).
+    """
+    targets = []
+    for endpoint in ENDPOINTS:
+        for is_team in (True, False):
+            _, table, _ = table_info(endpoint, is_team=is_team)
+            sf_table, _, sf_keys = sf_table_info(endpoint, is_team)
+            targets.append((endpoint, table, sf_table, "gameid", sf_keys))
+    targets.append((None, "log_table", "LOG_TABLE", "game_id", ["GAME_ID", "TEAM_ID"]))
+    return targets
+
+
+def export_rows(
+    duck_conn,
+    table: str,
+    gid_col: str,
+    gids: List[str],
+    path: str,
+    key_cols: List[str],
+) -> Tuple[int, List[str]]:
+    """
+    Write the raw rows of the given games (plus their row hash) to a snappy Parquet file.
+    Returns (row count, uppercase column names). The quarantine column stays local.
+    """
+    cols = [d[0] for d in duck_conn.execute(f'SELECT * FROM {DUCKDB_SCHEMA}."{table}" LIMIT 0').description]
+    cols = [c for c in cols if c != QUARANTINE_COL]
+    select_list = ", ".join([f'"{c}" AS "{c.upper()}"' for c in cols])
+    row_hash = row_hash_sql([f'"{c}"' for c in cols], [f'"{k.lower()}"' for k in key_cols])
+    select_list += f', {row_hash} AS "{ROW_HASH_COL}"'
+
+    duck_conn.register("repl_gids", pd.DataFrame({"gid": gids}))
+    try:
+        duck_conn.execute(
+            f"""
+            COPY (
+                SELECT {select_list}
+                FROM {DUCKDB_SCHEMA}."{table}"
+                WHERE "{gid_col}" IN (SELECT gid FROM repl_gids)
+            ) TO '{path}' (FORMAT parquet, COMPRESSION snappy);
+            """
+        )
+    finally:
+        duck_conn.unregister("repl_gids")
+
+    n = duck_conn.execute(f"SELECT COUNT(*) FROM read_parquet('{path}')").fetchone()[0]
+    return n, [c.upper() for c in cols] + [ROW_HASH_COL]
+
+
+# ============================================================
+# LOAD (Parquet -> stage -> MERGE)
+# ============================================================
+
+def load_table(sf_conn, path: str, run_id: str, target_table: str, columns: List[str], key_cols: List[str]) -> None:
+    """
+    PUT one Parquet file to the internal stage, COPY it into a stage table, MERGE into
+    NBA.RAW (replacing bulk game-log rows of the games it carries, see merge_stage).
+    """
+    stage_table = f"{target_table}_REPL"
+    col_defs = ", ".join([f"{c} STRING" for c in columns])
+
+    with sf_conn.cursor() as cur:
+        ensure_row_hash_column(cur, f"{SF_DATABASE}.{SF_RAW_SCHEMA}.{target_table}")
+        cur.execute(f"CREATE OR REPLACE TABLE {SF_DATABASE}.{SF_STAGE_SCHEMA}.{stage_table} ({col_defs})")
+        cur.execute(f"PUT file://{path} @{SF_STAGE}/{run_id} AUTO_COMPRESS=FALSE OVERWRITE=TRUE")
+        cur.execute(
+            f"""
+            COPY INTO {SF_DATABASE}.{SF_STAGE_SCHEMA}.{stage_table}
+            FROM @{SF_STAGE}/{run_id}/{os.path.basename(path)}
+            FILE_FORMAT = (TYPE = PARQUET)
+            MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+            PURGE = TRUE
+            """
+        )
+        merge_stage(cur, target_table, stage_table, columns, key_cols)
+        cur.execute(f"DROP TABLE IF EXISTS {SF_DATABASE}.{SF_STAGE_SCHEMA}.{stage_table}")
+
+
+# ============================================================
+# REPLICATE
+# ============================================================
+
+def replicate(duck_conn, sf_conn, workers: int = NBA_SF_WORKERS, full: bool = False) -> Dict[str, int]:
+    """
+    Incremental DuckDB raw -> Snowflake NBA.RAW replication:
+      - per target, games whose raw.ingest_manifest fetched_at is past the target's watermark
+        (every stored game with full=True / on the first run)
+      - export their rows to Parquet, then PUT + COPY + MERGE, tables loaded in parallel
+      - a target's watermark only advances after its MERGE succeeds
+    Returns {snowflake table: rows sent}.
+    """
+    run_id = f"{datetime.now():%Y%m%d%H%M%S}_{uuid.uuid4().hex[:8]}"
+    run_dir = os.path.join(EXPORT_DIR, run_id)
+    os.makedirs(run_dir, exist_ok=True)
+
+    with sf_conn.cursor() as cur:
+        cur.execute(f"CREATE STAGE IF NOT EXISTS {SF_STAGE}")
+
+    logger.info(f"--- Replication start ({run_id}, full={full}) ---")
+
+    # 1) export (DuckDB connection stays on this thread)
+    jobs = []
+    for endpoint, table, sf_table, gid_col, sf_keys in _targets():
+        since = None if full else get_watermark(duck_conn, sf_table)
+        gids, newest = manifest_changes(duck_conn, endpoint, since)
+        if not gids:
+            logger.info(f"{sf_table}: up to date")
+            continue
+        try:
+            path = os.path.join(run_dir, f"{table}.parquet")
+            n, columns = export_rows(duck_conn, table, gid_col, gids, path, sf_keys)
+        except Exception as e:
+            logger.error(f"{sf_table}: export failed: {e}")
+            continue
+        if n == 0:
+            set_watermark(duck_conn, sf_table, newest, 0)
+            continue
+        jobs.append((sf_table, path, columns, sf_keys, newest, n))
+
+    # 2) load in parallel, advance watermarks as tables finish
+    sent: Dict[str, int] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+            futs = {
+                ex.submit(load_table, sf_conn, path, run_id, sf_table, columns, sf_keys): (sf_table, newest, n)
+                for sf_table, path, columns, sf_keys, newest, n in jobs
+            }
+            for fut in as_completed(futs):
+                sf_table, newest, n = futs[fut]
+                try:
+                    fut.result()
+                except Exception as e:
+                    logger.error(f"{sf_table}: load failed: {e}")
+                    continue
+                set_watermark(duck_conn, sf_table, newest, n)
+                sent[sf_table] = n
+                logger.info(f"{sf_table}: merged {n} rows")
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    logger.info(f"--- Replication done: {sum(sent.values())} rows to {len(sent)} tables ---")
+    return sent
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Replicate changed DuckDB raw rows to Snowflake (no API calls)")
+    parser.add_argument("--duckdb-path", default=DEFAULT_DUCKDB_PATH)
+    parser.add_argument("--workers", type=int, default=NBA_SF_WORKERS, help="Tables loaded in parallel.")
+    parser.add_argument("--full", action="store_true", help="Ignore watermarks and send every stored game.")
+    parser.add_argument(
+        "--fake-snowflake",
+        default="",
+        help="Path of a local DuckDB file standing in for Snowflake (utils.fake_snowflake).",
+    )
+    args = parser.parse_args()
+
+    duck_conn = get_duckdb_conn(args.duckdb_path)
+    if args.fake_snowflake:
+        from utils.fake_snowflake import FakeSnowflakeConnection
+
+        sf_conn = FakeSnowflakeConnection(args.fake_snowflake)
+    else:
+        sf_conn = get_snowflake_conn()
+
+    try:
+        replicate(duck_conn, sf_conn, workers=args.workers, full=args.full)
+    finally:
+        sf_conn.close()
+        duck_conn.close()
+
+
+if __name__ == "__main__":
+    main()
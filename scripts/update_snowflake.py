@@ -1,19 +1,32 @@
 import os
-import time
-import random
 import argparse
-from datetime import datetime
 
 import pandas as pd
 from dotenv import load_dotenv, find_dotenv
-from requests.exceptions import Timeout
-from urllib3.exceptions import ReadTimeoutError
-import nba_api.stats.endpoints as ep
 
-from snowflake.connector import connect
 from snowflake.connector.pandas_tools import write_pandas
 
 from utils import logger
+from utils.payload_cache import PAYLOAD_CACHE
+from utils.nba_fetch import (
+    ENDPOINTS,
+    NBA_FETCH_WORKERS,
+    FlushPolicy,
+    fetch_games_all_endpoints,
+    fetch_log,
+    game_dates_from_log,
+    get_nba_season,
+)
+from utils.parquet_archive import archived_gameids, compact_in_background, read_archive
+from utils.sinks import ArchiveSink, SinkFanout, SnowflakeSink
+from utils.snowflake_sink import (
+    SnowflakePool,
+    get_snowflake_conn,
+    run_async,
+    run_parallel,
+    sf_table_info,
+    upsert_to_snowflake,
+)
 
 
 # ============================================================
@@ -23,91 +36,6 @@ from utils import logger
 load_dotenv(find_dotenv())
 BASE_PATH = os.getcwd()
 
-ENDPOINTS = ["advanced", "fourfactors", "misc", "scoring", "traditional"]
-
-FD = {
-    "advanced": ep.boxscoreadvancedv3.BoxScoreAdvancedV3,
-    "fourfactors": ep.boxscorefourfactorsv3.BoxScoreFourFactorsV3,
-    "misc": ep.boxscoremiscv3.BoxScoreMiscV3,
-    "scoring": ep.boxscorescoringv3.BoxScoreScoringV3,
-    "traditional": ep.boxscoretraditionalv3.BoxScoreTraditionalV3,
-}
-
-
-# ============================================================
-#                     SNOWFLAKE UTILITIES
-# ============================================================
-
-def get_snowflake_conn():
-    """Create and return a Snowflake connection."""
-    return connect(
-        account="RPOSWFZ-OIB57673",
-        user="grunk",
-        password=os.getenv("PAT"),  # or SNOWFLAKE_PASSWORD if you switch
-        warehouse="BACKEND_WH",
-        database="NBA",
-        schema="RAW",
-    )
-
-
-def upsert_to_snowflake(df, endpoint, is_team, conn):
-    """
-    Upserts a DataFrame into Snowflake using a staging table and MERGE.
-    Handles both team and player endpoints.
-    """
-
-    # Normalize column names to uppercase for Snowflake
-    df.columns = [c.upper() for c in df.columns]
-
-    if is_team:
-        target_table = f"TEAMS_{endpoint.upper()}"
-        stage_table = f"TEAMS_{endpoint.upper()}_STAGE"
-        if endpoint.lower() == "traditional":
-            key_cols = ["GAMEID", "TEAMID", "STARTERSBENCH"]
-        else:
-            key_cols = ["GAMEID", "TEAMID"]
-    else:
-        target_table = f"PLAYERS_{endpoint.upper()}"
-        stage_table = f"PLAYERS_{endpoint.upper()}_STAGE"
-        key_cols = ["GAMEID", "TEAMID", "PERSONID"]
-
-    col_defs = ", ".join([f"{col} STRING" for col in df.columns])
-    create_stage_sql = f"""
-        CREATE TABLE IF NOT EXISTS STAGE.{stage_table} ({col_defs});
-    """
-    with conn.cursor() as cur:
-        cur.execute(create_stage_sql)
-
-    try:
-        write_pandas(
-            conn,
-            df,
-            table_name=stage_table,
-            schema="STAGE",
-            database="NBA",
-        )
-    except Exception as e:
-        logger.error(f"problem uploading data for {target_table}, {e}")
-
-    non_key_cols = [c for c in df.columns if c not in key_cols]
-    update_clause = ", ".join([f"t.{c} = COALESCE(s.{c}, t.{c})" for c in non_key_cols])
-
-    merge_sql = f"""
-        MERGE INTO NBA.RAW.{target_table} AS t
-        USING NBA.STAGE.{stage_table} AS s
-        ON {" AND ".join([f"t.{k} = s.{k}" for k in key_cols])}
-        WHEN MATCHED THEN UPDATE SET {update_clause}
-        WHEN NOT MATCHED THEN INSERT ({','.join(df.columns)})
-        VALUES ({','.join(['s.' + c for c in df.columns])});
-    """
-
-    with conn.cursor() as cur:
-        cur.execute(merge_sql)
-        cur.execute(f"TRUNCATE TABLE STAGE.{stage_table}")
-
-    logger.info(f"Upsert complete for {target_table} ({len(df)} rows).")
-
-
 # ============================================================
 #                     LOCAL FILE UTILITIES
 # ============================================================
@@ -122,34 +50,61 @@ def _local_file_paths(endpoint, season):
     return team_path, players_path
 
 
-def load_local_stats(endpoint, season):
-    """Return (team_df, player_df) if local CSVs exist else empty DataFrames."""
+def load_local_stats(endpoint, season, gameids=None):
+    """
+    Return (team_df, player_df) for a season (optionally only some games) from the
+    Parquet archive via its gameId index, falling back to legacy CSVs;
+    empty DataFrames if neither exists.
+    """
+    team_df = read_archive("teams", endpoint, season, gameids=gameids)
+    player_df = read_archive("players", endpoint, season, gameids=gameids)
+    if not team_df.empty or not player_df.empty:
+        return team_df, player_df
+    if archived_gameids("teams", endpoint, season) or archived_gameids("players", endpoint, season):
+        return team_df, player_df
+
     team_file, player_file = _local_file_paths(endpoint, season)
 
     team_df = pd.read_csv(team_file, dtype={"gameId": str}) if os.path.exists(team_file) else pd.DataFrame()
     player_df = pd.read_csv(player_file, dtype={"gameId": str}) if os.path.exists(player_file) else pd.DataFrame()
+    if gameids is not None:
+        wanted = set(gameids)
+        team_df = team_df[team_df["gameId"].isin(wanted)] if not team_df.empty else team_df
+        player_df = player_df[player_df["gameId"].isin(wanted)] if not player_df.empty else player_df
 
     return team_df, player_df
 
 
+def _local_gameids(endpoint, season):
+    """Games stored locally for a season: the archive index, else the legacy CSVs."""
+    gids = archived_gameids("teams", endpoint, season) | archived_gameids("players", endpoint, season)
+    if gids:
+        return gids
+    team_df, player_df = load_local_stats(endpoint, season)
+    return set(team_df.get("gameId", [])) | set(player_df.get("gameId", []))
+
+
 def upload_missing_local(endpoint, season, conn):
     """
-    Sync local CSVs → Snowflake by inserting only missing games.
+    Sync local archive/CSVs → Snowflake by inserting only missing games.
+    The archive index answers which games exist; only missing games' rows are read.
     Only used in initial bootstrapping.
     """
-    team_df, player_df = load_local_stats(endpoint, season)
-    if team_df.empty and player_df.empty:
+    local_games = _local_gameids(endpoint, season)
+    if not local_games:
         logger.info(f"No cached local data for {endpoint}.")
         return
 
-    with conn.cursor() as cur:
-        cur.execute(f"SELECT DISTINCT GAMEID FROM RAW.TEAMS_{endpoint.upper()}")
-        sf_team_games = {row[0] for row in cur.fetchall()}
-
-        cur.execute(f"SELECT DISTINCT GAMEID FROM RAW.PLAYERS_{endpoint.upper()}")
-        sf_player_games = {row[0] for row in cur.fetchall()}
+    stored = run_async(
+        conn,
+        {
+            "teams": f"SELECT DISTINCT GAMEID FROM RAW.TEAMS_{endpoint.upper()}",
+            "players": f"SELECT DISTINCT GAMEID FROM RAW.PLAYERS_{endpoint.upper()}",
+        },
+    )
+    sf_team_games = {row[0] for row in stored["teams"]}
+    sf_player_games = {row[0] for row in stored["players"]}
 
-    local_games = set(team_df["gameId"]) | set(player_df["gameId"])
     missing = local_games - (sf_team_games & sf_player_games)
 
     if not missing:
@@ -158,42 +113,24 @@ def upload_missing_local(endpoint, season, conn):
 
     logger.info(f"Uploading {len(missing)} missing local games for {endpoint}.")
 
-    team_missing = team_df[team_df["gameId"].isin(missing)]
-    player_missing = player_df[player_df["gameId"].isin(missing)]
+    team_missing, player_missing = load_local_stats(endpoint, season, gameids=missing)
 
     write_pandas(conn, team_missing.rename(columns=str.upper), f"TEAMS_{endpoint.upper()}")
     write_pandas(conn, player_missing.rename(columns=str.upper), f"PLAYERS_{endpoint.upper()}")
 
 
-def write_data(endpoint, season, tstats, pstats, snowflake=False, overwrite=False, conn=None):
+def write_data(endpoint, tstats, pstats, game_dates, snowflake=False, conn=None):
     """
-    Writes/overwrites local CSV rows for a game and optionally performs MERGE into Snowflake.
+    Appends one archive segment per game in tstats/pstats (O(game size); the gameId index
+    points rescrapes at the new segment) and optionally MERGEs into Snowflake.
+    Pass a whole batch of games: Snowflake then costs one stage load + MERGE per table.
+    Snowflake failures are raised to the caller.
     """
-    game_id = tstats["gameId"].iloc[0]
-    team_file, player_file = _local_file_paths(endpoint, season)
+    n_games = tstats["gameId"].nunique()
+
+    ArchiveSink(game_dates).write(endpoint, tstats, pstats, sorted(set(tstats["gameId"])))
 
-    os.makedirs(os.path.dirname(team_file), exist_ok=True)
-    os.makedirs(os.path.dirname(player_file), exist_ok=True)
-
-    # --- TEAMS CSV ---
-    if os.path.exists(team_file):
-        existing = pd.read_csv(team_file, dtype={"gameId": str})
-        if overwrite:
-            existing = existing[existing["gameId"] != game_id]
-        pd.concat([existing, tstats], ignore_index=True).to_csv(team_file, index=False)
-    else:
-        tstats.to_csv(team_file, index=False)
-
-    # --- PLAYERS CSV ---
-    if os.path.exists(player_file):
-        existing = pd.read_csv(player_file, dtype={"gameId": str})
-        if overwrite:
-            existing = existing[existing["gameId"] != game_id]
-        pd.concat([existing, pstats], ignore_index=True).to_csv(player_file, index=False)
-    else:
-        pstats.to_csv(player_file, index=False)
-
-    logger.info(f"Local updated: {endpoint} game {game_id}")
+    logger.info(f"Local updated: {endpoint} ({n_games} games)")
 
     if snowflake and conn is not None:
         upsert_to_snowflake(tstats.copy(), endpoint, is_team=True, conn=conn)
@@ -201,106 +138,58 @@ def write_data(endpoint, season, tstats, pstats, snowflake=False, overwrite=Fals
 
 
 # ============================================================
-#                         API UTILITIES
+#                        INGESTION LOGIC
 # ============================================================
 
-def get_nba_season(date=None):
-    """Return current NBA season string, e.g. '2023-24'."""
-    date = date or datetime.today()
-    year = date.year
-    start = year - 1 if date.month < 7 else year
-    end = start + 1
-    return f"{start}-{str(end)[-2:]}"
-
-
-def fetch_log():
+def _stored_games(conn, season_id):
     """
-    Fetch the full season log of NBA games or fallback to local cached log.
-    On success, ALWAYS overwrite local log file with the entire season log.
+    endpoint -> season games already in both RAW.TEAMS_<ep> and RAW.PLAYERS_<ep>.
+    The 10 lookups are submitted together (async) instead of one after another.
     """
-    season = get_nba_season()
-    gidset = set()
-
-    log_dir = os.path.join(BASE_PATH, "data", "raw", "log")
-    log_file = os.path.join(log_dir, f"log{season}.csv")
-
-    try:
-        result = ep.leaguegamefinder.LeagueGameFinder(season_nullable=season)
-        all_games = result.get_data_frames()[0]
-
-        rs = all_games[
-            (all_games.SEASON_ID == "2" + season[:4])
-            & (all_games.GAME_ID.str.startswith("002"))
-        ]
-        ps = all_games[
-            (all_games.SEASON_ID == "4" + season[:4])
-            & (all_games.GAME_ID.str.startswith("004"))
-        ]
-        cup = all_games[
-            (all_games.SEASON_ID == "6" + season[:4])
-            & (all_games.GAME_ID.str.startswith("006"))
-        ]
-
-        log = pd.concat([rs, ps, cup])
-        gidset = {gid.zfill(10) for gid in log["GAME_ID"]}
-
-        # Refresh local cache on success
-        os.makedirs(log_dir, exist_ok=True)
-        log.to_csv(log_file, index=False)
-        logger.info(f"Wrote full log for {season} to {log_file} ({len(log)} games).")
-
-    except Exception as e:
-        logger.error(f"Failed live fetch; loading cached log {season}: {e}")
-        if not os.path.exists(log_file):
-            raise  # nothing to fall back to
-        log = pd.read_csv(log_file, dtype={"GAME_ID": str})
-        gidset = {gid.zfill(10) for gid in log["GAME_ID"]}
-
-    return log, gidset
-
-
-def get_game(func, gid):
-    """Fetch one game with retry/backoff."""
-    retries = 0
-    max_retries = 4
-
-    while retries < max_retries:
-        try:
-            game = func(game_id=gid).get_data_frames()
-            return game[0], game[1]
-
-        except (TimeoutError, Timeout, ReadTimeoutError):
-            retries += 1
-            delay = random.uniform(1, 3) * (2 ** retries)
-            time.sleep(delay)
-
-        except Exception as e:
-            logger.error(f"Permanent fail for {gid}: {e}")
-            return None, None
-
-    logger.error(f"Max retries exceeded for {gid}")
-    return None, None
-
+    statements = {}
+    for endpoint in ENDPOINTS:
+        for is_team in (True, False):
+            target_table, _, _ = sf_table_info(endpoint, is_team)
+            statements[(endpoint, is_team)] = f"""
+                SELECT DISTINCT t1.GAMEID
+                FROM RAW.{target_table} t1
+                JOIN RAW.LOG_TABLE t2
+                  ON t1.GAMEID = t2.GAME_ID
+                WHERE t2.SEASON_ID = {int(season_id)}
+            """
+    rows = run_async(conn, statements)
+    return {
+        endpoint: {r[0] for r in rows[(endpoint, True)]} & {r[0] for r in rows[(endpoint, False)]}
+        for endpoint in ENDPOINTS
+    }
 
-# ============================================================
-#                        INGESTION LOGIC
-# ============================================================
 
-def get_gid_list(conn):
+def get_gid_list(conn, pool=None):
     """
     Main ingestion loop:
-    - Sync local missing → Snowflake
+    - Sync local missing → Snowflake (endpoints in parallel)
     - Sync log table
-    - Fetch missing API games for each endpoint
+    - Fetch missing API games for every endpoint through the shared fetch pool
+      (utils.nba_fetch) and fan each batch out to the Parquet archive and Snowflake
+      (utils.sinks): one Snowflake writer per endpoint, each running its teams and
+      players MERGEs concurrently on pooled connections while fetching continues, one
+      stage load + MERGE per table per NBA_SF_BATCH_GAMES games
     """
+    own_pool = pool is None
+    pool = pool or SnowflakePool()
+
     log, season_games = fetch_log()
+    PAYLOAD_CACHE.note_game_dates(log)
+    game_dates = game_dates_from_log(log)
     season_id = log["SEASON_ID"].iloc[0]
     season = get_nba_season()
 
     logger.info(f"--- Syncing local data first (season: {season}) ---")
 
-    for endpoint in ENDPOINTS:
-        upload_missing_local(endpoint, season, conn)
+    run_parallel(
+        pool,
+        {endpoint: (lambda c, e=endpoint: upload_missing_local(e, season, c)) for endpoint in ENDPOINTS},
+    )
 
     # --- Update LOG_TABLE ---
     with conn.cursor() as cur:
@@ -315,52 +204,29 @@ def get_gid_list(conn):
 
     logger.info("--- Fetching missing games from API ---")
 
-    # --- Fetch missing games for each endpoint ---
-    for endpoint in ENDPOINTS:
-        with conn.cursor() as cur:
-            cur.execute(
-                f"""
-                SELECT DISTINCT t1.GAMEID
-                FROM RAW.TEAMS_{endpoint.upper()} t1
-                JOIN RAW.LOG_TABLE t2 
-                  ON t1.GAMEID = t2.GAME_ID
-                WHERE t2.SEASON_ID = {int(season_id)}
-                """
-            )
-            team_games = {r[0] for r in cur.fetchall()}
-
-            cur.execute(
-                f"""
-                SELECT DISTINCT t1.GAMEID
-                FROM RAW.PLAYERS_{endpoint.upper()} t1
-                JOIN RAW.LOG_TABLE t2 
-                  ON t1.GAMEID = t2.GAME_ID
-                WHERE t2.SEASON_ID = {int(season_id)}
-                """
-            )
-            player_games = {r[0] for r in cur.fetchall()}
-
-        stored = team_games & player_games
-        needed = season_games - stored
+    stored_by_endpoint = _stored_games(conn, season_id)
 
-        logger.info(f"{endpoint}: {len(needed)} games missing")
-
-        for gid in needed:
-            players, teams = get_game(FD[endpoint], gid)
-
-            if players is None:
-                logger.warning(f"Could not fetch {gid} for {endpoint}")
-                continue
+    work = {}
+    for endpoint in ENDPOINTS:
+        work[endpoint] = sorted(season_games - stored_by_endpoint[endpoint])
+        logger.info(f"{endpoint}: {len(work[endpoint])} games missing")
 
-            write_data(
-                endpoint,
-                season,
-                teams,
-                players,
-                snowflake=True,
-                overwrite=False,
-                conn=conn,
-            )
+    # each game is fetched once and written to every sink
+    fanout = SinkFanout([ArchiveSink(game_dates), SnowflakeSink(pool)])
+    try:
+        fetch_games_all_endpoints(work, max_workers=NBA_FETCH_WORKERS, on_batch=fanout, policy=FlushPolicy.pipelined())
+    finally:
+        sink_failures = fanout.close()
+        if own_pool:
+            pool.close()
+
+    if sink_failures:
+        failed = ", ".join(
+            f"{sink} {endpoint} ({len(set(gids))} games)"
+            for sink, by_endpoint in sink_failures.items()
+            for endpoint, gids in by_endpoint.items()
+        )
+        raise RuntimeError(f"Sink writes failed: {failed}")
 
 
 # ============================================================
@@ -370,7 +236,7 @@ def get_gid_list(conn):
 def rescrape_single_game(gid, conn):
     """
     Re-scrape one game ID for ALL endpoints and update:
-        - local CSVs (teams & players)
+        - local Parquet archive (teams & players)
         - Snowflake RAW tables (teams & players)
         - Snowflake LOG_TABLE row for that game
         - local log CSV stays full-season via fetch_log()
@@ -378,37 +244,37 @@ def rescrape_single_game(gid, conn):
     season = get_nba_season()
     logger.info(f"--- Re-scraping game {gid} for season {season} ---")
 
-    # --- Update endpoints ---
-    for endpoint_name in ENDPOINTS:
-        func = FD[endpoint_name]
+    # season log first: game dates partition the archive
+    try:
+        full_log, _ = fetch_log()  # overwrites local log file
+    except Exception as e:
+        logger.error(f"Failed fetching log for game {gid}: {e}")
+        full_log = None
+    game_dates = game_dates_from_log(full_log) if full_log is not None else {}
+
+    # --- Update endpoints (one shared fetch pool, fresh payloads) ---
+    failed = []
 
+    def _write(endpoint_name, players, teams, ok_gids):
         try:
-            players, teams = get_game(func, gid)
+            write_data(endpoint_name, teams, players, game_dates, snowflake=True, conn=conn)
         except Exception as e:
-            logger.error(f"Failed to fetch {endpoint_name} for {gid}: {e}")
-            continue
+            logger.error(f"Failed writing game {gid} for endpoint {endpoint_name}: {e}")
+            failed.append(endpoint_name)
+            return
+        logger.info(f"Updated game {gid} for endpoint {endpoint_name}")
 
-        if players is None or teams is None:
+    ok = fetch_games_all_endpoints(
+        {endpoint: [gid] for endpoint in ENDPOINTS}, max_workers=len(ENDPOINTS), on_batch=_write, refresh=True
+    )
+    for endpoint_name in ENDPOINTS:
+        if not ok.get(endpoint_name):
             logger.warning(f"No data returned for endpoint {endpoint_name}, game {gid}. Skipping.")
-            continue
-
-        try:
-            write_data(
-                endpoint_name,
-                season,
-                teams,
-                players,
-                snowflake=True,
-                overwrite=True,
-                conn=conn,
-            )
-            logger.info(f"Updated game {gid} for endpoint {endpoint_name}")
-        except Exception as e:
-            logger.error(f"Error writing data for {endpoint_name}, game {gid}: {e}")
 
     # --- Refresh log row for this game in Snowflake (and local log file) ---
     try:
-        full_log, _ = fetch_log()  # overwrites local log file
+        if full_log is None:
+            raise ValueError("season log unavailable")
         game_log = full_log[full_log["GAME_ID"] == gid]
         if game_log.empty:
             logger.warning(f"No log info found for game {gid}. Skipping LOG_TABLE update.")
@@ -420,6 +286,8 @@ def rescrape_single_game(gid, conn):
     except Exception as e:
         logger.error(f"Failed updating LOG_TABLE/log file for game {gid}: {e}")
 
+    if failed:
+        raise RuntimeError(f"Re-scrape of game {gid} failed for {', '.join(failed)}")
     logger.info(f"--- Finished re-scraping game {gid} ---")
 
 
@@ -457,14 +325,19 @@ def main():
     args = parser.parse_args()
 
     conn = get_snowflake_conn()
+    pool = SnowflakePool()
+    # fold last runs' per-game segments into season files while this run fetches
+    compaction = compact_in_background(["teams", "players"], ENDPOINTS)
     try:
         if args.rescrape:
             rescrape_single_game(args.rescrape, conn)
         if args.full:
             rescrape_full(conn)
         else:
-            get_gid_list(conn)
+            get_gid_list(conn, pool=pool)
     finally:
+        compaction.join()
+        pool.close()
         conn.close()
 
 
@@ -0,0 +1,98 @@
+# rolling_stats.py
+import typing as t
+
+from sqlglot import exp
+from sqlmesh import macro
+from sqlmesh.core.macros import MacroEvaluator
+
+
+# Rolling fantasy stats for fantasy.rolling_stats. Per-season windows share one
+# PARTITION BY seasonId, personId ORDER BY gameDate, so the engine sorts each player's
+# games once and evaluates them all over that sort (cross-season windows add one more
+# sort by personId). A new window is one entry here.
+
+# window name -> (size, unit, played_only, per_season)
+#   size None: season to date; unit "games": last `size` games, "days": last `size` days
+#   played_only: average only over games the player played (DNP rows are skipped)
+#   per_season: False -> the frame runs on across the season boundary (last `size` games
+#   only); rolling_stats reads each player's last games before the touched seasons for it
+ROLLING_WINDOWS: t.Dict[str, t.Tuple[t.Optional[int], str, bool, bool]] = {
+    "season": (None, "games", True, True),
+    # performance_delta's pickup signal compares against a player's last 3 games even
+    # across seasons, so the first games of a season are not scored on 1-2 games
+    "last3": (3, "games", False, False),
+    "last10": (10, "games", False, True),
+}
+
+# column prefix -> fantasy.base_stats column
+ROLLING_STATS: t.Dict[str, str] = {
+    "minutes": "minutes",
+    "points": "points",
+    "assists": "assists",
+    "steals": "steals",
+    "blocks": "blocks",
+    "rebounds": "reboundsTotal",
+    "threes": "threePointersMade",
+    "doubleDouble": "doubleDouble",
+    "efgPct": "effectiveFieldGoalPercentage",
+    "ftPct": "freeThrowsPercentage",
+}
+
+
+def _frame(size: t.Optional[int], unit: str) -> str:
+    if size is None:
+        return "ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW"
+    if unit == "days":
+        return f"RANGE BETWEEN INTERVAL {size - 1} DAYS PRECEDING AND CURRENT ROW"
+    if unit == "games":
+        return f"ROWS BETWEEN {size - 1} PRECEDING AND CURRENT ROW"
+    raise ValueError(f"Unknown rolling window unit: {unit}")
+
+
+def carry_in_games() -> int:
+    """Games before the touched seasons that the cross-season windows need per player."""
+    sizes = []
+    for name, (size, unit, _, per_season) in ROLLING_WINDOWS.items():
+        if per_season:
+            continue
+        if size is None or unit != "games":
+            raise ValueError(f"Cross-season rolling window must be a number of games: {name}")
+        sizes.append(size - 1)
+    return max(sizes, default=0)
+
+
+def rolling_columns(windows: t.Optional[t.List[str]] = None) -> t.List[str]:
+    """
+    Projection SQL for the configured windows: <stat>_<window> averages for every
+    ROLLING_STATS entry, plus games_<window> (rows in the frame) and playedRate_<window>.
+    """
+    columns = []
+    for name in windows or list(ROLLING_WINDOWS):
+        if name not in ROLLING_WINDOWS:
+            raise ValueError(f"Unknown rolling window: {name}")
+        size, unit, played_only, per_season = ROLLING_WINDOWS[name]
+        partition = "seasonId, personId" if per_season else "personId"
+        over = f"OVER (PARTITION BY {partition} ORDER BY gameDate {_frame(size, unit)})"
+
+        columns.append(f"COUNT(*) {over} AS games_{name}")
+        columns.append(f"AVG(playedFlag) {over} AS playedRate_{name}")
+        for prefix, col in ROLLING_STATS.items():
+            value = f"CASE WHEN playedFlag = 1 THEN {col} END" if played_only else col
+            columns.append(f"AVG({value}) {over} AS {prefix}_{name}")
+    return columns
+
+
+@macro()
+def rolling_stats(evaluator: MacroEvaluator, *windows: exp.Expression) -> t.List[exp.Expression]:
+    """
+    @rolling_stats() -> every configured window; @rolling_stats('season', 'last10') -> those.
+    Expects seasonId, personId, gameDate, playedFlag and the ROLLING_STATS columns in scope.
+    """
+    names = [w.name for w in windows] or None
+    return [exp.maybe_parse(sql, dialect=evaluator.dialect) for sql in rolling_columns(names)]
+
+
+@macro()
+def rolling_carry_in(evaluator: MacroEvaluator) -> exp.Expression:
+    """@rolling_carry_in() -> games per player to read before the touched seasons."""
+    return exp.Literal.number(carry_in_games())
@@ -1,9 +1,44 @@
 MODEL (
     name base.players_processed,
-    kind FULL
+    kind INCREMENTAL_BY_UNIQUE_KEY (
+        unique_key (personId, gameId)
+    ),
+    grain (personId, gameId),
+    description "Per player-game sequence flags. Each run rebuilds only the (personId, seasonId) partitions with games in the run interval, plus those of players on teams with games in it."
 );
 
-WITH minute_table AS (
+-- Window columns (nextGameId, gameCount, gamesPlayed, isLastGame) depend on a player's
+-- whole season, so every touched partition is recomputed in full and upserted by key;
+-- closed seasons are never touched unless their dates are restated.
+-- The teams_processed columns (isLastTeamGame, running records, ...) of a team's earlier
+-- games change when the team plays again, so the partitions of everyone who played for a
+-- touched (teamId, seasonId) are rebuilt too, including players absent from the new games.
+WITH touched_teams AS (
+    -- same partitions base.teams_processed recomputes this run
+    SELECT DISTINCT
+        teamId,
+        seasonId
+    FROM base.teams_combined
+    WHERE gameDate BETWEEN @start_date AND @end_date
+),
+touched AS (
+    SELECT
+        personId,
+        seasonId
+    FROM base.players_combined
+    WHERE gameDate BETWEEN @start_date AND @end_date
+      AND personId IS NOT NULL
+    UNION
+    SELECT
+        pc.personId,
+        pc.seasonId
+    FROM base.players_combined pc
+    JOIN touched_teams tt
+        ON pc.teamId = tt.teamId
+       AND pc.seasonId = tt.seasonId
+    WHERE pc.personId IS NOT NULL
+),
+minute_table AS (
     SELECT
         pc.*,
         CASE
@@ -11,6 +46,9 @@ WITH minute_table AS (
             ELSE pc.minutes
         END AS minutesStr
     FROM base.players_combined pc
+    JOIN touched t
+        ON pc.personId = t.personId
+       AND pc.seasonId = t.seasonId
 ),
 player_games AS (
     SELECT
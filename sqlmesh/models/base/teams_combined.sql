@@ -65,7 +65,7 @@ WITH joined AS (
     TRY_CAST(bl.ou AS DOUBLE) AS overUnder,
 
     -- 3) Core numeric stats (prefer log_table, else totals)
-    TRY_CAST(COALESCE(lt.min, tf.minutes, ta.minutes, tm.minutes, ts.minutes, tt.minutes) AS DOUBLE) AS minutes,
+    TRY_CAST(COALESCE(CAST(lt.min AS VARCHAR), tf.minutes, ta.minutes, tm.minutes, ts.minutes, tt.minutes) AS DOUBLE) AS minutes,
 
     COALESCE(TRY_CAST(lt.pts AS DOUBLE), TRY_CAST(tt.points AS DOUBLE)) AS points,
     COALESCE(TRY_CAST(lt.fgm AS DOUBLE), TRY_CAST(tt.fieldgoalsmade AS DOUBLE)) AS fieldGoalsMade,
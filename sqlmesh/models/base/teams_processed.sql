@@ -1,9 +1,87 @@
 MODEL (
     name base.teams_processed,
-    kind FULL
+    kind INCREMENTAL_BY_UNIQUE_KEY (
+        unique_key (teamId, gameId)
+    ),
+    grain (teamId, gameId),
+    description "Per team-game schedule context and running records. Each run recomputes only the (teamId, seasonId) partitions with games in the run interval, carrying running state forward."
 );
 
-WITH base_data AS (
+-- A touched partition is recomputed from its last game before the run interval (whose
+-- nextGameId / isLastTeamGame change) to the end of its season. gameNumber, running
+-- W-L and head-to-head counts continue from the stored row before that game; the 9
+-- games before it are read from base.teams_combined only as context for last-10 and
+-- the rest / back-to-back / 3-in-4 / 4-in-6 flags.
+WITH touched AS (
+    SELECT
+        teamId,
+        seasonId,
+        MIN(gameDate) AS firstDate
+    FROM base.teams_combined
+    WHERE gameDate BETWEEN @start_date AND @end_date
+    GROUP BY teamId, seasonId
+),
+bounds AS (
+    SELECT
+        t.teamId,
+        t.seasonId,
+        COALESCE(MAX(tc.gameDate), t.firstDate) AS fromDate
+    FROM touched t
+    LEFT JOIN base.teams_combined tc
+        ON tc.teamId = t.teamId
+       AND tc.seasonId = t.seasonId
+       AND tc.gameDate < t.firstDate
+    GROUP BY t.teamId, t.seasonId, t.firstDate
+),
+partition_games AS (
+    SELECT
+        tc.*,
+        tc.gameDate >= b.fromDate AS recompute,
+        ROW_NUMBER() OVER (
+            PARTITION BY tc.teamId, tc.seasonId, tc.gameDate >= b.fromDate
+            ORDER BY tc.gameDate DESC
+        ) AS contextRank
+    FROM base.teams_combined tc
+    JOIN bounds b
+        ON tc.teamId = b.teamId
+       AND tc.seasonId = b.seasonId
+),
+-- running state as of the last stored game before the recomputed range
+seed AS (
+    SELECT
+        p.teamId,
+        p.seasonId,
+        p.gameNumber,
+        p.winsSoFar,
+        p.lossesSoFar
+    FROM @this_model p
+    JOIN bounds b
+        ON p.teamId = b.teamId
+       AND p.seasonId = b.seasonId
+       AND p.gameDate < b.fromDate
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY p.teamId, p.seasonId
+        ORDER BY p.gameDate DESC
+    ) = 1
+),
+seed_vs_opponent AS (
+    SELECT
+        p.teamId,
+        p.seasonId,
+        REGEXP_REPLACE(p.MATCHUP, '.*(vs\\.|@) ', '') AS opponentTricode,
+        COALESCE(p.winsVsOpponent, 0) + CASE WHEN p.winLoss = 'W' THEN 1 ELSE 0 END AS winsVsOpponent,
+        COALESCE(p.lossesVsOpponent, 0) + CASE WHEN p.winLoss = 'L' THEN 1 ELSE 0 END AS lossesVsOpponent
+    FROM @this_model p
+    JOIN bounds b
+        ON p.teamId = b.teamId
+       AND p.seasonId = b.seasonId
+       AND p.gameDate < b.fromDate
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY p.teamId, p.seasonId, opponentTricode
+        ORDER BY p.gameDate DESC
+    ) = 1
+),
+base_data AS (
     SELECT
         *,
         CASE 
@@ -23,14 +101,24 @@ WITH base_data AS (
                ELSE SPLIT_PART(MATCHUP, '@', 1)
           END
         ) AS awayTeam
+    FROM partition_games
+    WHERE recompute OR contextRank <= 9
+),
+-- opponent rows of the games in range only (not the whole of base.teams_combined)
+opponent_rows AS (
+    SELECT
+        gameId,
+        teamId,
+        points
     FROM base.teams_combined
+    WHERE gameId IN (SELECT gameId FROM base_data)
 ),
 with_opponent AS (
     SELECT
         t1.*,
         t2.points AS opponentPoints
     FROM base_data t1
-    JOIN base_data t2
+    JOIN opponent_rows t2
         ON t1.gameId = t2.gameId
         AND t1.teamId != t2.teamId
 ),
@@ -56,10 +144,15 @@ outcomes AS (
 ranked_games AS (
     SELECT
         *,
-        ROW_NUMBER() OVER (
-            PARTITION BY teamId, seasonId 
+        SUM(CASE WHEN recompute THEN 1 ELSE 0 END) OVER (
+            PARTITION BY teamId, seasonId
             ORDER BY gameDate
-        ) AS gameNumber,
+            ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+        ) AS gamesInRange,
+        LEAD(gameId) OVER (
+            PARTITION BY seasonId, teamId
+            ORDER BY gameDate
+        ) AS nextGameId,
         MAX(gameDate) OVER (
             PARTITION BY teamId, seasonId
         ) AS lastTeamGameDate,
@@ -111,63 +204,85 @@ ranked_games AS (
 
 record_agg AS (
     SELECT
-        teamId,
-        seasonId,
-        seasonType,
-        gameId,
-        gameDate,
-        SUM(CASE WHEN winLoss = 'W' THEN 1 ELSE 0 END) OVER (
-            PARTITION BY teamId, seasonId, seasonType
-            ORDER BY gameDate
+        rg.teamId,
+        rg.seasonId,
+        rg.seasonType,
+        rg.gameId,
+        rg.gameDate,
+        COALESCE(s.gameNumber, 0) + rg.gamesInRange AS gameNumber,
+        COALESCE(s.winsSoFar, 0) + SUM(CASE WHEN rg.recompute AND rg.winLoss = 'W' THEN 1 ELSE 0 END) OVER (
+            PARTITION BY rg.teamId, rg.seasonId, rg.seasonType
+            ORDER BY rg.gameDate
             ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
         ) AS winsSoFar,
-        SUM(CASE WHEN winLoss = 'L' THEN 1 ELSE 0 END) OVER (
-            PARTITION BY teamId, seasonId, seasonType
-            ORDER BY gameDate
+        COALESCE(s.lossesSoFar, 0) + SUM(CASE WHEN rg.recompute AND rg.winLoss = 'L' THEN 1 ELSE 0 END) OVER (
+            PARTITION BY rg.teamId, rg.seasonId, rg.seasonType
+            ORDER BY rg.gameDate
             ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
         ) AS lossesSoFar,
+        -- context rows fill the 10-game frame; the seed carries the season game count
         ROUND(
-            SUM(CASE WHEN winLoss = 'W' THEN 1 ELSE 0 END) OVER (
-                PARTITION BY teamId, seasonId, seasonType
-                ORDER BY gameDate
+            SUM(CASE WHEN rg.winLoss = 'W' THEN 1 ELSE 0 END) OVER (
+                PARTITION BY rg.teamId, rg.seasonId, rg.seasonType
+                ORDER BY rg.gameDate
                 ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
             ) * 1.0
             /
-            LEAST(10, ROW_NUMBER() OVER (
-                PARTITION BY teamId, seasonId, seasonType
-                ORDER BY gameDate
-            )),
+            LEAST(10, COALESCE(s.gameNumber, 0) + rg.gamesInRange),
             3
         ) AS last10WinPercentage
-    FROM ranked_games
+    FROM ranked_games rg
+    LEFT JOIN seed s
+        ON rg.teamId = s.teamId
+       AND rg.seasonId = s.seasonId
 ),
 -- THIS MAY NEED CAST(WORK AS TODO)
-vs_opponent_record AS (
+vs_opponent_games AS (
+    SELECT
+        r.*,
+        REGEXP_REPLACE(r.MATCHUP, '.*(vs\\.|@) ', '') AS opponentTricode
+    FROM ranked_games AS r
+    WHERE r.recompute
+),
+vs_opponent_running AS (
     SELECT
         r.teamId,
         r.seasonId,
-        r.seasonType,
         r.gameId,
-        REGEXP_REPLACE(r.MATCHUP, '.*(vs\\.|@) ', '') AS opponentTricode,
-        SUM(CASE WHEN r.winLoss = 'W' THEN 1 ELSE 0 END) OVER (
-            PARTITION BY r.teamId, opponentTricode, r.seasonId, r.seasonType
-            ORDER BY r.gameDate
-            ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-        ) AS winsVsOpponent,
-        SUM(CASE WHEN r.winLoss = 'L' THEN 1 ELSE 0 END) OVER (
-            PARTITION BY r.teamId, opponentTricode, r.seasonId, r.seasonType
-            ORDER BY r.gameDate
-            ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
-        ) AS lossesVsOpponent
-    FROM ranked_games AS r
+        r.opponentTricode,
+        COUNT(*) OVER w AS priorMeetings,
+        SUM(CASE WHEN r.winLoss = 'W' THEN 1 ELSE 0 END) OVER w AS winsInRange,
+        SUM(CASE WHEN r.winLoss = 'L' THEN 1 ELSE 0 END) OVER w AS lossesInRange
+    FROM vs_opponent_games AS r
+    WINDOW w AS (
+        PARTITION BY r.teamId, r.opponentTricode, r.seasonId, r.seasonType
+        ORDER BY r.gameDate
+        ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+    )
+),
+-- earlier meetings come from the stored seed; NULL before the first meeting of the season
+vs_opponent_record AS (
+    SELECT
+        r.teamId,
+        r.gameId,
+        CASE
+            WHEN sv.teamId IS NULL AND r.priorMeetings = 0 THEN NULL
+            ELSE COALESCE(sv.winsVsOpponent, 0) + COALESCE(r.winsInRange, 0)
+        END AS winsVsOpponent,
+        CASE
+            WHEN sv.teamId IS NULL AND r.priorMeetings = 0 THEN NULL
+            ELSE COALESCE(sv.lossesVsOpponent, 0) + COALESCE(r.lossesInRange, 0)
+        END AS lossesVsOpponent
+    FROM vs_opponent_running r
+    LEFT JOIN seed_vs_opponent sv
+        ON r.teamId = sv.teamId
+       AND r.seasonId = sv.seasonId
+       AND r.opponentTricode = sv.opponentTricode
 )
 SELECT
     -- 1. Metadata / Identifiers
     t1.gameId,
-    LEAD(t1.gameId) OVER (
-      PARTITION BY t1.seasonId, t1.teamId
-      ORDER BY t1.gameDate
-    ) AS nextGameId,
+    t1.nextGameId,
     t1.gameDate,
     t1.seasonId,
     t1.seasonType,
@@ -179,7 +294,7 @@ SELECT
     t1.awayTeam,
     t1.homeGame,
     t1.MATCHUP,
-    t1.gameNumber,
+    r.gameNumber,
     t1.daysSinceLastGame,
     t1.isBackToBack,
     CASE WHEN t1.gamesLast4Days >= 3 THEN 1 ELSE 0 END AS is3In4,
@@ -286,4 +401,5 @@ FROM ranked_games t1
 LEFT JOIN record_agg r
     ON t1.teamId = r.teamId AND t1.gameId = r.gameId
 LEFT JOIN vs_opponent_record v
-    ON t1.teamId = v.teamId AND t1.gameId = v.gameId;
\ No newline at end of file
+    ON t1.teamId = v.teamId AND t1.gameId = v.gameId
+WHERE t1.recompute;
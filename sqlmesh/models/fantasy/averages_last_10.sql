@@ -4,8 +4,7 @@ MODEL (
   description 'Rolling last 10 game averages per player/season/game.'
 );
 
-WITH per_game AS (
-  SELECT
+SELECT
     seasonId,
     gameId,
     gameDate,
@@ -14,100 +13,20 @@ WITH per_game AS (
     personId,
     playedFlag,
     isLastGame,
-    minutes,
-    points,
-    assists,
-    steals,
-    blocks,
-    reboundsTotal,
-    threePointersMade,
-    effectiveFieldGoalPercentage,
-    freeThrowsPercentage,
-    doubleDouble
-  FROM fantasy.base_stats
-),
 
-rolling AS (
-    SELECT
-        seasonId,
-        gameId,
-        gameDate,
-        firstName,
-        familyName,
-        personId,
-        playedFlag,
-        isLastGame,
-
-        -- rolling last 10 averages
-        AVG(minutes) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS minutes_last10,
-
-        AVG(points) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS points_last10,
-
-        AVG(assists) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS assists_last10,
-
-        AVG(steals) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS steals_last10,
-
-        AVG(blocks) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS blocks_last10,
-
-        AVG(reboundsTotal) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS rebounds_last10,
-
-        AVG(threePointersMade) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS threePointersMade_last10,
-
-        AVG(doubleDouble) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS doubleDouble_rate_last10,
-
-        AVG(effectiveFieldGoalPercentage) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS effectiveFieldGoalPercentage_last10,
-
-        AVG(freeThrowsPercentage) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS freeThrowsPercentage_last10,
-
-        COUNT(*) OVER (
-            PARTITION BY seasonId, personId
-            ORDER BY gameDate
-            ROWS BETWEEN 9 PRECEDING AND CURRENT ROW
-        ) AS games_in_window
-    FROM per_game
-)
-
-SELECT *
-FROM rolling
+    -- rolling last 10 averages (window "last10" in macros/rolling_stats.py)
+    minutes_last10,
+    points_last10,
+    assists_last10,
+    steals_last10,
+    blocks_last10,
+    rebounds_last10,
+    threes_last10       AS threePointersMade_last10,
+    doubleDouble_last10 AS doubleDouble_rate_last10,
+    efgPct_last10       AS effectiveFieldGoalPercentage_last10,
+    ftPct_last10        AS freeThrowsPercentage_last10,
+
+    games_last10        AS games_in_window
+FROM fantasy.rolling_stats
 -- If you ONLY want rows with a full 10-game window:
-WHERE games_in_window >= 10;
+WHERE games_last10 >= 10;
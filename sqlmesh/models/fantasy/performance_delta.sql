@@ -1,105 +1,45 @@
 MODEL (
   name fantasy.performance_delta,
-  kind INCREMENTAL_BY_TIME_RANGE (
-    time_column gameDate
-  ),
+  kind VIEW,
   description "Signals players who are outperforming their season averages; ideal for fantasy pickups."
 );
 
-WITH base AS (
-    SELECT
-        bs.seasonId,
-        bs.gameId,
-        bs.gameDate,
-        bs.personId,
-        bs.firstName,
-        bs.familyName,
-        bs.playedFlag,
-        bs.minutes,
-        bs.points,
-        bs.assists,
-        bs.steals,
-        bs.blocks,
-        bs.reboundsTotal,
-        bs.threePointersMade
-    FROM fantasy.base_stats bs
-),
-
-avg AS (
+WITH joined AS (
     SELECT
         seasonId,
         gameId,
         gameDate,
         personId,
-        average_minutes,
-        average_points,
-        average_assists,
-        average_steals,
-        average_blocks,
-        average_total_rebounds,
-        average_three_pointers_made
-    FROM fantasy.averages
-),
+        firstName,
+        familyName,
+        playedFlag,
+        minutes,
+        points,
+        assists,
+        steals,
+        blocks,
+        reboundsTotal,
+        threePointersMade,
 
-joined AS (
-    SELECT
-        b.*,
-        a.average_minutes,
-        a.average_points,
-        a.average_assists,
-        a.average_steals,
-        a.average_blocks,
-        a.average_total_rebounds,
-        a.average_three_pointers_made,
+        minutes_season  AS average_minutes,
+        points_season   AS average_points,
+        assists_season  AS average_assists,
+        steals_season   AS average_steals,
+        blocks_season   AS average_blocks,
+        rebounds_season AS average_total_rebounds,
+        threes_season   AS average_three_pointers_made,
 
         -----------------------------------------------------------------
-        -- Last 3-game rolling averages (fantasy-relevant stats)
+        -- Last 3-game rolling averages, across seasons (window "last3" in macros/rolling_stats.py)
         -----------------------------------------------------------------
-        AVG(b.minutes) OVER (
-            PARTITION BY b.personId
-            ORDER BY b.gameDate
-            ROWS BETWEEN 2 PRECEDING AND CURRENT ROW
-        ) AS minutes_last3,
-
-        AVG(b.points) OVER (
-            PARTITION BY b.personId
-            ORDER BY b.gameDate
-            ROWS BETWEEN 2 PRECEDING AND CURRENT ROW
-        ) AS points_last3,
-
-        AVG(b.assists) OVER (
-            PARTITION BY b.personId
-            ORDER BY b.gameDate
-            ROWS BETWEEN 2 PRECEDING AND CURRENT ROW
-            ) AS assists_last3,
-
-        AVG(b.steals) OVER (
-            PARTITION BY b.personId
-            ORDER BY b.gameDate
-            ROWS BETWEEN 2 PRECEDING AND CURRENT ROW
-        ) AS steals_last3,
-
-        AVG(b.blocks) OVER (
-            PARTITION BY b.personId
-            ORDER BY b.gameDate
-            ROWS BETWEEN 2 PRECEDING AND CURRENT ROW
-        ) AS blocks_last3,
-
-        AVG(b.reboundsTotal) OVER (
-            PARTITION BY b.personId
-            ORDER BY b.gameDate
-            ROWS BETWEEN 2 PRECEDING AND CURRENT ROW
-        ) AS rebounds_last3,
-
-        AVG(b.threePointersMade) OVER (
-            PARTITION BY b.personId
-            ORDER BY b.gameDate
-            ROWS BETWEEN 2 PRECEDING AND CURRENT ROW
-        ) AS threes_last3
-    FROM base b
-    LEFT JOIN avg a
-           ON b.personId = a.personId
-          AND b.gameId = a.gameId
+        minutes_last3,
+        points_last3,
+        assists_last3,
+        steals_last3,
+        blocks_last3,
+        rebounds_last3,
+        threes_last3
+    FROM fantasy.rolling_stats
 )
 
 SELECT
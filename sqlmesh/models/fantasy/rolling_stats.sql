@@ -0,0 +1,61 @@
+MODEL (
+  name fantasy.rolling_stats,
+  kind INCREMENTAL_BY_TIME_RANGE (
+    time_column gameDate
+  ),
+  grain (seasonId, personId, gameId),
+  description "Per player/game rolling fantasy averages for every window in macros/rolling_stats.py, in one scan of fantasy.base_stats."
+);
+
+-- windows reach back to the start of the season, so read the touched seasons up to
+-- @end_date; cross-season windows (per_season False in macros/rolling_stats.py) also
+-- need each player's last games before the earliest touched season
+WITH seasons AS (
+  SELECT DISTINCT seasonId
+  FROM fantasy.base_stats
+  WHERE gameDate BETWEEN @start_date AND @end_date
+),
+first_date AS (
+  SELECT MIN(gameDate) AS gameDate
+  FROM fantasy.base_stats
+  WHERE seasonId IN (SELECT seasonId FROM seasons)
+),
+history AS (
+  SELECT *
+  FROM fantasy.base_stats
+  WHERE gameDate BETWEEN (SELECT gameDate FROM first_date) AND @end_date
+  UNION ALL
+  SELECT *
+  FROM fantasy.base_stats
+  WHERE gameDate < (SELECT gameDate FROM first_date)
+  QUALIFY ROW_NUMBER() OVER (PARTITION BY personId ORDER BY gameDate DESC) <= @rolling_carry_in()
+),
+rolled AS (
+  SELECT
+    seasonId,
+    gameId,
+    gameDate,
+    firstName,
+    familyName,
+    personId,
+    playedFlag,
+    isLastGame,
+    minutes,
+    points,
+    assists,
+    steals,
+    blocks,
+    reboundsTotal,
+    threePointersMade,
+    effectiveFieldGoalPercentage,
+    freeThrowsPercentage,
+    doubleDouble,
+
+    @rolling_stats()
+
+  FROM history
+)
+
+SELECT *
+FROM rolled
+WHERE seasonId IN (SELECT seasonId FROM seasons);
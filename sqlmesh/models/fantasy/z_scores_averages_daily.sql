@@ -0,0 +1,111 @@
+MODEL (
+  name fantasy.zScoresAverages_daily,
+  kind INCREMENTAL_BY_TIME_RANGE (
+    time_column asOfDate
+  ),
+  grain (seasonId, asOfDate, personId),
+  description "Daily snapshots of season-average Z-scores: one row per player/season as of every game date."
+);
+
+-- as-of dates built by this run
+WITH days AS (
+    SELECT DISTINCT
+        seasonId,
+        gameDate AS asOfDate
+    FROM fantasy.base_stats
+    WHERE gameDate BETWEEN @start_date AND @end_date
+),
+
+-- each played game's averages row is a player's latest until their next played game
+-- (the as-of counterpart of isLastGame, which marks the last game played)
+averages AS (
+    SELECT
+        seasonId,
+        gameDate,
+        firstName,
+        familyName,
+        personId,
+
+        average_minutes                AS minutesCumulative,
+        average_points                 AS pointsCumulative,
+        average_assists                AS assistsCumulative,
+        average_steals                 AS stealsCumulative,
+        average_blocks                 AS blocksCumulative,
+        average_total_rebounds         AS reboundsCumulative,
+        average_three_pointers_made    AS threesCumulative,
+        average_double_double_rate     AS doubleDoubleCumulative,
+        average_effective_field_goal_percentage AS avgEfgPct,
+        average_free_throw_percentage  AS avgFtPct,
+
+        LEAD(gameDate) OVER (PARTITION BY seasonId, personId ORDER BY gameDate) AS nextGameDate
+    FROM fantasy.averages
+    WHERE playedFlag = 1
+      AND gameDate <= @end_date
+      AND seasonId IN (SELECT seasonId FROM days)
+),
+
+cumulative AS (
+    SELECT
+        d.asOfDate,
+        a.*
+    FROM days d
+    JOIN averages a
+      ON a.seasonId = d.seasonId
+     AND a.gameDate <= d.asOfDate
+     AND (a.nextGameDate IS NULL OR a.nextGameDate > d.asOfDate)
+),
+
+zScores AS (
+    SELECT
+        seasonId,
+        asOfDate,
+        personId,
+        firstName,
+        familyName,
+        gameDate,
+
+        (minutesCumulative - AVG(minutesCumulative) OVER (PARTITION BY seasonId, asOfDate))
+            / STDDEV(minutesCumulative) OVER (PARTITION BY seasonId, asOfDate) AS minutesZScore,
+
+        (pointsCumulative - AVG(pointsCumulative) OVER (PARTITION BY seasonId, asOfDate))
+            / STDDEV(pointsCumulative) OVER (PARTITION BY seasonId, asOfDate) AS pointsZScore,
+
+        (assistsCumulative - AVG(assistsCumulative) OVER (PARTITION BY seasonId, asOfDate))
+            / STDDEV(assistsCumulative) OVER (PARTITION BY seasonId, asOfDate) AS assistsZScore,
+
+        (stealsCumulative - AVG(stealsCumulative) OVER (PARTITION BY seasonId, asOfDate))
+            / STDDEV(stealsCumulative) OVER (PARTITION BY seasonId, asOfDate) AS stealsZScore,
+
+        (blocksCumulative - AVG(blocksCumulative) OVER (PARTITION BY seasonId, asOfDate))
+            / STDDEV(blocksCumulative) OVER (PARTITION BY seasonId, asOfDate) AS blocksZScore,
+
+        (reboundsCumulative - AVG(reboundsCumulative) OVER (PARTITION BY seasonId, asOfDate))
+            / STDDEV(reboundsCumulative) OVER (PARTITION BY seasonId, asOfDate) AS reboundsZScore,
+
+        (threesCumulative - AVG(threesCumulative) OVER (PARTITION BY seasonId, asOfDate))
+            / STDDEV(threesCumulative) OVER (PARTITION BY seasonId, asOfDate) AS threesZScore,
+
+        (doubleDoubleCumulative - AVG(doubleDoubleCumulative) OVER (PARTITION BY seasonId, asOfDate))
+            / STDDEV(doubleDoubleCumulative) OVER (PARTITION BY seasonId, asOfDate) AS doubleDoubleZScore,
+
+        (avgEfgPct - AVG(avgEfgPct) OVER (PARTITION BY seasonId, asOfDate))
+            / STDDEV(avgEfgPct) OVER (PARTITION BY seasonId, asOfDate) AS efgPctZScore,
+
+        (avgFtPct - AVG(avgFtPct) OVER (PARTITION BY seasonId, asOfDate))
+            / STDDEV(avgFtPct) OVER (PARTITION BY seasonId, asOfDate) AS ftPctZScore
+
+    FROM cumulative
+)
+
+SELECT
+    *,
+    pointsZScore +
+    assistsZScore +
+    stealsZScore +
+    blocksZScore +
+    reboundsZScore +
+    threesZScore +
+    doubleDoubleZScore +
+    efgPctZScore +
+    ftPctZScore AS totalZ
+FROM zScores;
@@ -0,0 +1,110 @@
+MODEL (
+  name fantasy.zScores_last10_daily,
+  kind INCREMENTAL_BY_TIME_RANGE (
+    time_column asOfDate
+  ),
+  grain (seasonId, asOfDate, personId),
+  description 'Daily snapshots of last 10 game Z-scores: one row per player/season (10+ games) as of every game date.'
+);
+
+-- as-of dates built by this run
+WITH days AS (
+    SELECT DISTINCT
+        seasonId,
+        gameDate AS asOfDate
+    FROM fantasy.base_stats
+    WHERE gameDate BETWEEN @start_date AND @end_date
+),
+
+-- each played game's rolling row is a player's latest until their next played game
+-- (the as-of counterpart of isLastGame, which marks the last game played)
+rolling AS (
+    SELECT
+        seasonId,
+        gameDate,
+        firstName,
+        familyName,
+        personId,
+
+        minutes_last10,
+        points_last10,
+        assists_last10,
+        steals_last10,
+        blocks_last10,
+        rebounds_last10,
+        threePointersMade_last10,
+        doubleDouble_rate_last10,
+        effectiveFieldGoalPercentage_last10,
+        freeThrowsPercentage_last10,
+
+        LEAD(gameDate) OVER (PARTITION BY seasonId, personId ORDER BY gameDate) AS nextGameDate
+    FROM fantasy.averages_last_10
+    WHERE playedFlag = 1
+      AND gameDate <= @end_date
+      AND seasonId IN (SELECT seasonId FROM days)
+),
+
+last10 AS (
+    SELECT
+        d.asOfDate,
+        r.*
+    FROM days d
+    JOIN rolling r
+      ON r.seasonId = d.seasonId
+     AND r.gameDate <= d.asOfDate
+     AND (r.nextGameDate IS NULL OR r.nextGameDate > d.asOfDate)
+),
+
+z AS (
+    SELECT
+        seasonId,
+        asOfDate,
+        personId,
+        firstName,
+        familyName,
+        gameDate,
+
+        (minutes_last10 - AVG(minutes_last10) OVER (PARTITION BY seasonId, asOfDate))
+            / NULLIF(STDDEV(minutes_last10) OVER (PARTITION BY seasonId, asOfDate), 0) AS minutesZScore,
+
+        (points_last10 - AVG(points_last10) OVER (PARTITION BY seasonId, asOfDate))
+            / NULLIF(STDDEV(points_last10) OVER (PARTITION BY seasonId, asOfDate), 0) AS pointsZScore,
+
+        (assists_last10 - AVG(assists_last10) OVER (PARTITION BY seasonId, asOfDate))
+            / NULLIF(STDDEV(assists_last10) OVER (PARTITION BY seasonId, asOfDate), 0) AS assistsZScore,
+
+        (steals_last10 - AVG(steals_last10) OVER (PARTITION BY seasonId, asOfDate))
+            / NULLIF(STDDEV(steals_last10) OVER (PARTITION BY seasonId, asOfDate), 0) AS stealsZScore,
+
+        (blocks_last10 - AVG(blocks_last10) OVER (PARTITION BY seasonId, asOfDate))
+            / NULLIF(STDDEV(blocks_last10) OVER (PARTITION BY seasonId, asOfDate), 0) AS blocksZScore,
+
+        (rebounds_last10 - AVG(rebounds_last10) OVER (PARTITION BY seasonId, asOfDate))
+            / NULLIF(STDDEV(rebounds_last10) OVER (PARTITION BY seasonId, asOfDate), 0) AS reboundsZScore,
+
+        (threePointersMade_last10 - AVG(threePointersMade_last10) OVER (PARTITION BY seasonId, asOfDate))
+            / NULLIF(STDDEV(threePointersMade_last10) OVER (PARTITION BY seasonId, asOfDate), 0) AS threesZScore,
+
+        (doubleDouble_rate_last10 - AVG(doubleDouble_rate_last10) OVER (PARTITION BY seasonId, asOfDate))
+            / NULLIF(STDDEV(doubleDouble_rate_last10) OVER (PARTITION BY seasonId, asOfDate), 0) AS doubleDoubleZScore,
+
+        (effectiveFieldGoalPercentage_last10 - AVG(effectiveFieldGoalPercentage_last10) OVER (PARTITION BY seasonId, asOfDate))
+            / NULLIF(STDDEV(effectiveFieldGoalPercentage_last10) OVER (PARTITION BY seasonId, asOfDate), 0) AS efgPctZScore,
+
+        (freeThrowsPercentage_last10 - AVG(freeThrowsPercentage_last10) OVER (PARTITION BY seasonId, asOfDate))
+            / NULLIF(STDDEV(freeThrowsPercentage_last10) OVER (PARTITION BY seasonId, asOfDate), 0) AS ftPctZScore
+    FROM last10
+)
+
+SELECT
+    *,
+    pointsZScore +
+    assistsZScore +
+    stealsZScore +
+    blocksZScore +
+    reboundsZScore +
+    threesZScore +
+    doubleDoubleZScore +
+    efgPctZScore +
+    ftPctZScore AS totalZ
+FROM z;
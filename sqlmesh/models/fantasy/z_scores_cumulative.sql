@@ -1,74 +1,53 @@
 MODEL (
   name fantasy.zScoresCumulative,
-  kind VIEW,
+  kind FULL,
+  grain (seasonId, personId),
   dialect duckdb,
-  description "Fantasy basketball cumulative Z-scores computed from fantasy.season_cumulative."
+  description "Fantasy basketball cumulative Z-scores for the current season (latest fantasy.zScoresCumulative_daily snapshot)."
 );
 
-WITH base AS (
-  SELECT *
-  FROM fantasy.season_cumulative
+WITH current_season AS (
+  SELECT seasonId FROM raw.current_season
 ),
 
-z AS (
+latest AS (
   SELECT
     seasonId,
-    personId,
-    firstName,
-    familyName,
-
-    minutesCumulative,
-    pointsCumulative,
-    assistsCumulative,
-    stealsCumulative,
-    blocksCumulative,
-    reboundsCumulative,
-    threesCumulative,
-    doubleDoubleCumulative,
-    avgEfgPct,
-    avgFtPct,
-
-    (minutesCumulative - AVG(minutesCumulative) OVER (PARTITION BY seasonId))
-      / NULLIF(STDDEV(minutesCumulative) OVER (PARTITION BY seasonId), 0) AS minutesZScore,
-
-    (pointsCumulative - AVG(pointsCumulative) OVER (PARTITION BY seasonId))
-      / NULLIF(STDDEV(pointsCumulative) OVER (PARTITION BY seasonId), 0) AS pointsZScore,
-
-    (assistsCumulative - AVG(assistsCumulative) OVER (PARTITION BY seasonId))
-      / NULLIF(STDDEV(assistsCumulative) OVER (PARTITION BY seasonId), 0) AS assistsZScore,
-
-    (stealsCumulative - AVG(stealsCumulative) OVER (PARTITION BY seasonId))
-      / NULLIF(STDDEV(stealsCumulative) OVER (PARTITION BY seasonId), 0) AS stealsZScore,
-
-    (blocksCumulative - AVG(blocksCumulative) OVER (PARTITION BY seasonId))
-      / NULLIF(STDDEV(blocksCumulative) OVER (PARTITION BY seasonId), 0) AS blocksZScore,
-
-    (reboundsCumulative - AVG(reboundsCumulative) OVER (PARTITION BY seasonId))
-      / NULLIF(STDDEV(reboundsCumulative) OVER (PARTITION BY seasonId), 0) AS reboundsZScore,
-
-    (threesCumulative - AVG(threesCumulative) OVER (PARTITION BY seasonId))
-      / NULLIF(STDDEV(threesCumulative) OVER (PARTITION BY seasonId), 0) AS threesZScore,
-
-    (doubleDoubleCumulative - AVG(doubleDoubleCumulative) OVER (PARTITION BY seasonId))
-      / NULLIF(STDDEV(doubleDoubleCumulative) OVER (PARTITION BY seasonId), 0) AS doubleDoubleZScore,
-
-    (avgEfgPct - AVG(avgEfgPct) OVER (PARTITION BY seasonId))
-      / NULLIF(STDDEV(avgEfgPct) OVER (PARTITION BY seasonId), 0) AS efgPctZScore,
-
-    (avgFtPct - AVG(avgFtPct) OVER (PARTITION BY seasonId))
-      / NULLIF(STDDEV(avgFtPct) OVER (PARTITION BY seasonId), 0) AS ftPctZScore
-  FROM base
+    MAX(asOfDate) AS asOfDate
+  FROM fantasy.zScoresCumulative_daily
+  WHERE seasonId = (SELECT seasonId FROM current_season)
+  GROUP BY seasonId
 )
 
 SELECT
-  *,
-  pointsZScore +
-  assistsZScore +
-  stealsZScore +
-  blocksZScore +
-  reboundsZScore +
-  threesZScore +
-  doubleDoubleZScore +
-  efgPctZScore +
-  ftPctZScore AS totalZ
-FROM z;
+  z.seasonId,
+  z.personId,
+  z.firstName,
+  z.familyName,
+
+  z.minutesCumulative,
+  z.pointsCumulative,
+  z.assistsCumulative,
+  z.stealsCumulative,
+  z.blocksCumulative,
+  z.reboundsCumulative,
+  z.threesCumulative,
+  z.doubleDoubleCumulative,
+  z.avgEfgPct,
+  z.avgFtPct,
+
+  z.minutesZScore,
+  z.pointsZScore,
+  z.assistsZScore,
+  z.stealsZScore,
+  z.blocksZScore,
+  z.reboundsZScore,
+  z.threesZScore,
+  z.doubleDoubleZScore,
+  z.efgPctZScore,
+  z.ftPctZScore,
+  z.totalZ
+FROM fantasy.zScoresCumulative_daily z
+JOIN latest l
+  ON l.seasonId = z.seasonId
+ AND l.asOfDate = z.asOfDate;
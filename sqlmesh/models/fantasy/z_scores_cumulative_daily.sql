@@ -0,0 +1,126 @@
+MODEL (
+  name fantasy.zScoresCumulative_daily,
+  kind INCREMENTAL_BY_TIME_RANGE (
+    time_column asOfDate
+  ),
+  grain (seasonId, asOfDate, personId),
+  dialect duckdb,
+  description "Daily snapshots of season-to-date cumulative Z-scores: one row per player/season as of every game date."
+);
+
+-- as-of dates built by this run
+WITH days AS (
+  SELECT DISTINCT
+    seasonId,
+    gameDate AS asOfDate
+  FROM fantasy.base_stats
+  WHERE gameDate BETWEEN @start_date AND @end_date
+),
+
+-- season-to-date totals after each game (fantasy.season_cumulative, per game)
+running AS (
+  SELECT
+    seasonId,
+    personId,
+    gameDate,
+
+    MAX(firstName) OVER w  AS firstName,
+    MAX(familyName) OVER w AS familyName,
+
+    SUM(CASE WHEN playedFlag = 1 THEN minutes            END) OVER w AS minutesCumulative,
+    SUM(CASE WHEN playedFlag = 1 THEN points             END) OVER w AS pointsCumulative,
+    SUM(CASE WHEN playedFlag = 1 THEN assists            END) OVER w AS assistsCumulative,
+    SUM(CASE WHEN playedFlag = 1 THEN steals             END) OVER w AS stealsCumulative,
+    SUM(CASE WHEN playedFlag = 1 THEN blocks             END) OVER w AS blocksCumulative,
+    SUM(CASE WHEN playedFlag = 1 THEN reboundsTotal      END) OVER w AS reboundsCumulative,
+    SUM(CASE WHEN playedFlag = 1 THEN threePointersMade  END) OVER w AS threesCumulative,
+    SUM(CASE WHEN playedFlag = 1 THEN doubleDouble       END) OVER w AS doubleDoubleCumulative,
+
+    AVG(CASE WHEN playedFlag = 1 THEN effectiveFieldGoalPercentage END) OVER w AS avgEfgPct,
+    AVG(CASE WHEN playedFlag = 1 THEN freeThrowsPercentage         END) OVER w AS avgFtPct,
+
+    LEAD(gameDate) OVER (PARTITION BY seasonId, personId ORDER BY gameDate) AS nextGameDate
+  FROM fantasy.base_stats
+  WHERE gameDate <= @end_date
+    AND seasonId IN (SELECT seasonId FROM days)
+  WINDOW w AS (
+    PARTITION BY seasonId, personId
+    ORDER BY gameDate
+    ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+  )
+),
+
+base AS (
+  SELECT
+    d.asOfDate,
+    r.*
+  FROM days d
+  JOIN running r
+    ON r.seasonId = d.seasonId
+   AND r.gameDate <= d.asOfDate
+   AND (r.nextGameDate IS NULL OR r.nextGameDate > d.asOfDate)
+),
+
+z AS (
+  SELECT
+    seasonId,
+    asOfDate,
+    personId,
+    firstName,
+    familyName,
+
+    minutesCumulative,
+    pointsCumulative,
+    assistsCumulative,
+    stealsCumulative,
+    blocksCumulative,
+    reboundsCumulative,
+    threesCumulative,
+    doubleDoubleCumulative,
+    avgEfgPct,
+    avgFtPct,
+
+    (minutesCumulative - AVG(minutesCumulative) OVER (PARTITION BY seasonId, asOfDate))
+      / NULLIF(STDDEV(minutesCumulative) OVER (PARTITION BY seasonId, asOfDate), 0) AS minutesZScore,
+
+    (pointsCumulative - AVG(pointsCumulative) OVER (PARTITION BY seasonId, asOfDate))
+      / NULLIF(STDDEV(pointsCumulative) OVER (PARTITION BY seasonId, asOfDate), 0) AS pointsZScore,
+
+    (assistsCumulative - AVG(assistsCumulative) OVER (PARTITION BY seasonId, asOfDate))
+      / NULLIF(STDDEV(assistsCumulative) OVER (PARTITION BY seasonId, asOfDate), 0) AS assistsZScore,
+
+    (stealsCumulative - AVG(stealsCumulative) OVER (PARTITION BY seasonId, asOfDate))
+      / NULLIF(STDDEV(stealsCumulative) OVER (PARTITION BY seasonId, asOfDate), 0) AS stealsZScore,
+
+    (blocksCumulative - AVG(blocksCumulative) OVER (PARTITION BY seasonId, asOfDate))
+      / NULLIF(STDDEV(blocksCumulative) OVER (PARTITION BY seasonId, asOfDate), 0) AS blocksZScore,
+
+    (reboundsCumulative - AVG(reboundsCumulative) OVER (PARTITION BY seasonId, asOfDate))
+      / NULLIF(STDDEV(reboundsCumulative) OVER (PARTITION BY seasonId, asOfDate), 0) AS reboundsZScore,
+
+    (threesCumulative - AVG(threesCumulative) OVER (PARTITION BY seasonId, asOfDate))
+      / NULLIF(STDDEV(threesCumulative) OVER (PARTITION BY seasonId, asOfDate), 0) AS threesZScore,
+
+    (doubleDoubleCumulative - AVG(doubleDoubleCumulative) OVER (PARTITION BY seasonId, asOfDate))
+      / NULLIF(STDDEV(doubleDoubleCumulative) OVER (PARTITION BY seasonId, asOfDate), 0) AS doubleDoubleZScore,
+
+    (avgEfgPct - AVG(avgEfgPct) OVER (PARTITION BY seasonId, asOfDate))
+      / NULLIF(STDDEV(avgEfgPct) OVER (PARTITION BY seasonId, asOfDate), 0) AS efgPctZScore,
+
+    (avgFtPct - AVG(avgFtPct) OVER (PARTITION BY seasonId, asOfDate))
+      / NULLIF(STDDEV(avgFtPct) OVER (PARTITION BY seasonId, asOfDate), 0) AS ftPctZScore
+  FROM base
+)
+
+SELECT
+  *,
+  pointsZScore +
+  assistsZScore +
+  stealsZScore +
+  blocksZScore +
+  reboundsZScore +
+  threesZScore +
+  doubleDoubleZScore +
+  efgPctZScore +
+  ftPctZScore AS totalZ
+FROM z;
@@ -1,68 +1,68 @@
 MODEL (
   name fantasy.zscores_overall_current,
-  kind VIEW,
+  kind FULL,
+  grain (seasonid, personid),
   dialect duckdb,
-  description "Fantasy basketball combined z score table"
+  description "Fantasy basketball combined z score table: current season, latest daily snapshot present in all three z score snapshots"
 );
 WITH current_season AS (
-  SELECT MAX(seasonid) AS seasonid
-  FROM nba.fantasy.zscorescumulative
+  SELECT seasonid FROM raw.current_season
 ),
 
--- latest "averages" row per player (because zscoresaverages is game-dated)
-avg_latest AS (
-  SELECT *
+-- latest as-of date of the current season that all three snapshots have built, so a
+-- snapshot that lags (or failed) on the newest date does not blank out its columns
+as_of AS (
+  SELECT MAX(asofdate) AS asofdate
   FROM (
-    SELECT
-      seasonid,
-      CAST(personid AS VARCHAR) AS personid,
-      firstname,
-      familyname,
-      gamedate,
-
-      minuteszscore,
-      pointszscore,
-      assistszscore,
-      stealszscore,
-      blockszscore,
-      reboundszscore,
-      threeszscore,
-      doubledoublezscore,
-      efgpctzscore,
-      ftpctzscore,
-      totalz,
-
-      ROW_NUMBER() OVER (
-        PARTITION BY seasonid, personid
-        ORDER BY gamedate DESC NULLS LAST
-      ) AS rn
-    FROM nba.fantasy.zscoresaverages
+    SELECT asofdate FROM fantasy.zscorescumulative_daily
+    WHERE seasonid = (SELECT seasonid FROM current_season)
+    INTERSECT
+    SELECT asofdate FROM fantasy.zscoresaverages_daily
+    WHERE seasonid = (SELECT seasonid FROM current_season)
+    INTERSECT
+    SELECT asofdate FROM fantasy.zscores_last10_daily
     WHERE seasonid = (SELECT seasonid FROM current_season)
   )
-  WHERE rn = 1
 ),
 
--- latest "last10" row per player
-l10_latest AS (
-  SELECT *
-  FROM (
-    SELECT
-      seasonid,
-      CAST(personid AS VARCHAR) AS personid,
-      gamedate,
-      totalz AS last_10_totalz,
+-- each player's "averages" row as of that date
+avg_latest AS (
+  SELECT
+    seasonid,
+    CAST(personid AS VARCHAR) AS personid,
+    firstname,
+    familyname,
+    gamedate,
 
-      ROW_NUMBER() OVER (
-        PARTITION BY seasonid, personid
-        ORDER BY gamedate DESC NULLS LAST
-      ) AS rn
-    FROM nba.fantasy.zscores_last10
-    WHERE seasonid = (SELECT seasonid FROM current_season)
-  )
-  WHERE rn = 1
+    minuteszscore,
+    pointszscore,
+    assistszscore,
+    stealszscore,
+    blockszscore,
+    reboundszscore,
+    threeszscore,
+    doubledoublezscore,
+    efgpctzscore,
+    ftpctzscore,
+    totalz
+  FROM fantasy.zscoresaverages_daily
+  WHERE seasonid = (SELECT seasonid FROM current_season)
+    AND asofdate = (SELECT asofdate FROM as_of)
+),
+
+-- each player's "last10" row as of that date
+l10_latest AS (
+  SELECT
+    seasonid,
+    CAST(personid AS VARCHAR) AS personid,
+    gamedate,
+    totalz AS last_10_totalz
+  FROM fantasy.zscores_last10_daily
+  WHERE seasonid = (SELECT seasonid FROM current_season)
+    AND asofdate = (SELECT asofdate FROM as_of)
 ),
 
--- cumulative is already per-player (no gamedate)
+-- cumulative as of that date
 cum AS (
   SELECT
     seasonid,
@@ -81,13 +81,15 @@ cum AS (
     efgpctzscore AS cum_efgpctzscore,
     ftpctzscore AS cum_ftpctzscore,
     totalz AS cum_totalz
-  FROM nba.fantasy.zscorescumulative
+  FROM fantasy.zscorescumulative_daily
   WHERE seasonid = (SELECT seasonid FROM current_season)
+    AND asofdate = (SELECT asofdate FROM as_of)
 )
 
 SELECT
   c.seasonid,
   c.personid,
+  (SELECT asofdate FROM as_of) AS asofdate,
 
   -- prefer cumulative name, fallback to avg_latest
   COALESCE(c.firstname, a.firstname) AS firstname,
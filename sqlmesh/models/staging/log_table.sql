@@ -0,0 +1,19 @@
+MODEL (
+  name staging.log_table,
+  kind VIEW,
+  grain (gameId, teamId),
+  dialect duckdb,
+  description "raw.log_table typed: BIGINT keys, DATE gameDate, one row per team-game."
+);
+
+-- raw.log_table upserts key on (game_id, team_id), so this is one row per team-game already
+SELECT
+  TRY_CAST(game_id AS BIGINT) AS gameId,
+  TRY_CAST(team_id AS BIGINT) AS teamId,
+  TRY_CAST(season_id AS BIGINT) AS seasonId,
+  TRY_CAST(game_date AS DATE) AS gameDate,
+  team_abbreviation AS teamAbbreviation,
+  team_name AS teamName,
+  matchup,
+  wl AS winLoss
+FROM raw.log_table;
@@ -0,0 +1,58 @@
+MODEL (
+  name staging.players_advanced,
+  kind VIEW,
+  grain (gameId, personId),
+  dialect duckdb,
+  description "raw.players_advanced typed: BIGINT keys, DOUBLE stats, one row per player-game, dated from the log."
+);
+
+-- A view: the raw tables are stored typed (utils.duckdb_sink), so the stat casts are
+-- no-ops and nothing is copied. Joined on the raw text gameid (both sides are the API's
+-- zero-padded id), so a gameDate filter from base.players_combined reaches the raw scan
+-- as a join filter and an incremental run reads only its games' row groups. The raw
+-- upserts key on (gameid, teamid, personid): one row per player-game without a dedupe.
+WITH games AS (
+  SELECT DISTINCT
+    game_id,
+    TRY_CAST(game_id AS BIGINT) AS gameId,
+    TRY_CAST(game_date AS DATE) AS gameDate
+  FROM raw.log_table
+)
+
+SELECT
+  g.gameId,
+  g.gameDate,
+  TRY_CAST(p.personid AS BIGINT) AS personId,
+  TRY_CAST(p.teamid AS BIGINT) AS teamId,
+  p.firstname AS firstName,
+  p.familyname AS familyName,
+  p.playerslug AS playerSlug,
+  p.position AS position,
+  p.comment AS comment,
+  p.teamcity AS teamCity,
+  p.minutes AS minutes,
+
+  TRY_CAST(p.estimatedoffensiverating AS DOUBLE) AS estimatedOffensiveRating,
+  TRY_CAST(p.offensiverating AS DOUBLE) AS offensiveRating,
+  TRY_CAST(p.estimateddefensiverating AS DOUBLE) AS estimatedDefensiveRating,
+  TRY_CAST(p.defensiverating AS DOUBLE) AS defensiveRating,
+  TRY_CAST(p.estimatednetrating AS DOUBLE) AS estimatedNetRating,
+  TRY_CAST(p.netrating AS DOUBLE) AS netRating,
+  TRY_CAST(p.assistpercentage AS DOUBLE) AS assistPercentage,
+  TRY_CAST(p.assisttoturnover AS DOUBLE) AS assistToTurnover,
+  TRY_CAST(p.assistratio AS DOUBLE) AS assistRatio,
+  TRY_CAST(p.offensivereboundpercentage AS DOUBLE) AS offensiveReboundPercentage,
+  TRY_CAST(p.defensivereboundpercentage AS DOUBLE) AS defensiveReboundPercentage,
+  TRY_CAST(p.reboundpercentage AS DOUBLE) AS reboundPercentage,
+  TRY_CAST(p.effectivefieldgoalpercentage AS DOUBLE) AS effectiveFieldGoalPercentage,
+  TRY_CAST(p.trueshootingpercentage AS DOUBLE) AS trueShootingPercentage,
+  TRY_CAST(p.usagepercentage AS DOUBLE) AS usagePercentage,
+  TRY_CAST(p.estimatedusagepercentage AS DOUBLE) AS estimatedUsagePercentage,
+  TRY_CAST(p.estimatedpace AS DOUBLE) AS estimatedPace,
+  TRY_CAST(p.pace AS DOUBLE) AS pace,
+  TRY_CAST(p.paceper40 AS DOUBLE) AS pacePer40,
+  TRY_CAST(p.possessions AS DOUBLE) AS possessions,
+  TRY_CAST(p.pie AS DOUBLE) AS PIE
+FROM raw.players_advanced p
+JOIN games g
+  ON p.gameid = g.game_id;
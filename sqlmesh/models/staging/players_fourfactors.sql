@@ -0,0 +1,45 @@
+MODEL (
+  name staging.players_fourfactors,
+  kind VIEW,
+  grain (gameId, personId),
+  dialect duckdb,
+  description "raw.players_fourfactors typed: BIGINT keys, DOUBLE stats, one row per player-game, dated from the log."
+);
+
+-- A view: the raw tables are stored typed (utils.duckdb_sink), so the stat casts are
+-- no-ops and nothing is copied. Joined on the raw text gameid (both sides are the API's
+-- zero-padded id), so a gameDate filter from base.players_combined reaches the raw scan
+-- as a join filter and an incremental run reads only its games' row groups. The raw
+-- upserts key on (gameid, teamid, personid): one row per player-game without a dedupe.
+WITH games AS (
+  SELECT DISTINCT
+    game_id,
+    TRY_CAST(game_id AS BIGINT) AS gameId,
+    TRY_CAST(game_date AS DATE) AS gameDate
+  FROM raw.log_table
+)
+
+SELECT
+  g.gameId,
+  g.gameDate,
+  TRY_CAST(p.personid AS BIGINT) AS personId,
+  TRY_CAST(p.teamid AS BIGINT) AS teamId,
+  p.firstname AS firstName,
+  p.familyname AS familyName,
+  p.playerslug AS playerSlug,
+  p.position AS position,
+  p.comment AS comment,
+  p.teamcity AS teamCity,
+  p.minutes AS minutes,
+
+  TRY_CAST(p.effectivefieldgoalpercentage AS DOUBLE) AS effectiveFieldGoalPercentage,
+  TRY_CAST(p.freethrowattemptrate AS DOUBLE) AS freeThrowAttemptRate,
+  TRY_CAST(p.teamturnoverpercentage AS DOUBLE) AS teamTurnoverPercentage,
+  TRY_CAST(p.offensivereboundpercentage AS DOUBLE) AS offensiveReboundPercentage,
+  TRY_CAST(p.oppeffectivefieldgoalpercentage AS DOUBLE) AS oppEffectiveFieldGoalPercentage,
+  TRY_CAST(p.oppfreethrowattemptrate AS DOUBLE) AS oppFreeThrowAttemptRate,
+  TRY_CAST(p.oppteamturnoverpercentage AS DOUBLE) AS oppTeamTurnoverPercentage,
+  TRY_CAST(p.oppoffensivereboundpercentage AS DOUBLE) AS oppOffensiveReboundPercentage
+FROM raw.players_fourfactors p
+JOIN games g
+  ON p.gameid = g.game_id;
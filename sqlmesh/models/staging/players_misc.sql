@@ -0,0 +1,49 @@
+MODEL (
+  name staging.players_misc,
+  kind VIEW,
+  grain (gameId, personId),
+  dialect duckdb,
+  description "raw.players_misc typed: BIGINT keys, DOUBLE stats, one row per player-game, dated from the log."
+);
+
+-- A view: the raw tables are stored typed (utils.duckdb_sink), so the stat casts are
+-- no-ops and nothing is copied. Joined on the raw text gameid (both sides are the API's
+-- zero-padded id), so a gameDate filter from base.players_combined reaches the raw scan
+-- as a join filter and an incremental run reads only its games' row groups. The raw
+-- upserts key on (gameid, teamid, personid): one row per player-game without a dedupe.
+WITH games AS (
+  SELECT DISTINCT
+    game_id,
+    TRY_CAST(game_id AS BIGINT) AS gameId,
+    TRY_CAST(game_date AS DATE) AS gameDate
+  FROM raw.log_table
+)
+
+SELECT
+  g.gameId,
+  g.gameDate,
+  TRY_CAST(p.personid AS BIGINT) AS personId,
+  TRY_CAST(p.teamid AS BIGINT) AS teamId,
+  p.firstname AS firstName,
+  p.familyname AS familyName,
+  p.playerslug AS playerSlug,
+  p.position AS position,
+  p.comment AS comment,
+  p.teamcity AS teamCity,
+  p.minutes AS minutes,
+
+  TRY_CAST(p.pointsoffturnovers AS DOUBLE) AS pointsOffTurnovers,
+  TRY_CAST(p.pointssecondchance AS DOUBLE) AS pointsSecondChance,
+  TRY_CAST(p.pointsfastbreak AS DOUBLE) AS pointsFastBreak,
+  TRY_CAST(p.pointspaint AS DOUBLE) AS pointsPaint,
+  TRY_CAST(p.opppointsoffturnovers AS DOUBLE) AS oppPointsOffTurnovers,
+  TRY_CAST(p.opppointssecondchance AS DOUBLE) AS oppPointsSecondChance,
+  TRY_CAST(p.opppointsfastbreak AS DOUBLE) AS oppPointsFastBreak,
+  TRY_CAST(p.opppointspaint AS DOUBLE) AS oppPointsPaint,
+  TRY_CAST(p.blocks AS DOUBLE) AS blocks,
+  TRY_CAST(p.blocksagainst AS DOUBLE) AS blocksAgainst,
+  TRY_CAST(p.foulspersonal AS DOUBLE) AS foulsPersonal,
+  TRY_CAST(p.foulsdrawn AS DOUBLE) AS foulsDrawn
+FROM raw.players_misc p
+JOIN games g
+  ON p.gameid = g.game_id;
@@ -0,0 +1,52 @@
+MODEL (
+  name staging.players_scoring,
+  kind VIEW,
+  grain (gameId, personId),
+  dialect duckdb,
+  description "raw.players_scoring typed: BIGINT keys, DOUBLE stats, one row per player-game, dated from the log."
+);
+
+-- A view: the raw tables are stored typed (utils.duckdb_sink), so the stat casts are
+-- no-ops and nothing is copied. Joined on the raw text gameid (both sides are the API's
+-- zero-padded id), so a gameDate filter from base.players_combined reaches the raw scan
+-- as a join filter and an incremental run reads only its games' row groups. The raw
+-- upserts key on (gameid, teamid, personid): one row per player-game without a dedupe.
+WITH games AS (
+  SELECT DISTINCT
+    game_id,
+    TRY_CAST(game_id AS BIGINT) AS gameId,
+    TRY_CAST(game_date AS DATE) AS gameDate
+  FROM raw.log_table
+)
+
+SELECT
+  g.gameId,
+  g.gameDate,
+  TRY_CAST(p.personid AS BIGINT) AS personId,
+  TRY_CAST(p.teamid AS BIGINT) AS teamId,
+  p.firstname AS firstName,
+  p.familyname AS familyName,
+  p.playerslug AS playerSlug,
+  p.position AS position,
+  p.comment AS comment,
+  p.teamcity AS teamCity,
+  p.minutes AS minutes,
+
+  TRY_CAST(p.percentagefieldgoalsattempted2pt AS DOUBLE) AS percentageFieldGoalsAttempted2pt,
+  TRY_CAST(p.percentagefieldgoalsattempted3pt AS DOUBLE) AS percentageFieldGoalsAttempted3pt,
+  TRY_CAST(p.percentagepoints2pt AS DOUBLE) AS percentagePoints2pt,
+  TRY_CAST(p.percentagepointsmidrange2pt AS DOUBLE) AS percentagePointsMidrange2pt,
+  TRY_CAST(p.percentagepoints3pt AS DOUBLE) AS percentagePoints3pt,
+  TRY_CAST(p.percentagepointsfastbreak AS DOUBLE) AS percentagePointsFastBreak,
+  TRY_CAST(p.percentagepointsfreethrow AS DOUBLE) AS percentagePointsFreeThrow,
+  TRY_CAST(p.percentagepointsoffturnovers AS DOUBLE) AS percentagePointsOffTurnovers,
+  TRY_CAST(p.percentagepointspaint AS DOUBLE) AS percentagePointsPaint,
+  TRY_CAST(p.percentageassisted2pt AS DOUBLE) AS percentageAssisted2pt,
+  TRY_CAST(p.percentageunassisted2pt AS DOUBLE) AS percentageUnassisted2pt,
+  TRY_CAST(p.percentageassisted3pt AS DOUBLE) AS percentageAssisted3pt,
+  TRY_CAST(p.percentageunassisted3pt AS DOUBLE) AS percentageUnassisted3pt,
+  TRY_CAST(p.percentageassistedfgm AS DOUBLE) AS percentageAssistedFGM,
+  TRY_CAST(p.percentageunassistedfgm AS DOUBLE) AS percentageUnassistedFGM
+FROM raw.players_scoring p
+JOIN games g
+  ON p.gameid = g.game_id;
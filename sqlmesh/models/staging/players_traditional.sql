@@ -0,0 +1,57 @@
+MODEL (
+  name staging.players_traditional,
+  kind VIEW,
+  grain (gameId, personId),
+  dialect duckdb,
+  description "raw.players_traditional typed: BIGINT keys, DOUBLE stats, one row per player-game, dated from the log."
+);
+
+-- A view: the raw tables are stored typed (utils.duckdb_sink), so the stat casts are
+-- no-ops and nothing is copied. Joined on the raw text gameid (both sides are the API's
+-- zero-padded id), so a gameDate filter from base.players_combined reaches the raw scan
+-- as a join filter and an incremental run reads only its games' row groups. The raw
+-- upserts key on (gameid, teamid, personid): one row per player-game without a dedupe.
+WITH games AS (
+  SELECT DISTINCT
+    game_id,
+    TRY_CAST(game_id AS BIGINT) AS gameId,
+    TRY_CAST(game_date AS DATE) AS gameDate
+  FROM raw.log_table
+)
+
+SELECT
+  g.gameId,
+  g.gameDate,
+  TRY_CAST(p.personid AS BIGINT) AS personId,
+  TRY_CAST(p.teamid AS BIGINT) AS teamId,
+  p.teamtricode AS teamTricode,
+  p.firstname AS firstName,
+  p.familyname AS familyName,
+  p.playerslug AS playerSlug,
+  p.position AS position,
+  p.comment AS comment,
+  p.teamcity AS teamCity,
+  p.minutes AS minutes,
+
+  TRY_CAST(p.points AS DOUBLE) AS points,
+  TRY_CAST(p.fieldgoalsmade AS DOUBLE) AS fieldGoalsMade,
+  TRY_CAST(p.fieldgoalsattempted AS DOUBLE) AS fieldGoalsAttempted,
+  TRY_CAST(p.fieldgoalspercentage AS DOUBLE) AS fieldGoalsPercentage,
+  TRY_CAST(p.threepointersmade AS DOUBLE) AS threePointersMade,
+  TRY_CAST(p.threepointersattempted AS DOUBLE) AS threePointersAttempted,
+  TRY_CAST(p.threepointerspercentage AS DOUBLE) AS threePointersPercentage,
+  TRY_CAST(p.freethrowsmade AS DOUBLE) AS freeThrowsMade,
+  TRY_CAST(p.freethrowsattempted AS DOUBLE) AS freeThrowsAttempted,
+  TRY_CAST(p.freethrowspercentage AS DOUBLE) AS freeThrowsPercentage,
+  TRY_CAST(p.reboundsoffensive AS DOUBLE) AS reboundsOffensive,
+  TRY_CAST(p.reboundsdefensive AS DOUBLE) AS reboundsDefensive,
+  TRY_CAST(p.reboundstotal AS DOUBLE) AS reboundsTotal,
+  TRY_CAST(p.assists AS DOUBLE) AS assists,
+  TRY_CAST(p.steals AS DOUBLE) AS steals,
+  TRY_CAST(p.blocks AS DOUBLE) AS blocks,
+  TRY_CAST(p.foulspersonal AS DOUBLE) AS foulsPersonal,
+  TRY_CAST(p.turnovers AS DOUBLE) AS turnovers,
+  TRY_CAST(p.plusminuspoints AS DOUBLE) AS plusMinusPoints
+FROM raw.players_traditional p
+JOIN games g
+  ON p.gameid = g.game_id;
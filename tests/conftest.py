@@ -0,0 +1,33 @@
+# conftest.py
+import os
+import shutil
+import tempfile
+
+import pytest
+
+
+def pytest_sessionstart(session):
+    """
+    utils.logger and the default data paths (archive, payload cache, logs) resolve against
+    the working directory at import time, so the tests run (and import utils) from a
+    scratch directory and never write into the repo. No test talks to stats.nba.com or
+    Snowflake.
+    """
+    session.config._nba26_workdir = tempfile.mkdtemp(prefix="nba26-tests-")
+    os.chdir(session.config._nba26_workdir)
+    os.environ.setdefault("NBA_MAX_RETRIES", "1")
+    os.environ.setdefault("NBA_CACHE", "0")
+
+
+def pytest_sessionfinish(session):
+    shutil.rmtree(getattr(session.config, "_nba26_workdir", ""), ignore_errors=True)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """Fresh DuckDB file with the raw schema."""
+    from utils.duckdb_sink import get_duckdb_conn
+
+    c = get_duckdb_conn(str(tmp_path / "db" / "nba.duckdb"))
+    yield c
+    c.close()
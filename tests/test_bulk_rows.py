@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from utils.fake_snowflake import FakeSnowflakeConnection
+from utils.league_game_log import BULK_STARTERS_BENCH
+from utils.sinks import upsert_endpoint_batch
+from utils.snowflake_sink import bulk_rows_delete_sql, merge_stage, sf_table_info
+
+GID = "0022500001"
+
+
+def _teams(rows):
+    """rows: (gameId, teamId, startersBench, pts)"""
+    return pd.DataFrame(rows, columns=["gameId", "teamId", "startersBench", "pts"])
+
+
+def _team_rows(fetch):
+    return sorted((str(g), str(t), sb, int(p)) for g, t, sb, p in fetch)
+
+
+# ============================================================
+# DUCKDB
+# ============================================================
+
+def test_box_score_rows_replace_bulk_row(conn):
+    bulk = _teams([(GID, "1", BULK_STARTERS_BENCH, 110), ("0022500002", "1", BULK_STARTERS_BENCH, 99)])
+    upsert_endpoint_batch(conn, "traditional", bulk, None)
+    upsert_endpoint_batch(conn, "traditional", _teams([(GID, "1", "Starters", 80), (GID, "1", "Bench", 30)]), None)
+
+    rows = conn.execute("SELECT gameid, teamid, startersbench, pts FROM raw.teams_traditional").fetchall()
+    assert _team_rows(rows) == [
+        (GID, "1", "Bench", 30),
+        (GID, "1", "Starters", 80),
+        ("0022500002", "1", BULK_STARTERS_BENCH, 99),
+    ]
+
+
+def test_bulk_row_rescrape_updates_in_place(conn):
+    upsert_endpoint_batch(conn, "traditional", _teams([(GID, "1", BULK_STARTERS_BENCH, 110)]), None)
+    upsert_endpoint_batch(conn, "traditional", _teams([(GID, "1", BULK_STARTERS_BENCH, 112)]), None)
+
+    rows = conn.execute("SELECT gameid, teamid, startersbench, pts FROM raw.teams_traditional").fetchall()
+    assert _team_rows(rows) == [(GID, "1", BULK_STARTERS_BENCH, 112)]
+
+
+# ============================================================
+# SNOWFLAKE
+# ============================================================
+
+COLUMNS = ["GAMEID", "TEAMID", "STARTERSBENCH", "PTS"]
+
+
+@pytest.fixture
+def sf(tmp_path):
+    c = FakeSnowflakeConnection(stage_dir=str(tmp_path / "stages"))
+    cols = ", ".join(f"{col} STRING" for col in COLUMNS)
+    with c.cursor() as cur:
+        cur.execute(f"CREATE TABLE NBA.RAW.TEAMS_TRADITIONAL ({cols})")
+        cur.execute(f"CREATE TABLE NBA.STAGE.TEAMS_TRADITIONAL_STAGE ({cols})")
+        cur.execute(f"INSERT INTO NBA.RAW.TEAMS_TRADITIONAL VALUES ('{GID}', '1', '{BULK_STARTERS_BENCH}', '110')")
+    yield c
+    c.close()
+
+
+def _merge(sf, rows):
+    target, stage, keys = sf_table_info("traditional", is_team=True)
+    with sf.cursor() as cur:
+        cur.execute(f"DELETE FROM NBA.STAGE.{stage}")
+        for row in rows:
+            cur.execute(f"INSERT INTO NBA.STAGE.{stage} VALUES (%s, %s, %s, %s)", list(row))
+        merge_stage(cur, target, stage, COLUMNS, keys)
+        cur.execute("SELECT * FROM NBA.RAW.TEAMS_TRADITIONAL")
+        return _team_rows(cur.fetchall())
+
+
+def test_snowflake_merge_replaces_bulk_row(sf):
+    rows = _merge(sf, [(GID, "1", "Starters", "80"), (GID, "1", "Bench", "30")])
+    assert rows == [(GID, "1", "Bench", 30), (GID, "1", "Starters", 80)]
+
+
+def test_snowflake_bulk_merge_keeps_bulk_row(sf):
+    assert _merge(sf, [(GID, "1", BULK_STARTERS_BENCH, "112")]) == [(GID, "1", BULK_STARTERS_BENCH, 112)]
+
+
+def test_only_team_traditional_has_bulk_rows():
+    assert bulk_rows_delete_sql("TEAMS_TRADITIONAL", "TEAMS_TRADITIONAL_STAGE") is not None
+    assert bulk_rows_delete_sql("PLAYERS_TRADITIONAL", "PLAYERS_TRADITIONAL_STAGE") is None
+    assert bulk_rows_delete_sql("TEAMS_ADVANCED", "TEAMS_ADVANCED_STAGE") is None
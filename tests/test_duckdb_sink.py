@@ -0,0 +1,119 @@
+import json
+
+import duckdb
+import pandas as pd
+
+from utils.duckdb_sink import (
+    QUARANTINE_COL,
+    registered_types,
+    replace_table_from_parquet,
+    upsert_delete_insert,
+)
+
+KEYS = ["gameid", "personid"]
+
+
+def _types(conn, table="players_test"):
+    rows = conn.execute(
+        "SELECT column_name, data_type FROM information_schema.columns WHERE table_schema = 'raw' AND table_name = ?",
+        [table],
+    ).fetchall()
+    return dict(rows)
+
+
+def _upsert(conn, rows, table="players_test"):
+    upsert_delete_insert(conn, pd.DataFrame(rows), schema="raw", table=table, key_cols=KEYS)
+
+
+def _row(conn, personid, cols, table="players_test"):
+    return conn.execute(f"SELECT {cols} FROM raw.{table} WHERE personid = ?", [personid]).fetchone()
+
+
+# ============================================================
+# TYPES / WIDENING
+# ============================================================
+
+def test_new_table_is_typed_and_ids_stay_text(conn):
+    _upsert(conn, [{"gameId": "0022500001", "personId": "1", "points": "12", "gameDate": "2025-10-21"}])
+
+    types = _types(conn)
+    assert types["gameid"] == "VARCHAR"
+    assert types["personid"] == "VARCHAR"
+    assert types["points"] == "BIGINT"
+    assert types["gamedate"] == "DATE"
+    assert _row(conn, "1", "gameid")[0] == "0022500001"
+
+
+def test_bigint_column_widens_to_double(conn):
+    _upsert(conn, [{"gameid": "g1", "personid": "1", "pct": "1"}])
+    _upsert(conn, [{"gameid": "g1", "personid": "2", "pct": "0.5"}])
+
+    assert _types(conn)["pct"] == "DOUBLE"
+    assert registered_types(conn, "raw", "players_test")["pct"] == "DOUBLE"
+    assert _row(conn, "1", "pct")[0] == 1.0
+    assert _row(conn, "2", "pct")[0] == 0.5
+
+
+def test_text_never_widens_a_typed_column(conn):
+    _upsert(conn, [{"gameid": "g1", "personid": "1", "points": "10"}])
+    _upsert(conn, [{"gameid": "g1", "personid": "2", "points": "DNP"}])
+
+    assert _types(conn)["points"] == "BIGINT"
+
+
+def test_null_only_column_is_typed_by_its_first_value(conn):
+    _upsert(conn, [{"gameid": "g1", "personid": "1", "plusminus": None}])
+    assert registered_types(conn, "raw", "players_test")["plusminus"] == "UNTYPED"
+    assert _types(conn)["plusminus"] == "VARCHAR"
+
+    _upsert(conn, [{"gameid": "g1", "personid": "2", "plusminus": "-4"}])
+
+    assert registered_types(conn, "raw", "players_test")["plusminus"] == "BIGINT"
+    assert _types(conn)["plusminus"] == "BIGINT"
+    assert _row(conn, "2", "plusminus")[0] == -4
+
+
+# ============================================================
+# QUARANTINE
+# ============================================================
+
+def test_unparseable_value_is_nulled_and_quarantined(conn):
+    _upsert(conn, [{"gameid": "g1", "personid": "1", "points": "10"}])
+    _upsert(conn, [{"gameid": "g1", "personid": "2", "points": "n/a"}])
+
+    points, quarantine = _row(conn, "2", f"points, {QUARANTINE_COL}")
+    assert points is None
+    assert json.loads(quarantine) == {"points": "n/a"}
+    assert _row(conn, "1", QUARANTINE_COL)[0] is None
+
+
+def test_empty_string_is_null_not_quarantined(conn):
+    _upsert(conn, [{"gameid": "g1", "personid": "1", "points": "10"}])
+    _upsert(conn, [{"gameid": "g1", "personid": "2", "points": " "}])
+
+    assert _row(conn, "2", f"points, {QUARANTINE_COL}") == (None, None)
+
+
+def test_parquet_rebuild_keeps_registry_types_and_quarantine(conn, tmp_path):
+    _upsert(conn, [{"gameid": "g1", "personid": "1", "points": "10", "pct": "0.5"}])
+    path = str(tmp_path / "players.parquet")
+    # archive segments hold the fetched text; camelCase names as the API returns them
+    src = duckdb.connect()
+    src.execute(
+        f"""
+        COPY (
+            SELECT * FROM (VALUES ('g1', '1', '10', '0.5'), ('g2', '2', 'bad', '1'))
+                t(gameId, personId, points, pct)
+        ) TO '{path}' (FORMAT PARQUET)
+        """
+    )
+    src.close()
+
+    assert replace_table_from_parquet(conn, "raw", "players_test", path) == 2
+
+    types = _types(conn)
+    assert types["points"] == "BIGINT"
+    assert types["pct"] == "DOUBLE"
+    points, pct, quarantine = _row(conn, "2", f"points, pct, {QUARANTINE_COL}")
+    assert (points, pct) == (None, 1.0)
+    assert json.loads(quarantine) == {"points": "bad"}
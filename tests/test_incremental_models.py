@@ -0,0 +1,209 @@
+import random
+import re
+from datetime import date, timedelta
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pytest
+
+MODELS = Path(__file__).resolve().parent.parent / "sqlmesh" / "models" / "base"
+
+TEXT_COLS = {
+    "gameid", "matchup", "winloss", "teamtricode", "teamname", "teamcity", "teamabbreviation",
+    "firstname", "familyname", "playerslug", "position", "comment", "minutes",
+}
+TYPED_COLS = {"gamedate": "DATE", "teamid": "BIGINT", "seasonid": "BIGINT", "personid": "BIGINT"}
+
+# columns base.teams_processed derives itself (everything else under t1. comes from teams_combined)
+TEAMS_DERIVED = {
+    "nextgameid", "seasontype", "scorediff", "homegame", "hometeam", "awayteam", "opponentpoints",
+    "coverresult", "overunderresult", "dayssincelastgame", "isbacktoback", "lastteamgamedate",
+    "gameslast4days", "gameslast6days", "recompute",
+}
+# columns base.players_processed derives itself (everything else under rg., and the minutes text,
+# comes from players_combined)
+PLAYERS_DERIVED = {"minutesstr", "nextgameid", "gamecount", "playedflag", "gamesplayed", "rnplayed"}
+
+
+def _model(name):
+    """Model query with the MODEL block stripped; the interval and @this_model are rendered by _run."""
+    sql = (MODELS / f"{name}.sql").read_text()
+    return sql[sql.index(");") + 2:].strip().rstrip(";")
+
+
+def _run(conn, query, start, end, into="run_out"):
+    """Run a rendered model query over [start, end] into a scratch table."""
+    sql = (
+        query.replace("@start_date", f"DATE '{start}'")
+        .replace("@end_date", f"DATE '{end}'")
+        .replace("@this_model", "base.teams_processed")
+    )
+    conn.execute(f"CREATE OR REPLACE TABLE {into} AS {sql}")
+
+
+def _upsert(conn, table, keys, src="run_out"):
+    """Upsert by unique key, as INCREMENTAL_BY_UNIQUE_KEY does."""
+    cond = " AND ".join(f"t.{k} = s.{k}" for k in keys)
+    conn.execute(f"DELETE FROM {table} t WHERE EXISTS (SELECT 1 FROM {src} s WHERE {cond})")
+    conn.execute(f"INSERT INTO {table} BY NAME SELECT * FROM {src}")
+
+
+def _assert_same_rows(conn, table, expected, keys):
+    order = ", ".join(keys)
+    got = conn.execute(f"SELECT * FROM {table} ORDER BY {order}").df()
+    want = conn.execute(f"SELECT {', '.join(got.columns)} FROM {expected} ORDER BY {order}").df()
+    assert len(got) == len(want)
+    pd.testing.assert_frame_equal(got, want)
+
+
+def _team_columns():
+    query = _model("teams_processed")
+    cols = {c.lower() for c in re.findall(r"\bt1\.(\w+)", query)} - TEAMS_DERIVED
+    return cols | {"points", "plusminus", "matchup", "winloss", "line", "overunder"}
+
+
+def _player_columns():
+    query = _model("players_processed")
+    cols = {c.lower() for c in re.findall(r"\brg\.(\w+)", query)} - PLAYERS_DERIVED
+    return cols | {"minutes"}
+
+
+def _schedule(seed=7):
+    """Two short seasons of a four-team league: at most two games a night, some nights off."""
+    rng = random.Random(seed)
+    rows, n = [], 0
+    for season, start in ((22024, date(2024, 10, 22)), (22025, date(2025, 10, 21))):
+        for day in range(40):
+            d = start + timedelta(days=day)
+            if rng.random() < 0.4:
+                continue
+            teams = rng.sample([1, 2, 3, 4], 4)
+            for home, away in ((teams[0], teams[1]), (teams[2], teams[3])):
+                if rng.random() < 0.3:
+                    continue
+                n += 1
+                hp, ap = rng.randint(90, 130), rng.randint(90, 130)
+                ap += hp == ap
+                for me, opp, mp, op, at in ((home, away, hp, ap, " vs. "), (away, home, ap, hp, " @ ")):
+                    rows.append({
+                        "gameid": f"{n:010d}", "gamedate": d, "teamid": me, "seasonid": season,
+                        "teamtricode": f"T{me}", "matchup": f"T{me}{at}T{opp}",
+                        "winloss": "W" if mp > op else "L", "points": mp, "plusminus": mp - op,
+                        "line": rng.choice([None, -3.5, 2.5]), "overunder": rng.choice([None, 221.5]),
+                    })
+    return pd.DataFrame(rows)
+
+
+def _box_scores(games, seed=11):
+    """Three players a team; some sit out (DNP) and some miss games entirely (no row)."""
+    rng = random.Random(seed)
+    rows = []
+    for g in games.itertuples():
+        for pid in (g.teamid * 10 + k for k in range(1, 4)):
+            roll = rng.random()
+            if roll < 0.15:
+                continue
+            rows.append({
+                "personid": pid, "gameid": g.gameid, "gamedate": g.gamedate, "teamid": g.teamid,
+                "seasonid": g.seasonid, "matchup": g.matchup, "winloss": g.winloss,
+                "minutes": "" if roll < 0.3 else "24:30", "points": rng.randint(0, 30),
+            })
+    return pd.DataFrame(rows)
+
+
+def _create(conn, table, cols, df):
+    ddl = ", ".join(
+        f"{c} {TYPED_COLS.get(c, 'VARCHAR' if c in TEXT_COLS else 'DOUBLE')}" for c in sorted(cols)
+    )
+    conn.execute(f"CREATE TABLE {table} ({ddl})")
+    conn.register("src", df)
+    conn.execute(f"INSERT INTO {table} BY NAME SELECT * FROM src")
+    conn.unregister("src")
+
+
+@pytest.fixture
+def league():
+    conn = duckdb.connect()
+    conn.execute("CREATE SCHEMA base")
+    games = _schedule()
+    _create(conn, "all_teams", _team_columns(), games)
+    _create(conn, "all_players", _player_columns(), _box_scores(games))
+    yield conn, games
+    conn.close()
+
+
+def _load_through(conn, day):
+    """base.teams_combined / base.players_combined as they stood after `day`'s games were ingested."""
+    conn.execute("CREATE OR REPLACE TABLE base.teams_combined AS SELECT * FROM all_teams WHERE gamedate <= ?", [day])
+    conn.execute("CREATE OR REPLACE TABLE base.players_combined AS SELECT * FROM all_players WHERE gamedate <= ?", [day])
+
+
+def _intervals(games, seed=3):
+    """Run intervals spanning one to three game nights, in order, covering every game."""
+    rng = random.Random(seed)
+    dates = sorted(games["gamedate"].unique())
+    i = 0
+    while i < len(dates):
+        j = min(len(dates), i + rng.randint(1, 3))
+        yield dates[i], dates[j - 1]
+        i = j
+
+
+def _full_teams(conn):
+    """One run over all of history against an empty model, as a full rebuild does."""
+    _load_through(conn, date(2100, 1, 1))
+    # the empty model only needs the columns the seed CTEs read
+    conn.execute(
+        """
+        CREATE OR REPLACE TABLE base.teams_processed (
+            teamId BIGINT, seasonId BIGINT, gameDate DATE, gameNumber BIGINT, winsSoFar BIGINT,
+            lossesSoFar BIGINT, MATCHUP VARCHAR, winLoss VARCHAR, winsVsOpponent BIGINT, lossesVsOpponent BIGINT
+        )
+        """
+    )
+    _run(conn, _model("teams_processed"), "1900-01-01", "2100-01-01", into="rebuilt_teams")
+
+
+# ============================================================
+# base.teams_processed
+# ============================================================
+
+def test_teams_processed_incremental_matches_full_rebuild(league):
+    conn, games = league
+    _full_teams(conn)
+    assert conn.execute("SELECT COUNT(*) FROM rebuilt_teams").fetchone()[0] == len(games)
+
+    query = _model("teams_processed")
+    conn.execute("CREATE OR REPLACE TABLE base.teams_processed AS SELECT * FROM rebuilt_teams WHERE false")
+    for start, end in _intervals(games):
+        _load_through(conn, end)
+        _run(conn, query, start, end)
+        _upsert(conn, "base.teams_processed", ["teamId", "gameId"])
+
+    _assert_same_rows(conn, "base.teams_processed", "rebuilt_teams", ["teamId", "gameId"])
+
+
+# ============================================================
+# base.players_processed
+# ============================================================
+
+def test_players_processed_incremental_matches_full_rebuild(league):
+    conn, games = league
+    _full_teams(conn)
+
+    teams_query, players_query = _model("teams_processed"), _model("players_processed")
+    conn.execute("CREATE OR REPLACE TABLE base.teams_processed AS SELECT * FROM rebuilt_teams WHERE false")
+    for i, (start, end) in enumerate(_intervals(games)):
+        _load_through(conn, end)
+        _run(conn, teams_query, start, end)
+        _upsert(conn, "base.teams_processed", ["teamId", "gameId"])
+        _run(conn, players_query, start, end)
+        if i == 0:
+            conn.execute("CREATE TABLE base.players_processed AS SELECT * FROM run_out WHERE false")
+        _upsert(conn, "base.players_processed", ["personId", "gameId"])
+
+    # base.teams_processed now holds the full rebuild (test above)
+    _run(conn, players_query, "1900-01-01", "2100-01-01", into="rebuilt_players")
+    assert conn.execute("SELECT COUNT(*) FROM rebuilt_players").fetchone()[0] == len(_box_scores(games))
+    _assert_same_rows(conn, "base.players_processed", "rebuilt_players", ["personId", "gameId"])
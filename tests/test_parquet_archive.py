@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+
+import duckdb
+import pandas as pd
+import pytest
+
+from utils.parquet_archive import (
+    INDEX_FILE,
+    archive_files,
+    archive_games,
+    archived_gameids,
+    compact_season,
+    read_archive,
+    season_from_gameid,
+)
+
+
+def _games(gids, points=0):
+    return pd.DataFrame({"gameId": gids, "personId": ["1"] * len(gids), "points": [points] * len(gids)})
+
+
+def _dates(gids):
+    return {gid: "2025-10-21" for gid in gids}
+
+
+def _points(root, gid):
+    df = read_archive("players", "traditional", root=root, gameids=[gid])
+    return df["points"].tolist()
+
+
+# ============================================================
+# SEASON MAPPING
+# ============================================================
+
+@pytest.mark.parametrize(
+    "gid, season",
+    [
+        ("0022500059", "2025-26"),
+        ("0042400101", "2024-25"),
+        ("0020000001", "2000-01"),
+        ("0029800001", "1998-99"),
+        ("0029900001", "1999-00"),
+        ("0024600001", "1946-47"),
+        ("22500059", "2025-26"),
+    ],
+)
+def test_season_from_gameid(gid, season):
+    assert season_from_gameid(gid) == season
+
+
+# ============================================================
+# INDEX
+# ============================================================
+
+def test_rewritten_game_replaces_its_segment(tmp_path):
+    root = str(tmp_path)
+    gids = ["0022500001", "0022500002"]
+    archive_games(_games(gids, points=1), "players", "traditional", _dates(gids), root)
+    archive_games(_games(["0022500001"], points=2), "players", "traditional", _dates(gids), root)
+
+    assert _points(root, "0022500001") == [2]
+    assert _points(root, "0022500002") == [1]
+    # the superseded segment is gone: one live file per game
+    files = archive_files("players", "traditional", root=root)
+    assert len(files) == 2
+    assert all(os.path.exists(f) for f in files)
+
+
+def test_season_filter_reads_only_that_season(tmp_path):
+    root = str(tmp_path)
+    gids = ["0022400001", "0022500001", "0029800001"]
+    archive_games(_games(gids), "players", "traditional", _dates(gids), root)
+
+    assert archived_gameids("players", "traditional", "2024-25", root) == {"0022400001"}
+    assert archived_gameids("players", "traditional", "1998-99", root) == {"0029800001"}
+    assert archived_gameids("players", "traditional", root=root) == set(gids)
+
+
+def test_legacy_archive_is_indexed_on_first_use(tmp_path):
+    table_dir = tmp_path / "players_traditional"
+    con = duckdb.connect()
+    for gid in ["0022500001", "0022500002"]:
+        path = table_dir / "season=2025-26" / "gameDate=2025-10-21" / f"{gid}.parquet"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        con.execute(f"COPY (SELECT '{gid}' AS gameId, 7 AS points) TO '{path}' (FORMAT parquet)")
+    con.close()
+
+    assert archived_gameids("players", "traditional", root=str(tmp_path)) == {"0022500001", "0022500002"}
+    assert (table_dir / INDEX_FILE).exists()
+    assert _points(str(tmp_path), "0022500002") == [7]
+
+
+def test_compaction_keeps_latest_rows(tmp_path):
+    root = str(tmp_path)
+    gids = [f"00225000{i:02d}" for i in range(1, 6)]
+    archive_games(_games(gids, points=1), "players", "traditional", _dates(gids), root)
+
+    assert compact_season("players", "traditional", "2025-26", root) == 5
+    assert len(archive_files("players", "traditional", root=root)) == 1
+
+    # a rewrite after compaction wins over the compacted copy
+    archive_games(_games([gids[0]], points=9), "players", "traditional", _dates(gids), root)
+    assert _points(root, gids[0]) == [9]
+    assert sorted(read_archive("players", "traditional", root=root)["points"]) == [1, 1, 1, 1, 9]
+
+
+def _archive_worker(args):
+    root, start = args
+    for i in range(start, start + 10):
+        gid = f"00225{i:05d}"
+        archive_games(_games([gid]), "players", "traditional", _dates([gid]), root)
+
+
+def test_concurrent_processes_share_one_index(tmp_path):
+    root = str(tmp_path)
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        pool.map(_archive_worker, [(root, start) for start in range(0, 40, 10)])
+
+    with open(tmp_path / "players_traditional" / INDEX_FILE) as fh:
+        lines = fh.read().splitlines()[1:]
+    assert all(len(line.split("\t")) == 2 for line in lines)
+    assert archived_gameids("players", "traditional", root=root) == {f"00225{i:05d}" for i in range(40)}
@@ -0,0 +1,142 @@
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+from nba_api.stats.library.http import NBAStatsResponse
+
+from utils.nba_fetch import fetch_game
+from utils.payload_cache import CachedEndpoint, PayloadCache, content_hash
+from utils.rate_limit import EMPTY, FetchError
+
+GID = "0022500001"
+
+
+class FakeBoxScore:
+    """Offline stand-in for an nba_api box score class: rows come from the payload."""
+
+    requests = 0
+
+    def __init__(self, game_id, get_request=True, **kwargs):
+        self.game_id = game_id
+        if get_request:
+            type(self).requests += 1
+            body = {"rows": type(self).rows, "meta": {"time": datetime.now().isoformat()}}
+            self.nba_response = NBAStatsResponse(json.dumps(body), 200, None)
+            self.load_response()
+
+    def load_response(self):
+        rows = self.nba_response.get_dict()["rows"]
+        self.frames = [pd.DataFrame({"personId": list(range(rows))}), pd.DataFrame({"teamId": list(range(rows))})]
+
+    def get_data_frames(self):
+        return self.frames
+
+
+def _box(rows):
+    return type("Box", (FakeBoxScore,), {"rows": rows, "requests": 0})
+
+
+def _cache(tmp_path, **kwargs):
+    return PayloadCache(str(tmp_path / "cache"), final_after_days=3, recent_ttl_hours=6, **kwargs)
+
+
+def _fetched_ago(cache, endpoint, gid, delta):
+    """Backdate a ref's fetched_at."""
+    path = cache._ref_path(endpoint, gid)
+    with open(path) as f:
+        ref = json.load(f)
+    ref["fetched_at"] = (datetime.now() - delta).isoformat(timespec="seconds")
+    with open(path, "w") as f:
+        json.dump(ref, f)
+
+
+def _note_date(cache, gid, d):
+    cache.note_game_dates(pd.DataFrame({"GAME_ID": [gid], "GAME_DATE": [d.strftime("%Y-%m-%d")]}))
+
+
+# ============================================================
+# HASH / TTL
+# ============================================================
+
+def test_content_hash_ignores_meta():
+    a = json.dumps({"boxScore": {"x": 1}, "meta": {"time": "1"}})
+    b = json.dumps({"meta": {"time": "2"}, "boxScore": {"x": 1}})
+    assert content_hash(a) == content_hash(b)
+    assert content_hash(a) != content_hash(json.dumps({"boxScore": {"x": 2}}))
+
+
+def test_final_game_payload_never_expires(tmp_path):
+    cache = _cache(tmp_path)
+    _note_date(cache, GID, datetime.now() - timedelta(days=10))
+    cache.put("traditional", GID, '{"a": 1}')
+    _fetched_ago(cache, "traditional", GID, timedelta(days=30))
+
+    assert cache.get("traditional", GID) == '{"a": 1}'
+
+
+def test_recent_game_payload_expires_after_ttl(tmp_path):
+    cache = _cache(tmp_path)
+    _note_date(cache, GID, datetime.now() - timedelta(days=1))
+    cache.put("traditional", GID, '{"a": 1}')
+    assert cache.get("traditional", GID) == '{"a": 1}'
+
+    _fetched_ago(cache, "traditional", GID, timedelta(hours=7))
+    assert cache.get("traditional", GID) is None
+
+
+def test_undated_game_is_never_final(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("traditional", GID, '{"a": 1}')
+    assert cache.get("traditional", GID) == '{"a": 1}'
+
+    _fetched_ago(cache, "traditional", GID, timedelta(days=30))
+    assert cache.get("traditional", GID) is None
+
+
+def test_disabled_cache_still_reports_hashes(tmp_path):
+    cache = _cache(tmp_path, enabled=False)
+    digest = cache.put("traditional", GID, '{"a": 1}')
+
+    assert cache.get("traditional", GID) is None
+    assert cache.read_ref("traditional", GID) == {"hash": digest}
+    assert not (tmp_path / "cache").exists()
+
+
+# ============================================================
+# EMPTY BOX SCORES
+# ============================================================
+
+def test_empty_box_score_is_not_cached(tmp_path):
+    cache = _cache(tmp_path)
+    box = _box(rows=0)
+    endpoint = CachedEndpoint("traditional", box, cache)
+
+    endpoint(game_id=GID)
+    endpoint(game_id=GID)
+
+    assert box.requests == 2
+    assert cache.read_ref("traditional", GID) is None
+
+
+def test_box_score_with_rows_is_served_from_cache(tmp_path):
+    cache = _cache(tmp_path)
+    box = _box(rows=2)
+    endpoint = CachedEndpoint("traditional", box, cache)
+
+    players_df, teams_df = fetch_game(endpoint, GID)
+    again, _ = fetch_game(endpoint, GID)
+
+    assert box.requests == 1
+    assert len(players_df) == len(again) == 2
+
+
+def test_empty_cached_payload_is_rejected(tmp_path):
+    # an empty payload cached before empty box scores were skipped
+    cache = _cache(tmp_path)
+    cache.put("traditional", GID, json.dumps({"rows": 0}))
+    endpoint = CachedEndpoint("traditional", _box(rows=0), cache)
+
+    with pytest.raises(FetchError) as err:
+        fetch_game(endpoint, GID)
+    assert err.value.kind == EMPTY
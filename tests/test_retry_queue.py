@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+from scripts.ingest import _record_fetch_results
+from utils.duckdb_sink import (
+    MANIFEST_TABLE,
+    NBA_RETRY_BASE_MINUTES,
+    NBA_RETRY_MAX_HOURS,
+    RETRY_TABLE,
+    backing_off,
+    clear_retries,
+    due_retries,
+    enqueue_retries,
+)
+from utils.rate_limit import PERMANENT, SERVER
+from utils.sinks import SINK_ERROR, DuckDBSink
+
+EP = "traditional"
+
+
+def _queued(conn, endpoint=EP):
+    """gameId -> (error kind, attempts, backoff)"""
+    rows = conn.execute(
+        f"SELECT gameid, error_kind, attempts, next_attempt_at - last_failed_at FROM raw.{RETRY_TABLE} WHERE endpoint = ?",
+        [endpoint],
+    ).fetchall()
+    return {gid: (kind, attempts, backoff) for gid, kind, attempts, backoff in rows}
+
+
+def _make_due(conn, gid):
+    conn.execute(
+        f"UPDATE raw.{RETRY_TABLE} SET next_attempt_at = now() - INTERVAL 1 MINUTE WHERE gameid = ?", [gid]
+    )
+
+
+# ============================================================
+# BACKOFF
+# ============================================================
+
+def test_backoff_doubles_per_attempt(conn):
+    base = timedelta(minutes=NBA_RETRY_BASE_MINUTES)
+    for attempt in range(1, 4):
+        enqueue_retries(conn, EP, {"g1": (SERVER, "502")})
+        assert _queued(conn)["g1"] == (SERVER, attempt, base * 2 ** (attempt - 1))
+
+
+def test_backoff_is_capped(conn):
+    enqueue_retries(conn, EP, {"g1": (SERVER, "502")})
+    conn.execute(f"UPDATE raw.{RETRY_TABLE} SET attempts = 30")
+    enqueue_retries(conn, EP, {"g1": (SERVER, "502")})
+
+    assert _queued(conn)["g1"][2] == timedelta(hours=NBA_RETRY_MAX_HOURS)
+
+
+def test_permanent_error_waits_the_max(conn):
+    enqueue_retries(conn, EP, {"g1": (PERMANENT, "400")})
+    assert _queued(conn)["g1"] == (PERMANENT, 1, timedelta(hours=NBA_RETRY_MAX_HOURS))
+
+
+# ============================================================
+# DUE / BACKING OFF / CLEARING
+# ============================================================
+
+def test_due_and_backing_off_split_the_queue(conn):
+    enqueue_retries(conn, EP, {"g1": (SERVER, "502"), "g2": (SERVER, "502")})
+    enqueue_retries(conn, "advanced", {"g3": (SERVER, "502")})
+    _make_due(conn, "g1")
+    _make_due(conn, "g3")
+
+    assert due_retries(conn, [EP]) == {EP: ["g1"]}
+    assert due_retries(conn, [EP, "advanced"]) == {EP: ["g1"], "advanced": ["g3"]}
+    assert backing_off(conn, EP) == {"g2"}
+    assert backing_off(conn, EP, ["g1", "g4"]) == set()
+
+
+def test_due_retries_fewest_attempts_first(conn):
+    enqueue_retries(conn, EP, {"g1": (SERVER, "502")})
+    enqueue_retries(conn, EP, {"g1": (SERVER, "502"), "g2": (SERVER, "502")})
+    _make_due(conn, "g1")
+    _make_due(conn, "g2")
+
+    assert due_retries(conn, [EP]) == {EP: ["g2", "g1"]}
+
+
+def test_clear_retries_only_touches_its_endpoint(conn):
+    enqueue_retries(conn, EP, {"g1": (SERVER, "502"), "g2": (SERVER, "502")})
+    enqueue_retries(conn, "advanced", {"g1": (SERVER, "502")})
+
+    clear_retries(conn, EP, ["g1"])
+
+    assert set(_queued(conn)) == {"g2"}
+    assert set(_queued(conn, "advanced")) == {"g1"}
+
+
+def test_queue_helpers_before_first_failure(conn):
+    clear_retries(conn, EP, ["g1"])
+    assert due_retries(conn, [EP]) == {}
+    assert backing_off(conn, EP) == set()
+
+
+# ============================================================
+# FETCH RESULTS
+# ============================================================
+
+def test_fetch_results_queue_fetch_and_sink_failures(conn):
+    enqueue_retries(conn, EP, {"g1": (SERVER, "502")})
+    _record_fetch_results(
+        conn,
+        work={EP: ["g1", "g2", "g3"]},
+        ok={EP: ["g1", "g2"]},
+        failures={EP: {"g3": (SERVER, "502")}},
+        sink_failures={DuckDBSink.name: {EP: ["g2"]}},
+    )
+
+    queued = _queued(conn)
+    assert set(queued) == {"g2", "g3"}
+    assert queued["g2"][0] == SINK_ERROR
+    assert queued["g3"][0] == SERVER
+    failed = conn.execute(f"SELECT gameid FROM raw.{MANIFEST_TABLE} WHERE endpoint = ? ORDER BY gameid", [EP]).fetchall()
+    assert failed == [("g2",), ("g3",)]
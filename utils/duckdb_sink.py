@@ -1,6 +1,9 @@
 # duckdb_sink.py
 import os
-from typing import List, Set, Tuple, Optional
+import json
+import weakref
+from datetime import datetime
+from typing import Dict, List, Set, Tuple, Optional, Union
 
 import duckdb
 import pandas as pd
@@ -27,32 +30,379 @@ def _table_exists(conn: duckdb.DuckDBPyConnection, schema: str, table: str) -> b
     q = """
     SELECT 1
     FROM information_schema.tables
-    WHERE table_schema = ? AND table_name = ?
+    WHERE table_catalog = current_database() AND table_schema = ? AND table_name = ?
     LIMIT 1
     """
     return conn.execute(q, [schema, table]).fetchone() is not None
 
 
-def _get_columns(conn: duckdb.DuckDBPyConnection, schema: str, table: str) -> List[str]:
+# ============================================================
+# SCHEMA REGISTRY (typed raw storage)
+# ============================================================
+
+SCHEMA_REGISTRY = "_schema_registry"
+QUARANTINE_COL = "_quarantine"
+
+# Type lattice for safe widening: BIGINT -> DOUBLE -> VARCHAR, DATE -> VARCHAR
+_WIDENS_TO = {
+    "BIGINT": {"BIGINT", "DOUBLE", "VARCHAR"},
+    "DOUBLE": {"DOUBLE", "VARCHAR"},
+    "DATE": {"DATE", "VARCHAR"},
+    "VARCHAR": {"VARCHAR"},
+}
+
+# A text column is stored typed when at least this share of its non-empty values parse;
+# the rest go to the quarantine column.
+_PARSE_THRESHOLD = 0.99
+
+# Registry type of a column that has only seen NULL / empty values: stored as VARCHAR
+# until its first non-empty batch decides the real type.
+_UNTYPED = "UNTYPED"
+
+# identifiers / codes keep their text form (leading zeros, e.g. gameId '0022500059')
+_TEXT_COLUMNS = {"jerseynum", "startersbench"}
+
+
+def _pinned_text(col: str) -> bool:
+    return col.endswith("id") or col in _TEXT_COLUMNS
+
+
+def _normalize_type(data_type: str) -> str:
+    t = data_type.upper()
+    if t in ("BIGINT", "INTEGER", "SMALLINT", "TINYINT", "HUGEINT"):
+        return "BIGINT"
+    if t in ("DOUBLE", "FLOAT", "REAL") or t.startswith("DECIMAL"):
+        return "DOUBLE"
+    if t == "DATE":
+        return "DATE"
+    return "VARCHAR"
+
+
+def _ensure_registry(conn: duckdb.DuckDBPyConnection, schema: str) -> None:
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {schema}.{SCHEMA_REGISTRY} (
+            table_name TEXT,
+            column_name TEXT,
+            column_type TEXT,
+            change TEXT,
+            updated_at TIMESTAMP
+        );
+        """
+    )
+
+
+def _record_types(conn: duckdb.DuckDBPyConnection, schema: str, table: str, types: Dict[str, str], change: str) -> None:
+    if not types:
+        return
+    _ensure_registry(conn, schema)
+    rows = [(table, c, t, change) for c, t in types.items()]
+    conn.execute(
+        f"DELETE FROM {schema}.{SCHEMA_REGISTRY} WHERE table_name = ? AND column_name IN (SELECT UNNEST(?::VARCHAR[]))",
+        [table, list(types)],
+    )
+    conn.executemany(
+        f"INSERT INTO {schema}.{SCHEMA_REGISTRY} VALUES (?, ?, ?, ?, now())",
+        rows,
+    )
+
+
+def registered_types(conn: duckdb.DuckDBPyConnection, schema: str, table: str) -> Dict[str, str]:
+    """Recorded column types for a raw table (column -> BIGINT/DOUBLE/DATE/VARCHAR)."""
+    try:
+        rows = conn.execute(
+            f"SELECT column_name, column_type FROM {schema}.{SCHEMA_REGISTRY} WHERE table_name = ?",
+            [table],
+        ).fetchall()
+    except duckdb.CatalogException:
+        return {}
+    return dict(rows)
+
+
+def _get_column_types(conn: duckdb.DuckDBPyConnection, schema: str, table: str) -> Dict[str, str]:
     q = """
-    SELECT column_name
+    SELECT column_name, data_type
     FROM information_schema.columns
-    WHERE table_schema = ? AND table_name = ?
+    WHERE table_catalog = current_database() AND table_schema = ? AND table_name = ?
     ORDER BY ordinal_position
     """
-    return [r[0] for r in conn.execute(q, [schema, table]).fetchall()]
+    return {c: _normalize_type(t) for c, t in conn.execute(q, [schema, table]).fetchall()}
 
 
-def _create_table_all_text(conn: duckdb.DuckDBPyConnection, schema: str, table: str, cols: List[str]) -> None:
-    col_ddl = ", ".join([f'"{c}" TEXT' for c in cols])
-    conn.execute(f'CREATE TABLE IF NOT EXISTS {schema}."{table}" ({col_ddl});')
+def _parse_text(values: pd.Series, col_type: str) -> pd.Series:
+    if col_type == "DATE":
+        ok = values.str.fullmatch(r"\d{4}-\d{2}-\d{2}").fillna(False).astype(bool)
+        return pd.to_datetime(values.where(ok), format="%Y-%m-%d", errors="coerce")
+    return pd.to_numeric(values, errors="coerce")
 
 
-def _add_missing_cols_as_text(conn: duckdb.DuckDBPyConnection, schema: str, table: str, incoming_cols: List[str]) -> None:
-    existing = set(_get_columns(conn, schema, table))
-    for c in incoming_cols:
+def _infer_type(col: str, s: pd.Series) -> Optional[str]:
+    """
+    Infer BIGINT / DOUBLE / DATE / VARCHAR for one incoming column;
+    None when it has no values yet (the column stays untyped).
+    """
+    if _pinned_text(col) or pd.api.types.is_bool_dtype(s):
+        return "VARCHAR"
+    if s.isna().all():
+        return None
+    if pd.api.types.is_integer_dtype(s):
+        return "BIGINT"
+    if pd.api.types.is_float_dtype(s):
+        return "DOUBLE"
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return "DATE"
+
+    txt = s.astype("string").str.strip()
+    txt = txt[txt.notna() & (txt != "")]
+    if txt.empty:
+        return None
+    # leading zeros are codes, not numbers
+    if txt.str.fullmatch(r"0\d+").any():
+        return "VARCHAR"
+
+    num = _parse_text(txt, "DOUBLE")
+    if num.notna().mean() >= _PARSE_THRESHOLD:
+        parsed = num.dropna()
+        is_int = (parsed == parsed.round()).all() and not txt.str.contains(r"[.eE]", regex=True).any()
+        return "BIGINT" if is_int else "DOUBLE"
+
+    if _parse_text(txt, "DATE").notna().mean() >= _PARSE_THRESHOLD:
+        return "DATE"
+
+    return "VARCHAR"
+
+
+def _infer_stored_type(conn: duckdb.DuckDBPyConnection, source: str, c: str, params: Optional[list] = None) -> Optional[str]:
+    """
+    _infer_type for a text column already in DuckDB (`source` is a table or table function),
+    computed in SQL; None when the column has no values.
+    """
+    v = f'NULLIF(TRIM(CAST("{c}" AS VARCHAR)), \'\')'
+    present, as_int, as_num, as_date, zero_led = conn.execute(
+        f"""
+        SELECT
+          COUNT({v}),
+          COUNT(CASE WHEN NOT regexp_matches({v}, '[.eE]') THEN TRY_CAST({v} AS BIGINT) END),
+          COUNT(TRY_CAST({v} AS DOUBLE)),
+          COUNT(CASE WHEN regexp_full_match({v}, '\\d{{4}}-\\d{{2}}-\\d{{2}}') THEN TRY_CAST({v} AS DATE) END),
+          COUNT(CASE WHEN regexp_full_match({v}, '0\\d+') THEN 1 END)
+        FROM {source}
+        """,
+        params or [],
+    ).fetchone()
+    if present == 0:
+        return None
+    if zero_led > 0:
+        return "VARCHAR"
+    if as_int >= present * _PARSE_THRESHOLD and as_int == as_num:
+        return "BIGINT"
+    if as_num >= present * _PARSE_THRESHOLD:
+        return "DOUBLE"
+    if as_date >= present * _PARSE_THRESHOLD:
+        return "DATE"
+    return "VARCHAR"
+
+
+def _quarantine_sql(failed: Dict[str, str], source_cols: Optional[Dict[str, str]] = None) -> str:
+    """
+    SQL for the quarantine JSON of one row: {column: raw value} for every text column in
+    `failed` (column -> target type) whose value does not parse; NULL when all parse.
+    source_cols maps a column to its name in the source when they differ.
+    """
+    parts = []
+    for c, t in failed.items():
+        src = (source_cols or {}).get(c, c)
+        v = f'NULLIF(TRIM(CAST("{src}" AS VARCHAR)), \'\')'
+        parts.append(f"CASE WHEN {v} IS NOT NULL AND TRY_CAST({v} AS {t}) IS NULL THEN '\"{c}\":' || to_json({v}) END")
+    if not parts:
+        return "CAST(NULL AS TEXT)"
+    return f"'{{' || NULLIF(CONCAT_WS(',', {', '.join(parts)}), '') || '}}'"
+
+
+# ============================================================
+# PER-CONNECTION TABLE METADATA
+# ============================================================
+
+# conn -> {(schema, table): {"types": {col: type}, "pk": (key cols) | None, "untyped": {cols}}}
+# Schema changes made through this module keep the entry current, so steady-state
+# upserts never query information_schema.
+_TABLE_META: "weakref.WeakKeyDictionary[duckdb.DuckDBPyConnection, Dict[Tuple[str, str], dict]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _forget_table(conn: duckdb.DuckDBPyConnection, schema: str, table: str) -> None:
+    """Drop cached metadata after a table is replaced outside the upsert path."""
+    _TABLE_META.get(conn, {}).pop((schema, table), None)
+
+
+def _primary_key(conn: duckdb.DuckDBPyConnection, schema: str, table: str) -> Optional[Tuple[str, ...]]:
+    row = conn.execute(
+        """
+        SELECT constraint_column_names
+        FROM duckdb_constraints()
+        WHERE database_name = current_database() AND schema_name = ? AND table_name = ? AND constraint_type = 'PRIMARY KEY'
+        LIMIT 1
+        """,
+        [schema, table],
+    ).fetchone()
+    return tuple(row[0]) if row else None
+
+
+def _table_meta(
+    conn: duckdb.DuckDBPyConnection,
+    schema: str,
+    table: str,
+    key_cols: List[str],
+) -> Optional[dict]:
+    """
+    Cached column types + primary key for schema.table (None if the table does not exist).
+    Legacy tables without a primary key get one declared on the key columns on first use;
+    if existing rows violate it (duplicate / NULL keys) the table stays on the slow path.
+    """
+    metas = _TABLE_META.setdefault(conn, {})
+    meta = metas.get((schema, table))
+    if meta is not None:
+        return meta
+    if not _table_exists(conn, schema, table):
+        return None
+
+    pk = _primary_key(conn, schema, table)
+    if pk is None:
+        try:
+            cols = ", ".join([f'"{k}"' for k in key_cols])
+            conn.execute(f'ALTER TABLE {schema}."{table}" ADD PRIMARY KEY ({cols});')
+            pk = tuple(key_cols)
+        except duckdb.Error:
+            pk = None
+
+    untyped = {c for c, t in registered_types(conn, schema, table).items() if t == _UNTYPED}
+    meta = {"types": _get_column_types(conn, schema, table), "pk": pk, "untyped": untyped}
+    metas[(schema, table)] = meta
+    return meta
+
+
+def _reconcile_types(
+    conn: duckdb.DuckDBPyConnection,
+    schema: str,
+    table: str,
+    df: pd.DataFrame,
+    key_cols: List[str],
+) -> Tuple[dict, bool]:
+    """
+    Create / evolve schema.table for the incoming frame and return (table meta, drifted):
+      - new table: columns created with inferred types (+ quarantine column) and a
+        primary key on key_cols
+      - new columns: added with inferred type
+      - columns with no values yet are stored as VARCHAR but registered UNTYPED; their
+        first non-empty batch sets the real type
+      - drift: widen along BIGINT -> DOUBLE -> VARCHAR / DATE -> VARCHAR only when the
+        incoming type is numeric-compatible; text that does not parse is quarantined
+    `drifted` is True when any DDL ran for this call.
+    """
+    inferred = {c: _infer_type(c, df[c]) or _UNTYPED for c in df.columns if c != QUARANTINE_COL}
+    meta = _table_meta(conn, schema, table, key_cols)
+
+    if meta is None:
+        col_ddl = [f'"{c}" {_storage_type(t)}' for c, t in inferred.items()] + [f'"{QUARANTINE_COL}" TEXT']
+        col_ddl.append("PRIMARY KEY (" + ", ".join([f'"{k}"' for k in key_cols]) + ")")
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {schema}."{table}" ({", ".join(col_ddl)});')
+        _record_types(conn, schema, table, inferred, "created")
+        _forget_table(conn, schema, table)
+        return _table_meta(conn, schema, table, key_cols), True
+
+    existing = meta["types"]
+    untyped = meta["untyped"]
+    added: Dict[str, str] = {}
+    widened: Dict[str, str] = {}
+    typed: Dict[str, str] = {}
+
+    for c, t in inferred.items():
         if c not in existing:
-            conn.execute(f'ALTER TABLE {schema}."{table}" ADD COLUMN "{c}" TEXT;')
+            added[c] = t
+        elif t == _UNTYPED:
+            continue
+        elif c in untyped:
+            typed[c] = t
+        elif existing[c] != t and t != "VARCHAR" and t in _WIDENS_TO[existing[c]]:
+            widened[c] = t
+
+    if not added and not widened and not typed and QUARANTINE_COL in existing:
+        return meta, False
+
+    for c, t in added.items():
+        conn.execute(f'ALTER TABLE {schema}."{table}" ADD COLUMN "{c}" {_storage_type(t)};')
+    for c, t in widened.items():
+        conn.execute(f'ALTER TABLE {schema}."{table}" ALTER COLUMN "{c}" TYPE {t};')
+    for c, t in typed.items():
+        if t != "VARCHAR":
+            conn.execute(
+                f'ALTER TABLE {schema}."{table}" ALTER COLUMN "{c}" TYPE {t} '
+                f'USING TRY_CAST(NULLIF(TRIM("{c}"), \'\') AS {t});'
+            )
+    if QUARANTINE_COL not in existing:
+        conn.execute(f'ALTER TABLE {schema}."{table}" ADD COLUMN "{QUARANTINE_COL}" TEXT;')
+
+    if not registered_types(conn, schema, table):
+        _record_types(conn, schema, table, existing, "existing")
+    _record_types(conn, schema, table, added, "added")
+    _record_types(conn, schema, table, widened, "widened")
+    _record_types(conn, schema, table, typed, "typed")
+
+    meta["types"] = _get_column_types(conn, schema, table)
+    meta["untyped"] = (untyped | {c for c, t in added.items() if t == _UNTYPED}) - set(typed)
+    return meta, True
+
+
+def _storage_type(t: str) -> str:
+    return "VARCHAR" if t == _UNTYPED else t
+
+
+def _quarantine_values(df: pd.DataFrame, col_types: Dict[str, str]) -> pd.Series:
+    """
+    Per row, a JSON object of {column: raw value} for values that do not parse as their
+    column's type (they are stored as NULL). Empty strings are treated as NULL, not quarantined.
+    """
+    bad: Dict[str, pd.Series] = {}
+    for c in df.columns:
+        t = col_types.get(c, "VARCHAR")
+        if t == "VARCHAR" or pd.api.types.is_numeric_dtype(df[c]):
+            continue
+        txt = df[c].astype("string").str.strip()
+        present = txt.notna() & (txt != "")
+        failed = present & _parse_text(txt, t).isna()
+        if failed.any():
+            bad[c] = txt.where(failed)
+
+    if not bad:
+        return pd.Series([None] * len(df), index=df.index, dtype="object")
+
+    bad_df = pd.DataFrame(bad)
+    return bad_df.apply(
+        lambda r: json.dumps({k: v for k, v in r.items() if pd.notna(v)}) if r.notna().any() else None,
+        axis=1,
+    )
+
+
+def _typed_expr(df: pd.DataFrame, c: str, t: str) -> str:
+    if t == "VARCHAR":
+        return f'CAST("{c}" AS VARCHAR) AS "{c}"'
+    if pd.api.types.is_numeric_dtype(df[c]):
+        return f'TRY_CAST("{c}" AS {t}) AS "{c}"'
+    return f'TRY_CAST(NULLIF(TRIM(CAST("{c}" AS VARCHAR)), \'\') AS {t}) AS "{c}"'
+
+
+def _typed_select(df: pd.DataFrame, col_types: Dict[str, str]) -> str:
+    return ", ".join([_typed_expr(df, c, col_types.get(c, "VARCHAR")) for c in df.columns])
+
+
+def _upsert_select(df: pd.DataFrame, col_types: Dict[str, str]) -> Tuple[str, str]:
+    """(column list, select list) covering every table column; columns missing from df are NULL."""
+    cols, exprs = [], []
+    for c, t in col_types.items():
+        cols.append(f'"{c}"')
+        exprs.append(_typed_expr(df, c, t) if c in df.columns else f'CAST(NULL AS {t}) AS "{c}"')
+    return ", ".join(cols), ", ".join(exprs)
 
 
 def upsert_delete_insert(
@@ -64,9 +414,12 @@ def upsert_delete_insert(
 ) -> None:
     """
     Schema-drift-tolerant upsert for DuckDB raw tables:
-      - store all raw columns as TEXT
-      - auto-add new columns as they appear
-      - upsert using temp table + DELETE/INSERT by natural keys
+      - store raw columns typed (BIGINT/DOUBLE/DATE/VARCHAR) via the schema registry
+      - auto-add new columns / safely widen drifted ones
+      - values that fail to parse are NULLed and kept as JSON in the quarantine column
+      - fast path (table has a primary key on key_cols, no drift this call):
+        INSERT OR REPLACE straight from the registered frame, cost ~ incoming rows
+      - otherwise temp table + DELETE/INSERT by natural keys
     """
     if df is None or df.empty:
         return
@@ -78,16 +431,33 @@ def upsert_delete_insert(
         if k not in df.columns:
             raise ValueError(f"Missing key column '{k}' for {schema}.{table}. df cols={list(df.columns)}")
 
-    if not _table_exists(conn, schema, table):
-        _create_table_all_text(conn, schema, table, list(df.columns))
-
-    _add_missing_cols_as_text(conn, schema, table, list(df.columns))
+    meta, drifted = _reconcile_types(conn, schema, table, df, key_cols)
+    col_types = dict(meta["types"])
+
+    df = df.drop_duplicates(subset=key_cols, keep="last")
+    quarantine = _quarantine_values(df.drop(columns=[QUARANTINE_COL], errors="ignore"), col_types)
+    if QUARANTINE_COL in df.columns:
+        # rows copied from another raw table keep what was quarantined there
+        quarantine = quarantine.where(quarantine.notna(), df[QUARANTINE_COL])
+    df[QUARANTINE_COL] = quarantine
+    col_types[QUARANTINE_COL] = "VARCHAR"
+
+    if not drifted and meta["pk"] is not None and set(meta["pk"]) == set(key_cols):
+        col_list, select_list = _upsert_select(df, col_types)
+        conn.register("incoming_df", df)
+        try:
+            conn.execute(
+                f'INSERT OR REPLACE INTO {schema}."{table}" ({col_list}) SELECT {select_list} FROM incoming_df;'
+            )
+        finally:
+            conn.unregister("incoming_df")
+        return
 
     tmp = f"__tmp_{table}"
     conn.execute(f'DROP TABLE IF EXISTS {schema}."{tmp}";')
 
     conn.register("incoming_df", df)
-    conn.execute(f'CREATE TABLE {schema}."{tmp}" AS SELECT * FROM incoming_df;')
+    conn.execute(f'CREATE TABLE {schema}."{tmp}" AS SELECT {_typed_select(df, col_types)} FROM incoming_df;')
     conn.unregister("incoming_df")
 
     join_cond = " AND ".join([f't."{k}" = s."{k}"' for k in key_cols])
@@ -102,7 +472,7 @@ def upsert_delete_insert(
             '''
         )
 
-        target_cols = _get_columns(conn, schema, table)
+        target_cols = list(col_types)
         common_cols = [c for c in target_cols if c in df.columns]
         col_list = ", ".join([f'"{c}"' for c in common_cols])
 
@@ -120,6 +490,61 @@ def upsert_delete_insert(
         raise
 
 
+def retype_table(conn: duckdb.DuckDBPyConnection, schema: str, table: str) -> Dict[str, str]:
+    """
+    One-off migration of a legacy all-TEXT raw table to typed storage.
+    Types are inferred from the stored values in SQL (same threshold as incoming data);
+    values that do not parse are moved to the quarantine column. Returns the new types.
+    """
+    existing = _get_column_types(conn, schema, table)
+    text_cols = [c for c, t in existing.items() if t == "VARCHAR" and c != QUARANTINE_COL and not _pinned_text(c)]
+
+    new_types = dict(existing)
+    for c in text_cols:
+        new_types[c] = _infer_stored_type(conn, f'{schema}."{table}"', c) or "VARCHAR"
+
+    changed = {c: t for c, t in new_types.items() if t != existing[c]}
+    if not changed:
+        return new_types
+
+    select_list = []
+    for c, t in existing.items():
+        if c == QUARANTINE_COL:
+            continue
+        if c in changed:
+            select_list.append(f'TRY_CAST(NULLIF(TRIM("{c}"), \'\') AS {changed[c]}) AS "{c}"')
+        else:
+            select_list.append(f'"{c}"')
+
+    quarantine = _quarantine_sql(changed)
+    if QUARANTINE_COL in existing:
+        quarantine_expr = f'COALESCE("{QUARANTINE_COL}", {quarantine})'
+    else:
+        quarantine_expr = quarantine
+
+    tmp = f"__retype_{table}"
+    conn.execute("BEGIN;")
+    try:
+        conn.execute(f'DROP TABLE IF EXISTS {schema}."{tmp}";')
+        conn.execute(
+            f'''
+            CREATE TABLE {schema}."{tmp}" AS
+            SELECT {", ".join(select_list)}, {quarantine_expr} AS "{QUARANTINE_COL}"
+            FROM {schema}."{table}";
+            '''
+        )
+        conn.execute(f'DROP TABLE {schema}."{table}";')
+        conn.execute(f'ALTER TABLE {schema}."{tmp}" RENAME TO "{table}";')
+        conn.execute("COMMIT;")
+    except Exception:
+        conn.execute("ROLLBACK;")
+        raise
+
+    _forget_table(conn, schema, table)
+    _record_types(conn, schema, table, new_types, "retyped")
+    return new_types
+
+
 def table_info(endpoint: str, is_team: bool) -> Tuple[str, str, List[str]]:
     """
     DuckDB naming convention:
@@ -140,27 +565,311 @@ def table_info(endpoint: str, is_team: bool) -> Tuple[str, str, List[str]]:
     return schema, table, key_cols
 
 
-def existing_gameids(conn: duckdb.DuckDBPyConnection, endpoint: str) -> Set[str]:
+# ============================================================
+# INGEST MANIFEST (one row per endpoint x gameId)
+# ============================================================
+
+MANIFEST_TABLE = "ingest_manifest"
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+
+
+def _ensure_manifest(conn: duckdb.DuckDBPyConnection, endpoint: str) -> None:
     """
-    Consider game stored if BOTH teams_<ep> and players_<ep> have it.
+    Create raw.ingest_manifest if needed. The first time an endpoint is seen, seed it
+    from the games already stored in both teams_<ep> and players_<ep> (one-off scan;
+    seeded rows have attempts = 0 since their fetch history is unknown).
     """
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {DUCKDB_SCHEMA}.{MANIFEST_TABLE} (
+            endpoint TEXT,
+            gameid TEXT,
+            status TEXT,
+            team_rows BIGINT,
+            player_rows BIGINT,
+            payload_hash TEXT,
+            fetched_at TIMESTAMP,
+            attempts BIGINT,
+            PRIMARY KEY (endpoint, gameid)
+        );
+        """
+    )
+    seeded = conn.execute(
+        f"SELECT 1 FROM {DUCKDB_SCHEMA}.{MANIFEST_TABLE} WHERE endpoint = ? LIMIT 1", [endpoint]
+    ).fetchone()
+    if seeded:
+        return
+
     ts, tt, _ = table_info(endpoint, is_team=True)
     ps, pt, _ = table_info(endpoint, is_team=False)
+    if not (_table_exists(conn, ts, tt) and _table_exists(conn, ps, pt)):
+        return
+
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO {DUCKDB_SCHEMA}.{MANIFEST_TABLE}
+        SELECT ?, t.gameid, '{STATUS_OK}', t.n, p.n, NULL, NULL, 0
+        FROM (SELECT gameid, COUNT(*) AS n FROM {ts}."{tt}" GROUP BY gameid) t
+        JOIN (SELECT gameid, COUNT(*) AS n FROM {ps}."{pt}" GROUP BY gameid) p USING (gameid)
+        """,
+        [endpoint],
+    )
+
+
+def existing_gameids(conn: duckdb.DuckDBPyConnection, endpoint: str, gameids: Optional[List[str]] = None) -> Set[str]:
+    """
+    Games stored for an endpoint (manifest status 'ok', i.e. both teams_<ep> and
+    players_<ep> have it). Pass `gameids` (e.g. the current season's games) to
+    restrict the lookup to those keys instead of reading the whole manifest.
+    """
+    _ensure_manifest(conn, endpoint)
+    sql = f"SELECT gameid FROM {DUCKDB_SCHEMA}.{MANIFEST_TABLE} WHERE endpoint = ? AND status = '{STATUS_OK}'"
+    params: list = [endpoint]
+    if gameids is not None:
+        if not gameids:
+            return set()
+        sql += " AND gameid IN (SELECT UNNEST(?::VARCHAR[]))"
+        params.append([str(g) for g in gameids])
+    return {r[0] for r in conn.execute(sql, params).fetchall()}
+
+
+def _gid_counts(df: pd.DataFrame) -> Dict[str, int]:
+    if df is None or df.empty:
+        return {}
+    gid_col = next(c for c in df.columns if c.lower() == "gameid")
+    return df[gid_col].astype(str).value_counts().to_dict()
 
-    team_games: Set[str] = set()
-    player_games: Set[str] = set()
 
+def record_ingested(
+    conn: duckdb.DuckDBPyConnection,
+    endpoint: str,
+    teams_df: pd.DataFrame,
+    players_df: pd.DataFrame,
+    payload_hashes: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Mark the games in a stored batch as 'ok' with their row counts / payload hashes
+    (and drop them from the retry queue).
+    """
+    team_rows = _gid_counts(teams_df)
+    player_rows = _gid_counts(players_df)
+    gids = sorted(set(team_rows) | set(player_rows))
+    if not gids:
+        return
+
+    payload_hashes = payload_hashes or {}
+    _ensure_manifest(conn, endpoint)
+    conn.executemany(
+        f"""
+        INSERT INTO {DUCKDB_SCHEMA}.{MANIFEST_TABLE} VALUES (?, ?, '{STATUS_OK}', ?, ?, ?, now(), 1)
+        ON CONFLICT (endpoint, gameid) DO UPDATE SET
+            status = excluded.status,
+            team_rows = excluded.team_rows,
+            player_rows = excluded.player_rows,
+            payload_hash = excluded.payload_hash,
+            fetched_at = excluded.fetched_at,
+            attempts = {MANIFEST_TABLE}.attempts + 1
+        """,
+        [(endpoint, g, team_rows.get(g, 0), player_rows.get(g, 0), payload_hashes.get(g)) for g in gids],
+    )
+    clear_retries(conn, endpoint, gids)
+
+
+def record_failed(conn: duckdb.DuckDBPyConnection, endpoint: str, gameids: List[str]) -> None:
+    """Count a failed fetch; games already stored keep status 'ok'."""
+    if not gameids:
+        return
+    _ensure_manifest(conn, endpoint)
+    conn.executemany(
+        f"""
+        INSERT INTO {DUCKDB_SCHEMA}.{MANIFEST_TABLE} VALUES (?, ?, '{STATUS_FAILED}', NULL, NULL, NULL, now(), 1)
+        ON CONFLICT (endpoint, gameid) DO UPDATE SET
+            attempts = {MANIFEST_TABLE}.attempts + 1
+        """,
+        [(endpoint, str(g)) for g in gameids],
+    )
+
+
+def manifest_hashes(conn: duckdb.DuckDBPyConnection, endpoint: str, gameids: List[str]) -> Dict[str, Optional[str]]:
+    """gameId -> payload hash the stored rows came from (None when unknown, e.g. seeded rows)."""
+    if not gameids:
+        return {}
+    _ensure_manifest(conn, endpoint)
+    rows = conn.execute(
+        f"""
+        SELECT gameid, payload_hash FROM {DUCKDB_SCHEMA}.{MANIFEST_TABLE}
+        WHERE endpoint = ? AND status = '{STATUS_OK}' AND gameid IN (SELECT UNNEST(?::VARCHAR[]))
+        """,
+        [endpoint, [str(g) for g in gameids]],
+    ).fetchall()
+    return dict(rows)
+
+
+def manifest_changes(
+    conn: duckdb.DuckDBPyConnection,
+    endpoint: Optional[str],
+    since: Optional[datetime],
+) -> Tuple[List[str], Optional[datetime]]:
+    """
+    Stored games fetched after `since` (all stored games when since is None) for one
+    endpoint, or for any endpoint when endpoint is None.
+    Returns (gameids, newest fetched_at among them) - the next watermark.
+    """
     try:
-        team_games = {r[0] for r in conn.execute(f'SELECT DISTINCT gameid FROM {ts}."{tt}"').fetchall()}
-    except Exception:
-        pass
+        rows = conn.execute(
+            f"""
+            SELECT gameid, MAX(fetched_at)
+            FROM {DUCKDB_SCHEMA}.{MANIFEST_TABLE}
+            WHERE status = '{STATUS_OK}'
+              AND (CAST(? AS TEXT) IS NULL OR endpoint = ?)
+              AND (CAST(? AS TIMESTAMP) IS NULL OR fetched_at > ?)
+            GROUP BY gameid
+            """,
+            [endpoint, endpoint, since, since],
+        ).fetchall()
+    except duckdb.CatalogException:
+        return [], None
+    newest = max((ts for _, ts in rows if ts is not None), default=None)
+    return sorted(gid for gid, _ in rows), newest
+
+
+def merge_manifest(conn: duckdb.DuckDBPyConnection, src_catalog: str) -> int:
+    """Copy manifest rows from an attached database (e.g. a backfill staging shard)."""
+    src = f"{src_catalog}.{DUCKDB_SCHEMA}.{MANIFEST_TABLE}"
+    try:
+        endpoints = [r[0] for r in conn.execute(f"SELECT DISTINCT endpoint FROM {src}").fetchall()]
+    except duckdb.CatalogException:
+        return 0
+    for endpoint in endpoints:
+        _ensure_manifest(conn, endpoint)
+    conn.execute(f"INSERT OR REPLACE INTO {DUCKDB_SCHEMA}.{MANIFEST_TABLE} SELECT * FROM {src}")
+    return conn.execute(f"SELECT COUNT(*) FROM {src}").fetchone()[0]
+
 
+def reset_manifest(conn: duckdb.DuckDBPyConnection, endpoint: str) -> None:
+    """Forget an endpoint's manifest rows (re-seeded from the tables on next use)."""
     try:
-        player_games = {r[0] for r in conn.execute(f'SELECT DISTINCT gameid FROM {ps}."{pt}"').fetchall()}
-    except Exception:
+        conn.execute(f"DELETE FROM {DUCKDB_SCHEMA}.{MANIFEST_TABLE} WHERE endpoint = ?", [endpoint])
+    except duckdb.CatalogException:
         pass
 
-    return team_games & player_games
+
+# ============================================================
+# RETRY QUEUE (failed endpoint x gameId fetches, backoff across runs)
+# ============================================================
+
+RETRY_TABLE = "fetch_retry_queue"
+
+# next_attempt_at = failure time + min(max, base * 2^(attempts-1)); permanent errors wait the max
+NBA_RETRY_BASE_MINUTES = int(os.getenv("NBA_RETRY_BASE_MINUTES", "30"))
+NBA_RETRY_MAX_HOURS = int(os.getenv("NBA_RETRY_MAX_HOURS", "168"))
+RETRY_MAX_BACKOFF_KINDS = ("permanent",)
+
+
+def _ensure_retry_queue(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {DUCKDB_SCHEMA}.{RETRY_TABLE} (
+            endpoint TEXT,
+            gameid TEXT,
+            error_kind TEXT,
+            last_error TEXT,
+            attempts BIGINT,
+            first_failed_at TIMESTAMP,
+            last_failed_at TIMESTAMP,
+            next_attempt_at TIMESTAMP,
+            PRIMARY KEY (endpoint, gameid)
+        );
+        """
+    )
+
+
+def enqueue_retries(conn: duckdb.DuckDBPyConnection, endpoint: str, failures: Dict[str, Tuple[str, str]]) -> None:
+    """Queue (or re-queue with a longer backoff) failed fetches: {gameId: (error kind, message)}."""
+    if not failures:
+        return
+    _ensure_retry_queue(conn)
+    base_s = NBA_RETRY_BASE_MINUTES * 60
+    max_s = NBA_RETRY_MAX_HOURS * 3600
+    backoff = f"""
+        to_seconds(CASE WHEN error_kind IN (SELECT UNNEST(?::VARCHAR[])) THEN {max_s}
+                        ELSE LEAST({max_s}, {base_s} * POW(2, attempts - 1))::BIGINT END)
+    """
+    conn.executemany(
+        f"""
+        INSERT INTO {DUCKDB_SCHEMA}.{RETRY_TABLE} VALUES (?, ?, ?, ?, 1, now(), now(), NULL)
+        ON CONFLICT (endpoint, gameid) DO UPDATE SET
+            error_kind = excluded.error_kind,
+            last_error = excluded.last_error,
+            attempts = {RETRY_TABLE}.attempts + 1,
+            last_failed_at = excluded.last_failed_at
+        """,
+        [(endpoint, str(g), kind, str(msg)[:500]) for g, (kind, msg) in failures.items()],
+    )
+    conn.execute(
+        f"""
+        UPDATE {DUCKDB_SCHEMA}.{RETRY_TABLE}
+        SET next_attempt_at = last_failed_at + {backoff}
+        WHERE endpoint = ? AND gameid IN (SELECT UNNEST(?::VARCHAR[]))
+        """,
+        [list(RETRY_MAX_BACKOFF_KINDS), endpoint, [str(g) for g in failures]],
+    )
+
+
+def clear_retries(conn: duckdb.DuckDBPyConnection, endpoint: str, gameids: List[str]) -> None:
+    if not gameids or not _table_exists(conn, DUCKDB_SCHEMA, RETRY_TABLE):
+        return
+    conn.execute(
+        f"DELETE FROM {DUCKDB_SCHEMA}.{RETRY_TABLE} WHERE endpoint = ? AND gameid IN (SELECT UNNEST(?::VARCHAR[]))",
+        [endpoint, [str(g) for g in gameids]],
+    )
+
+
+def due_retries(conn: duckdb.DuckDBPyConnection, endpoints: List[str]) -> Dict[str, List[str]]:
+    """
+    endpoint -> queued gameIds whose next attempt is due, in priority order
+    (fewest attempts first, then longest overdue).
+    """
+    if not _table_exists(conn, DUCKDB_SCHEMA, RETRY_TABLE):
+        return {}
+    rows = conn.execute(
+        f"""
+        SELECT endpoint, gameid FROM {DUCKDB_SCHEMA}.{RETRY_TABLE}
+        WHERE next_attempt_at <= now() AND endpoint IN (SELECT UNNEST(?::VARCHAR[]))
+        ORDER BY attempts, next_attempt_at, gameid
+        """,
+        [list(endpoints)],
+    ).fetchall()
+    due: Dict[str, List[str]] = {}
+    for endpoint, gid in rows:
+        due.setdefault(endpoint, []).append(gid)
+    return due
+
+
+def backing_off(conn: duckdb.DuckDBPyConnection, endpoint: str, gameids: Optional[List[str]] = None) -> Set[str]:
+    """Queued gameIds of an endpoint that are not due yet (kept out of regular fetch work)."""
+    if not _table_exists(conn, DUCKDB_SCHEMA, RETRY_TABLE):
+        return set()
+    sql = f"SELECT gameid FROM {DUCKDB_SCHEMA}.{RETRY_TABLE} WHERE endpoint = ? AND next_attempt_at > now()"
+    params: list = [endpoint]
+    if gameids is not None:
+        sql += " AND gameid IN (SELECT UNNEST(?::VARCHAR[]))"
+        params.append([str(g) for g in gameids])
+    return {r[0] for r in conn.execute(sql, params).fetchall()}
+
+
+def merge_retry_queue(conn: duckdb.DuckDBPyConnection, src_catalog: str) -> int:
+    """Copy retry queue rows from an attached database (e.g. a backfill staging shard)."""
+    src = f"{src_catalog}.{DUCKDB_SCHEMA}.{RETRY_TABLE}"
+    try:
+        n = conn.execute(f"SELECT COUNT(*) FROM {src}").fetchone()[0]
+    except duckdb.CatalogException:
+        return 0
+    _ensure_retry_queue(conn)
+    conn.execute(f"INSERT OR REPLACE INTO {DUCKDB_SCHEMA}.{RETRY_TABLE} SELECT * FROM {src}")
+    return n
 
 
 def upsert_log(conn: duckdb.DuckDBPyConnection, log_df: pd.DataFrame) -> None:
@@ -175,6 +884,33 @@ def upsert_log(conn: duckdb.DuckDBPyConnection, log_df: pd.DataFrame) -> None:
     df.columns = [c.strip().lower() for c in df.columns]
     upsert_delete_insert(conn, df, schema=DUCKDB_SCHEMA, table="log_table", key_cols=["game_id", "team_id"])
 
+def missing_log_rows(conn: duckdb.DuckDBPyConnection, log_df: pd.DataFrame) -> pd.DataFrame:
+    """Rows of a LeagueGameFinder log whose (game_id, team_id) is not in raw.log_table yet."""
+    if log_df is None or log_df.empty or not _table_exists(conn, DUCKDB_SCHEMA, "log_table"):
+        return log_df
+    stored = conn.execute(
+        f"""
+        SELECT DISTINCT CAST(game_id AS VARCHAR), CAST(team_id AS VARCHAR)
+        FROM {DUCKDB_SCHEMA}.log_table
+        WHERE game_id IN (SELECT UNNEST(?::VARCHAR[]))
+        """,
+        [sorted(set(log_df["GAME_ID"].astype(str)))],
+    ).fetchall()
+    stored_keys = {(g, t) for g, t in stored}
+    keys = zip(log_df["GAME_ID"].astype(str), log_df["TEAM_ID"].astype(str))
+    return log_df[[k not in stored_keys for k in keys]]
+
+def delete_gameid_rows(
+    conn: duckdb.DuckDBPyConnection, schema: str, table: str, gameids: List[str], where: str = "TRUE", params=None
+) -> None:
+    """DELETE rows of the given games from schema.table that also match `where`."""
+    if not gameids or not _table_exists(conn, schema, table):
+        return
+    conn.execute(
+        f'DELETE FROM {schema}."{table}" WHERE gameid IN (SELECT UNNEST(?::VARCHAR[])) AND ({where})',
+        [[str(g) for g in gameids]] + list(params or []),
+    )
+
 def df_for_gameids(conn: duckdb.DuckDBPyConnection, schema: str, table: str, gameids: List[str]) -> pd.DataFrame:
     if not gameids:
         return pd.DataFrame()
@@ -187,4 +923,92 @@ def df_for_gameids(conn: duckdb.DuckDBPyConnection, schema: str, table: str, gam
     FROM {schema}."{table}" t
     JOIN gids g ON t.gameid = g.gameid
     """
-    return conn.execute(sql).df()
\ No newline at end of file
+    return conn.execute(sql).df()
+
+def log_game_dates(conn: duckdb.DuckDBPyConnection, gameids: List[str]) -> Dict[str, str]:
+    """
+    gameId -> 'YYYY-MM-DD' from raw.log_table (all seasons ever ingested).
+    """
+    if not gameids:
+        return {}
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT DISTINCT game_id, CAST(TRY_CAST(game_date AS DATE) AS VARCHAR)
+            FROM {DUCKDB_SCHEMA}.log_table
+            WHERE game_id IN (SELECT UNNEST(?::VARCHAR[]))
+            """,
+            [[str(g) for g in gameids]],
+        ).fetchall()
+    except Exception:
+        return {}
+    return {str(gid).zfill(10): d for gid, d in rows if d}
+
+
+def recent_gameids(conn: duckdb.DuckDBPyConnection, days: int) -> Dict[str, str]:
+    """gameId -> 'YYYY-MM-DD' for games in raw.log_table played in the last `days` days."""
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT DISTINCT game_id, CAST(TRY_CAST(game_date AS DATE) AS VARCHAR)
+            FROM {DUCKDB_SCHEMA}.log_table
+            WHERE TRY_CAST(game_date AS DATE) >= current_date - CAST(? AS INTEGER)
+            """,
+            [days],
+        ).fetchall()
+    except Exception:
+        return {}
+    return {str(gid).zfill(10): d for gid, d in rows}
+
+
+def replace_table_from_parquet(
+    conn: duckdb.DuckDBPyConnection, schema: str, table: str, parquet_files: Union[str, List[str]]
+) -> int:
+    """
+    Rebuild schema.table straight from parquet files (a glob or a file list) with read_parquet,
+    following the raw conventions (lowercase column names, identifiers as text). Column
+    types come from the schema registry, so they match what upserts stored; unregistered
+    text columns are inferred like incoming data. Text that does not parse as its column's
+    type goes to the quarantine column again. Returns row count.
+    """
+    src = "read_parquet(?, union_by_name=true, hive_partitioning=false)"
+    described = conn.execute(f"DESCRIBE SELECT * FROM {src}", [parquet_files]).fetchall()
+    registered = registered_types(conn, schema, table)
+
+    types: Dict[str, str] = {}
+    parsed: Dict[str, str] = {}
+    source_cols: Dict[str, str] = {}
+    select_list = []
+    kept_quarantine = None
+    for r in described:
+        c, lc = r[0], str(r[0]).strip().lower()
+        if lc == QUARANTINE_COL:
+            kept_quarantine = f'"{c}"'
+            continue
+        source_type = _normalize_type(r[1])
+        t = "VARCHAR" if _pinned_text(lc) else registered.get(lc, _UNTYPED)
+        if t == _UNTYPED:
+            if source_type == "VARCHAR":
+                t = _infer_stored_type(conn, src, c, [parquet_files]) or _UNTYPED
+            else:
+                t = source_type
+        types[lc] = t
+        if source_type == "VARCHAR" and _storage_type(t) != "VARCHAR":
+            parsed[lc] = t
+            source_cols[lc] = c
+            select_list.append(f'TRY_CAST(NULLIF(TRIM("{c}"), \'\') AS {t}) AS "{lc}"')
+        else:
+            select_list.append(f'TRY_CAST("{c}" AS {_storage_type(t)}) AS "{lc}"')
+    quarantine = _quarantine_sql(parsed, source_cols)
+    if kept_quarantine:
+        quarantine = f"COALESCE({kept_quarantine}, {quarantine})"
+    select_list.append(f'{quarantine} AS "{QUARANTINE_COL}"')
+
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS {schema};")
+    conn.execute(
+        f'CREATE OR REPLACE TABLE {schema}."{table}" AS SELECT {", ".join(select_list)} FROM {src};',
+        [parquet_files],
+    )
+    _forget_table(conn, schema, table)
+    _record_types(conn, schema, table, types, "rebuilt")
+    return conn.execute(f'SELECT COUNT(*) FROM {schema}."{table}"').fetchone()[0]
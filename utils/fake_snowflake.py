@@ -0,0 +1,145 @@
+# fake_snowflake.py
+import os
+import re
+import glob
+import shutil
+import uuid
+import threading
+
+import duckdb
+
+
+class FakeSnowflakeConnection:
+    """
+    DuckDB-backed stand-in for a snowflake.connector connection, for running the
+    Snowflake loaders locally. The database is attached as NBA (so NBA.RAW.* and
+    NBA.STAGE.* resolve) and internal stages are directories under `stage_dir`.
+
+    Supported beyond plain SQL: CREATE STAGE, PUT file://... @stage, COPY INTO <table>
+    FROM @stage/... (parquet, by column name, optional PURGE), REMOVE @stage/... and
+    execute_async / get_results_from_sfqid (run synchronously).
+    """
+
+    def __init__(self, db_path: str = ":memory:", stage_dir: str = None):
+        self.db_path = db_path
+        base = os.getcwd() if db_path == ":memory:" else os.path.dirname(os.path.abspath(db_path))
+        self.stage_dir = stage_dir or os.path.join(base, "fake_stages")
+        self._db = duckdb.connect()
+        self._db.execute(f"ATTACH '{db_path}' AS nba;")
+        self._db.execute("USE nba;")
+        self._db.execute("CREATE SCHEMA IF NOT EXISTS raw;")
+        self._db.execute("CREATE SCHEMA IF NOT EXISTS stage;")
+        self._lock = threading.Lock()
+        self._async_results = {}
+
+    def cursor(self) -> "FakeSnowflakeCursor":
+        with self._lock:
+            return FakeSnowflakeCursor(self, self._db.cursor())
+
+    def commit(self) -> None:
+        pass
+
+    # async queries run to completion on submit
+    def get_query_status_throw_if_error(self, sfqid: str) -> str:
+        if sfqid not in self._async_results:
+            raise ValueError(f"unknown query id {sfqid}")
+        return "SUCCESS"
+
+    def is_still_running(self, status: str) -> bool:
+        return False
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _stage_path(self, ref: str) -> str:
+        """'@NBA.STAGE.REPLICATION/run/x.parquet' -> <stage_dir>/nba.stage.replication/run/x.parquet"""
+        ref = ref.strip().strip("'").lstrip("@")
+        name, _, rest = ref.partition("/")
+        return os.path.join(self.stage_dir, name.lower(), rest)
+
+
+_PUT = re.compile(r"^\s*PUT\s+'?file://(\S+?)'?\s+(@\S+)", re.IGNORECASE)
+_CREATE_STAGE = re.compile(r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?STAGE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\S+)", re.IGNORECASE)
+_COPY = re.compile(r"^\s*COPY\s+INTO\s+(\S+)\s+FROM\s+(@\S+)(.*)$", re.IGNORECASE | re.DOTALL)
+_REMOVE = re.compile(r"^\s*(?:REMOVE|RM)\s+(@\S+)", re.IGNORECASE)
+
+
+class FakeSnowflakeCursor:
+    def __init__(self, conn: FakeSnowflakeConnection, con: duckdb.DuckDBPyConnection):
+        self._conn = conn
+        self._con = con
+        self._con.execute("USE nba;")
+        self._rows = []
+        self.sfqid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._con.close()
+
+    def execute(self, sql: str, params=None):
+        m = _PUT.match(sql)
+        if m:
+            src, dest = m.group(1), self._conn._stage_path(m.group(2))
+            os.makedirs(dest, exist_ok=True)
+            shutil.copy(src, os.path.join(dest, os.path.basename(src)))
+            self._rows = [(os.path.basename(src), "UPLOADED")]
+            return self
+
+        m = _CREATE_STAGE.match(sql)
+        if m:
+            os.makedirs(self._conn._stage_path(m.group(1)), exist_ok=True)
+            self._rows = [("Stage area successfully created.",)]
+            return self
+
+        m = _COPY.match(sql)
+        if m:
+            table, src, opts = m.group(1), self._conn._stage_path(m.group(2)), m.group(3)
+            files = glob.glob(os.path.join(src, "*.parquet")) if os.path.isdir(src) else glob.glob(src)
+            if files:
+                self._con.execute(f"INSERT INTO {table} BY NAME SELECT * FROM read_parquet(?)", [files])
+            if re.search(r"PURGE\s*=\s*TRUE", opts, re.IGNORECASE):
+                for f in files:
+                    os.remove(f)
+            self._rows = [(f, "LOADED") for f in files]
+            return self
+
+        m = _REMOVE.match(sql)
+        if m:
+            path = self._conn._stage_path(m.group(1))
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+            self._rows = []
+            return self
+
+        if params is not None:
+            sql = sql.replace("%s", "?")
+        self._con.execute(sql, params)
+        try:
+            self._rows = self._con.fetchall()
+        except duckdb.InvalidInputException:
+            self._rows = []
+        return self
+
+    def execute_async(self, sql: str, params=None) -> dict:
+        self.execute(sql, params)
+        self.sfqid = uuid.uuid4().hex
+        self._conn._async_results[self.sfqid] = self._rows
+        self._rows = []
+        return {"queryId": self.sfqid}
+
+    def get_results_from_sfqid(self, sfqid: str) -> None:
+        self._rows = list(self._conn._async_results.pop(sfqid))
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
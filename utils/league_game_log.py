@@ -0,0 +1,142 @@
+# league_game_log.py
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import nba_api.stats.endpoints as ep
+
+from utils import logger
+from utils.rate_limit import call_with_retry
+
+
+# Bulk fast path for the traditional endpoint: league-wide LeagueGameLog pulls (one
+# player + one team request per season type and date range) mapped onto the
+# BoxScoreTraditionalV3 frames, instead of one box score request per game.
+
+# gameId digit 3 -> LeagueGameLog season_type_all_star (cup finals / play-in have no bulk feed)
+BULK_SEASON_TYPES = {"2": "Regular Season", "4": "Playoffs"}
+
+# LeagueGameLog has no starters/bench split: team rows carry this marker in startersBench
+# (raw.teams_traditional_totals sums to the same totals) until a box score replaces them.
+BULK_STARTERS_BENCH = "Totals"
+
+_STAT_COLS = {
+    "FGM": "fieldGoalsMade",
+    "FGA": "fieldGoalsAttempted",
+    "FG_PCT": "fieldGoalsPercentage",
+    "FG3M": "threePointersMade",
+    "FG3A": "threePointersAttempted",
+    "FG3_PCT": "threePointersPercentage",
+    "FTM": "freeThrowsMade",
+    "FTA": "freeThrowsAttempted",
+    "FT_PCT": "freeThrowsPercentage",
+    "OREB": "reboundsOffensive",
+    "DREB": "reboundsDefensive",
+    "REB": "reboundsTotal",
+    "AST": "assists",
+    "STL": "steals",
+    "BLK": "blocks",
+    "TOV": "turnovers",
+    "PF": "foulsPersonal",
+    "PTS": "points",
+}
+
+
+def _minutes(value) -> Optional[str]:
+    """LeagueGameLog MIN (whole minutes) -> box score 'MM:SS'."""
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, str) and ":" in value:
+        return value
+    return f"{int(round(float(value)))}:00"
+
+
+def _map_common(df: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame(
+        {
+            "gameId": df["GAME_ID"].astype(str).str.zfill(10),
+            "teamId": df["TEAM_ID"],
+            "teamTricode": df["TEAM_ABBREVIATION"],
+            "minutes": df["MIN"].map(_minutes),
+        }
+    )
+    for src, dest in _STAT_COLS.items():
+        out[dest] = df[src]
+    return out
+
+
+def map_players(df: pd.DataFrame) -> pd.DataFrame:
+    """LeagueGameLog (P) rows -> raw.players_traditional columns (names split on the first space)."""
+    if df is None or df.empty:
+        return pd.DataFrame()
+    out = _map_common(df)
+    names = df["PLAYER_NAME"].fillna("").str.split(" ", n=1, expand=True).reindex(columns=[0, 1])
+    out.insert(2, "personId", df["PLAYER_ID"])
+    out.insert(3, "firstName", names[0])
+    out.insert(4, "familyName", names[1])
+    out["plusMinusPoints"] = df["PLUS_MINUS"]
+    return out.reset_index(drop=True)
+
+
+def map_teams(df: pd.DataFrame) -> pd.DataFrame:
+    """LeagueGameLog (T) rows -> raw.teams_traditional columns (one BULK_STARTERS_BENCH row per team)."""
+    if df is None or df.empty:
+        return pd.DataFrame()
+    out = _map_common(df)
+    out["startersBench"] = BULK_STARTERS_BENCH
+    return out.reset_index(drop=True)
+
+
+def _league_log(kind: str, season: str, season_type: str, date_from: str, date_to: str) -> pd.DataFrame:
+    return call_with_retry(
+        lambda: ep.leaguegamelog.LeagueGameLog(
+            player_or_team_abbreviation=kind,
+            season=season,
+            season_type_all_star=season_type,
+            date_from_nullable=date_from,
+            date_to_nullable=date_to,
+        ).get_data_frames()[0],
+        label=f"LeagueGameLog {kind} {season} {season_type} {date_from}-{date_to}",
+    )
+
+
+def fetch_bulk_traditional(
+    season: str,
+    gids: Iterable[str],
+    game_dates: Dict[str, str],
+) -> Tuple[pd.DataFrame, pd.DataFrame, List[str]]:
+    """
+    Pull league-wide player + team game logs covering the dates of `gids` and map them
+    to the traditional box score frames. Only games present in both logs are returned.
+    Returns (players_df, teams_df, ok_gids); gids the bulk feed lacks are left to the caller.
+    Raises FetchError if a request fails.
+    """
+    by_type: Dict[str, List[str]] = {}
+    for gid in gids:
+        gid = str(gid).zfill(10)
+        if gid[2] in BULK_SEASON_TYPES and gid in game_dates:
+            by_type.setdefault(BULK_SEASON_TYPES[gid[2]], []).append(gid)
+
+    players, teams = [], []
+    for season_type, type_gids in by_type.items():
+        dates = sorted(game_dates[g] for g in type_gids)
+        date_from = pd.Timestamp(dates[0]).strftime("%m/%d/%Y")
+        date_to = pd.Timestamp(dates[-1]).strftime("%m/%d/%Y")
+        wanted = set(type_gids)
+
+        p = map_players(_league_log("P", season, season_type, date_from, date_to))
+        t = map_teams(_league_log("T", season, season_type, date_from, date_to))
+        if p.empty or t.empty:
+            continue
+        players.append(p[p["gameId"].isin(wanted)])
+        teams.append(t[t["gameId"].isin(wanted)])
+
+    if not players:
+        return pd.DataFrame(), pd.DataFrame(), []
+
+    players_df = pd.concat(players, ignore_index=True)
+    teams_df = pd.concat(teams, ignore_index=True)
+    ok = sorted(set(players_df["gameId"]) & set(teams_df["gameId"]))
+    players_df = players_df[players_df["gameId"].isin(ok)].reset_index(drop=True)
+    teams_df = teams_df[teams_df["gameId"].isin(ok)].reset_index(drop=True)
+    logger.info(f"Bulk traditional {season}: {len(ok)} games from {2 * len(by_type)} league log requests")
+    return players_df, teams_df, ok
@@ -0,0 +1,374 @@
+# nba_fetch.py
+import os
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+import nba_api.stats.endpoints as ep
+
+from utils import logger
+from utils.rate_limit import EMPTY, FetchError, call_with_retry
+from utils.payload_cache import PAYLOAD_CACHE, CachedEndpoint
+
+
+# Shared stats.nba.com fetch code for every loader (scripts.ingest, scripts.update_snowflake):
+# endpoints, season / log helpers and the one fetch pool that feeds the sinks (utils.sinks).
+
+# ============================================================
+# CONFIG
+# ============================================================
+
+ENDPOINTS = ["advanced", "fourfactors", "misc", "scoring", "traditional"]
+# Box score endpoints sit behind the on-disk payload cache (utils.payload_cache)
+FD = {
+    "advanced": CachedEndpoint("advanced", ep.boxscoreadvancedv3.BoxScoreAdvancedV3),
+    "fourfactors": CachedEndpoint("fourfactors", ep.boxscorefourfactorsv3.BoxScoreFourFactorsV3),
+    "misc": CachedEndpoint("misc", ep.boxscoremiscv3.BoxScoreMiscV3),
+    "scoring": CachedEndpoint("scoring", ep.boxscorescoringv3.BoxScoreScoringV3),
+    "traditional": CachedEndpoint("traditional", ep.boxscoretraditionalv3.BoxScoreTraditionalV3),
+}
+
+NBA_FETCH_WORKERS = int(os.getenv("NBA_FETCH_WORKERS", "8"))
+
+# Streaming mode (--stream): flush an endpoint's buffer to the sinks every N games / M rows,
+# and flush the largest buffer whenever all buffers together exceed the memory ceiling.
+NBA_FLUSH_GAMES = int(os.getenv("NBA_FLUSH_GAMES", "200"))
+NBA_FLUSH_ROWS = int(os.getenv("NBA_FLUSH_ROWS", "50000"))
+NBA_MAX_BUFFER_MB = int(os.getenv("NBA_MAX_BUFFER_MB", "512"))
+
+# Default (pipelined) mode: hand every N fetched games of an endpoint to the sinks, so
+# writes overlap the remaining fetches instead of waiting for the endpoint to finish.
+NBA_PIPELINE_GAMES = int(os.getenv("NBA_PIPELINE_GAMES", "50"))
+
+# Incremental log fetch: ask LeagueGameFinder only for dates from the last cached game
+# date minus this overlap (late / corrected games); NBA_LOG_INCREMENTAL=0 always pulls the season.
+NBA_LOG_OVERLAP_DAYS = int(os.getenv("NBA_LOG_OVERLAP_DAYS", "3"))
+NBA_LOG_INCREMENTAL = os.getenv("NBA_LOG_INCREMENTAL", "1") != "0"
+
+LOG_DIR = os.getenv("NBA_LOG_DIR", os.path.join(os.getcwd(), "data", "raw", "log"))
+
+# ============================================================
+# SEASON / GAME HELPERS
+# ============================================================
+
+def get_nba_season(date=None) -> str:
+    """Season string for a date, e.g. '2025-26'; August onwards belongs to the next season."""
+    date = date or datetime.today()
+    year = date.year
+    start = year - 1 if date.month <= 7 else year
+    end = start + 1
+    return f"{start}-{str(end)[-2:]}"
+
+
+def game_dates_from_log(log_df: pd.DataFrame) -> Dict[str, str]:
+    """gameId -> 'YYYY-MM-DD' from a LeagueGameFinder log (archive partitioning)."""
+    if log_df is None or log_df.empty:
+        return {}
+    dates = pd.to_datetime(log_df["GAME_DATE"], errors="coerce").dt.strftime("%Y-%m-%d")
+    return {str(g).zfill(10): d for g, d in zip(log_df["GAME_ID"], dates) if isinstance(d, str)}
+
+
+def payload_hashes(endpoint: str, gids: List[str]) -> Dict[str, str]:
+    """gameId -> content hash of the payload the stored rows came from (manifest)."""
+    refs = {gid: PAYLOAD_CACHE.read_ref(endpoint, gid) for gid in gids}
+    return {gid: ref["hash"] for gid, ref in refs.items() if ref}
+
+
+# ============================================================
+# LOG (LeagueGameFinder, cached per season as CSV)
+# ============================================================
+
+# season type -> SEASON_ID / GAME_ID prefix digit in LeagueGameFinder logs
+SEASON_TYPES = {"regular": "2", "playoffs": "4", "cup": "6"}
+
+
+def filter_season_types(all_games: pd.DataFrame, season: str, season_types: List[str]) -> pd.DataFrame:
+    parts = []
+    for st in season_types:
+        d = SEASON_TYPES[st]
+        parts.append(all_games[(all_games.SEASON_ID == d + season[:4]) & (all_games.GAME_ID.str.startswith("00" + d))])
+    return pd.concat(parts, ignore_index=True)
+
+
+LOG_KEY_COLS = ["GAME_ID", "TEAM_ID"]
+
+
+def _log_file(season: str) -> str:
+    return os.path.join(LOG_DIR, f"log{season}.csv")
+
+
+def _read_cached_log(log_file: str) -> Optional[pd.DataFrame]:
+    if not os.path.exists(log_file):
+        return None
+    return pd.read_csv(log_file, dtype={"GAME_ID": str, "SEASON_ID": str})
+
+
+def _changed_log_rows(delta: pd.DataFrame, cached: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Rows of delta that are new or differ from the cached log (compared as text)."""
+    if cached is None or cached.empty or delta.empty:
+        return delta
+    cols = list(delta.columns)
+    old = cached.reindex(columns=cols).astype(str).set_index(LOG_KEY_COLS)
+    new = delta.astype(str).set_index(LOG_KEY_COLS)
+    old = old[~old.index.duplicated(keep="last")].reindex(new.index)
+    differs = (new != old).any(axis=1).to_numpy()
+    return delta[differs]
+
+
+def fetch_log_delta(
+    season: str,
+    incremental: bool = NBA_LOG_INCREMENTAL,
+    overlap_days: int = NBA_LOG_OVERLAP_DAYS,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Bring the cached season log CSV up to date and return (full_log, changed_rows).
+    Incremental: only dates from (last cached GAME_DATE - overlap_days) are requested and
+    merged into the cache by (GAME_ID, TEAM_ID); without a cache the whole season is pulled.
+    The cached CSV always holds every season type. On API failure the cache is returned as-is.
+    """
+    log_file = _log_file(season)
+    cached = _read_cached_log(log_file)
+
+    date_from = None
+    if incremental and cached is not None and not cached.empty:
+        last = pd.to_datetime(cached["GAME_DATE"], errors="coerce").max()
+        if pd.notna(last):
+            date_from = last - pd.Timedelta(days=overlap_days)
+
+    try:
+        if date_from is not None:
+            result = ep.leaguegamefinder.LeagueGameFinder(
+                season_nullable=season, date_from_nullable=date_from.strftime("%m/%d/%Y")
+            )
+        else:
+            result = ep.leaguegamefinder.LeagueGameFinder(season_nullable=season)
+        delta = filter_season_types(result.get_data_frames()[0], season, list(SEASON_TYPES))
+    except Exception as e:
+        logger.error(f"Failed live fetch; loading cached log {season}: {e}")
+        if cached is None:
+            raise
+        return cached, cached.iloc[0:0]
+
+    changed = _changed_log_rows(delta, cached if date_from is not None else None)
+    if date_from is not None:
+        delta_keys = pd.MultiIndex.from_frame(delta[LOG_KEY_COLS].astype(str))
+        kept = ~pd.MultiIndex.from_frame(cached[LOG_KEY_COLS].astype(str)).isin(delta_keys)
+        full_df = pd.concat([cached[kept], delta], ignore_index=True)
+    else:
+        full_df = delta
+
+    if date_from is None or not changed.empty:
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        full_df.to_csv(log_file, index=False)
+    mode = f"from {date_from:%Y-%m-%d}" if date_from is not None else "full season"
+    logger.info(f"Log {season} ({mode}): {len(delta)} team-rows fetched, {len(changed)} new/changed")
+    return full_df, changed
+
+
+def fetch_log(
+    season: Optional[str] = None,
+    season_types: Optional[List[str]] = None,
+    incremental: bool = NBA_LOG_INCREMENTAL,
+) -> Tuple[pd.DataFrame, Set[str]]:
+    """
+    Refresh the local cached season log CSV and return (log_df, distinct_game_ids).
+    season defaults to the current season; season_types to every key of SEASON_TYPES.
+    """
+    season = season or get_nba_season()
+    season_types = season_types or list(SEASON_TYPES)
+    full_df, _ = fetch_log_delta(season, incremental=incremental)
+    log_df = filter_season_types(full_df, season, season_types)
+    game_ids = {str(g).zfill(10) for g in log_df["GAME_ID"]}
+    return log_df, game_ids
+
+
+# ============================================================
+# BOX SCORE FETCH (RATE LIMITED) + SHARED FETCH POOL
+# ============================================================
+
+def fetch_game(func, gid: str, refresh: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Fetch one game through the payload cache and the shared rate limiter (utils.rate_limit).
+    Cache hits skip the network; refresh=True bypasses the cache.
+    Throttling / 5xx / timeouts are retried with backoff; raises FetchError (with its
+    error class) once retries are exhausted or the game has no rows yet.
+    Returns (players_df, teams_df).
+    """
+    game = None
+    if not refresh:
+        cached = func.from_cache(gid)
+        if cached is not None:
+            game = cached.get_data_frames()
+    if game is None:
+        game = call_with_retry(lambda: func(game_id=gid, refresh=True).get_data_frames(), label=gid)
+    players_df, teams_df = game[0], game[1]
+    if players_df is None or teams_df is None or players_df.empty or teams_df.empty:
+        raise FetchError(EMPTY, f"{gid}: empty box score")
+    return players_df, teams_df
+
+
+class FlushPolicy:
+    """
+    When to hand buffered frames to the upsert callback.
+    All limits None -> one batch per endpoint (FlushPolicy()).
+    """
+
+    def __init__(self, max_games: Optional[int] = None, max_rows: Optional[int] = None, max_buffer_bytes: Optional[int] = None):
+        self.max_games = max_games
+        self.max_rows = max_rows
+        self.max_buffer_bytes = max_buffer_bytes
+
+    @classmethod
+    def streaming(cls) -> "FlushPolicy":
+        return cls(
+            max_games=NBA_FLUSH_GAMES,
+            max_rows=NBA_FLUSH_ROWS,
+            max_buffer_bytes=NBA_MAX_BUFFER_MB * 1024 * 1024,
+        )
+
+    @classmethod
+    def pipelined(cls) -> "FlushPolicy":
+        """Small batches for the sink writers; their bounded queues (utils.sinks) cap memory."""
+        return cls(max_games=NBA_PIPELINE_GAMES)
+
+
+class _EndpointBuffer:
+    """Fetched frames for one endpoint, waiting to be flushed."""
+
+    def __init__(self):
+        self.players: List[pd.DataFrame] = []
+        self.teams: List[pd.DataFrame] = []
+        self.gids: List[str] = []
+        self.rows = 0
+        self.nbytes = 0
+
+    def add(self, gid: str, players_df: pd.DataFrame, teams_df: pd.DataFrame) -> None:
+        self.players.append(players_df)
+        self.teams.append(teams_df)
+        self.gids.append(gid)
+        self.rows += len(players_df) + len(teams_df)
+        self.nbytes += int(players_df.memory_usage(deep=True).sum() + teams_df.memory_usage(deep=True).sum())
+
+    def full(self, policy: FlushPolicy) -> bool:
+        if policy.max_games is not None and len(self.gids) >= policy.max_games:
+            return True
+        return policy.max_rows is not None and self.rows >= policy.max_rows
+
+    def drain(self) -> Tuple[pd.DataFrame, pd.DataFrame, List[str]]:
+        players_df = pd.concat(self.players, ignore_index=True) if self.players else pd.DataFrame()
+        teams_df = pd.concat(self.teams, ignore_index=True) if self.teams else pd.DataFrame()
+        gids = self.gids
+        self.__init__()
+        return players_df, teams_df, gids
+
+
+def fetch_games_all_endpoints(
+    work: Dict[str, List[str]],
+    max_workers: int,
+    on_batch: Callable[[str, pd.DataFrame, pd.DataFrame, List[str]], None],
+    refresh: bool = False,
+    policy: Optional[FlushPolicy] = None,
+    failures: Optional[Dict[str, Dict[str, Tuple[str, str]]]] = None,
+) -> Dict[str, List[str]]:
+    """
+    Fetch every (endpoint, gameid) pair of a run through ONE shared thread pool.
+
+    All pairs go into a single work queue (endpoint-major order), so the pool stays
+    saturated for the whole run instead of draining once per endpoint. Only a small
+    window of pairs is in flight at a time, so finished results are not retained.
+
+    on_batch(endpoint, players_df, teams_df, ok_gids) is called from the calling thread
+    (safe for the DuckDB connection) with the successfully fetched games:
+      - when the last game of an endpoint completes (remaining buffered games)
+      - whenever the endpoint's buffer reaches policy.max_games / policy.max_rows
+        (pipelined and streaming modes), or it is the largest buffer once all buffers
+        exceed policy.max_buffer_bytes
+    A blocking on_batch (e.g. a full utils.sinks queue) stops new submissions, so slow
+    writers throttle fetching instead of letting results pile up.
+
+    refresh=True bypasses the payload cache (rescrapes).
+    Pass `failures` to collect {endpoint: {gid: (error kind, message)}} for failed fetches.
+
+    Returns: {endpoint: ok_gids}
+    """
+    policy = policy or FlushPolicy()
+    work = {endpoint: list(gids) for endpoint, gids in work.items() if gids}
+
+    buffers: Dict[str, _EndpointBuffer] = {endpoint: _EndpointBuffer() for endpoint in work}
+    ok: Dict[str, List[str]] = {endpoint: [] for endpoint in work}
+    remaining: Dict[str, int] = {endpoint: len(gids) for endpoint, gids in work.items()}
+    pairs = iter([(endpoint, gid) for endpoint, gids in work.items() for gid in gids])
+
+    def _fetch(endpoint: str, gid: str):
+        try:
+            p, t = fetch_game(FD[endpoint], gid, refresh=refresh)
+        except FetchError as e:
+            logger.error(f"Fetch failed for {endpoint} {gid} ({e.kind}): {e}")
+            if failures is not None:
+                failures.setdefault(endpoint, {})[gid] = (e.kind, str(e))
+            p, t = None, None
+        return endpoint, gid, p, t
+
+    def _flush(endpoint: str) -> None:
+        players_df, teams_df, gids = buffers[endpoint].drain()
+        if not gids:
+            return
+        try:
+            on_batch(endpoint, players_df, teams_df, gids)
+        except Exception as e:
+            logger.error(f"{endpoint}: batch handler failed: {e}")
+
+    def _over_memory() -> bool:
+        if policy.max_buffer_bytes is None:
+            return False
+        return sum(b.nbytes for b in buffers.values()) >= policy.max_buffer_bytes
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        in_flight = set()
+
+        def _submit_next() -> None:
+            nxt = next(pairs, None)
+            if nxt is not None:
+                in_flight.add(ex.submit(_fetch, *nxt))
+
+        for _ in range(max_workers * 2):
+            _submit_next()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                in_flight.discard(fut)
+                endpoint, gid, p, t = fut.result()
+                remaining[endpoint] -= 1
+
+                if not (p is None or t is None or p.empty or t.empty):
+                    buffers[endpoint].add(gid, p, t)
+                    ok[endpoint].append(gid)
+
+                if remaining[endpoint] == 0 or buffers[endpoint].full(policy):
+                    _flush(endpoint)
+                elif _over_memory():
+                    _flush(max(buffers, key=lambda e: buffers[e].nbytes))
+
+                _submit_next()
+
+    for endpoint, gids in ok.items():
+        if not gids:
+            logger.warning(f"{endpoint}: no games fetched successfully")
+
+    return ok
+
+
+def fetch_games_for_endpoint(endpoint: str, gids: List[str], max_workers: int) -> Tuple[pd.DataFrame, pd.DataFrame, List[str]]:
+    """
+    Fetch many gameids in parallel for one endpoint.
+    Returns: (players_df, teams_df, ok_gids)
+    """
+    result: Dict[str, Tuple[pd.DataFrame, pd.DataFrame, List[str]]] = {}
+
+    def _collect(ep_name: str, players_df: pd.DataFrame, teams_df: pd.DataFrame, ok_gids: List[str]) -> None:
+        result[ep_name] = (players_df, teams_df, ok_gids)
+
+    fetch_games_all_endpoints({endpoint: gids}, max_workers=max_workers, on_batch=_collect)
+    return result.get(endpoint, (pd.DataFrame(), pd.DataFrame(), []))
@@ -0,0 +1,377 @@
+# parquet_archive.py
+import os
+import glob
+import time
+import fcntl
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import duckdb
+import pandas as pd
+
+from utils import logger
+
+
+ARCHIVE_ROOT = os.getenv("NBA_ARCHIVE_DIR", os.path.join(os.getcwd(), "data", "archive"))
+UNKNOWN_DATE = "unknown"
+
+# Log-structured store: every write appends a per-game segment file plus one line to
+# <table>/_index.log (gameId -> file holding its latest rows; last line wins).
+# Compaction folds a season's segments into one compacted file and rewrites the index.
+INDEX_FILE = "_index.log"
+LOCK_FILE = "_index.lock"
+COMPACTED_PREFIX = "compacted-"
+
+# Seasons with at least this many live segments are compacted
+NBA_COMPACT_SEGMENTS = int(os.getenv("NBA_COMPACT_SEGMENTS", "100"))
+
+# gameIds carry a two-digit season year: 46-99 are 1946-47 .. 1999-00, the rest 2000s
+CENTURY_PIVOT = 46
+
+
+def season_from_gameid(gid: str) -> str:
+    """'0022500059' -> '2025-26', '0029800001' -> '1998-99' (digits 4-5 are the season start year)."""
+    yy = int(str(gid).zfill(10)[3:5])
+    start = (1900 if yy >= CENTURY_PIVOT else 2000) + yy
+    return f"{start}-{str(start + 1)[-2:]}"
+
+
+def _table_dir(kind: str, endpoint: str, root: str) -> str:
+    return os.path.join(root, f"{kind}_{endpoint.lower()}")
+
+
+def game_path(
+    kind: str,
+    endpoint: str,
+    gid: str,
+    game_date: Optional[str],
+    root: str = ARCHIVE_ROOT,
+    version: Optional[int] = None,
+) -> str:
+    """
+    Segment layout (hive style, one zstd parquet file per game write):
+      <root>/<kind>_<endpoint>/season=<season>/gameDate=<YYYY-MM-DD>/<gameId>-<version>.parquet
+    Legacy segments have no version suffix.
+    """
+    name = f"{gid}-{version}.parquet" if version is not None else f"{gid}.parquet"
+    return os.path.join(
+        _table_dir(kind, endpoint, root),
+        f"season={season_from_gameid(gid)}",
+        f"gameDate={game_date or UNKNOWN_DATE}",
+        name,
+    )
+
+
+def _compacted_path(table_dir: str, season: str) -> str:
+    return os.path.join(table_dir, f"season={season}", f"{COMPACTED_PREFIX}{time.time_ns()}.parquet")
+
+
+def _is_compacted(rel_path: str) -> bool:
+    return os.path.basename(rel_path).startswith(COMPACTED_PREFIX)
+
+
+def _write_parquet_atomic(con: duckdb.DuckDBPyConnection, df: pd.DataFrame, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    con.register("archive_df", df)
+    try:
+        con.execute(f"COPY archive_df TO '{tmp}' (FORMAT parquet, COMPRESSION zstd);")
+    finally:
+        con.unregister("archive_df")
+    os.replace(tmp, path)
+
+
+# ============================================================
+# INDEX (gameId -> latest file)
+# ============================================================
+
+# table dir -> [header line, bytes read, {gid: relative path}]; appended lines are read incrementally
+_INDEX_CACHE: Dict[str, list] = {}
+_INDEX_CACHE_LOCK = threading.Lock()
+
+
+@contextmanager
+def _locked(table_dir: str, exclusive: bool):
+    """
+    flock on <table>/_index.lock: writers/compaction exclusive, readers shared. flock
+    serializes other processes too, so backfill workers can share a table's index.
+    A missing index is bootstrapped first, under the exclusive lock.
+    """
+    os.makedirs(table_dir, exist_ok=True)
+    index_path = os.path.join(table_dir, INDEX_FILE)
+    with open(os.path.join(table_dir, LOCK_FILE), "a") as fh:
+        if not os.path.exists(index_path):
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            if not os.path.exists(index_path):
+                _bootstrap_index(table_dir)
+        fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _bootstrap_index(table_dir: str) -> None:
+    """
+    Index an archive written before the index existed (legacy one-file-per-game layout);
+    call with the exclusive table lock held.
+    """
+    files = glob.glob(os.path.join(table_dir, "season=*", "gameDate=*", "*.parquet"))
+    lines = []
+    for path in sorted(files, key=os.path.getmtime):
+        gid = os.path.basename(path).split(".")[0].split("-")[0]
+        lines.append(f"{gid}\t{os.path.relpath(path, table_dir)}\n")
+    _rewrite_index(table_dir, lines)
+
+
+def _read_index(table_dir: str) -> Dict[str, str]:
+    """Current {gid: relative path}; call with the table lock held (shared or exclusive)."""
+    index_path = os.path.join(table_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return {}
+
+    with _INDEX_CACHE_LOCK, open(index_path, "rb") as fh:
+        header = fh.readline()
+        cached = _INDEX_CACHE.get(table_dir)
+        if cached is None or cached[0] != header:
+            cached = [header, len(header), {}]
+            _INDEX_CACHE[table_dir] = cached
+        fh.seek(cached[1])
+        for line in fh:
+            if not line.endswith(b"\n"):
+                break
+            gid, _, rel = line.decode("utf-8").rstrip("\n").partition("\t")
+            cached[2][gid] = rel
+            cached[1] += len(line)
+        return dict(cached[2])
+
+
+def _append_index(table_dir: str, entries: Iterable[Tuple[str, str]]) -> None:
+    lines = "".join(f"{gid}\t{rel}\n" for gid, rel in entries)
+    if lines:
+        with open(os.path.join(table_dir, INDEX_FILE), "a") as fh:
+            fh.write(lines)
+
+
+def _rewrite_index(table_dir: str, lines: Iterable[str]) -> None:
+    """Replace the index; the header line names the generation so cached readers reload."""
+    tmp = os.path.join(table_dir, f"{INDEX_FILE}.tmp{os.getpid()}.{threading.get_ident()}")
+    with open(tmp, "w") as fh:
+        fh.write(f"#{time.time_ns()}\n")
+        fh.writelines(lines)
+    os.replace(tmp, os.path.join(table_dir, INDEX_FILE))
+
+
+def _season_entries(index: Dict[str, str], season: Optional[str]) -> Dict[str, str]:
+    if season is None:
+        return index
+    prefix = f"season={season}{os.sep}"
+    return {gid: rel for gid, rel in index.items() if rel.startswith(prefix)}
+
+
+# ============================================================
+# WRITE
+# ============================================================
+
+def archive_games(
+    df: pd.DataFrame,
+    kind: str,
+    endpoint: str,
+    game_dates: Dict[str, str],
+    root: str = ARCHIVE_ROOT,
+) -> int:
+    """
+    Write one segment per gameId in df (kind = 'teams' | 'players') and point the index
+    at it. Cost is O(rows written): nothing already archived is read or rewritten, and a
+    superseded segment is simply dropped. Returns number of game files written.
+    """
+    if df is None or df.empty:
+        return 0
+
+    table_dir = _table_dir(kind, endpoint, root)
+    gid_col = next(c for c in df.columns if c.lower() == "gameid")
+    version = time.time_ns()
+    con = duckdb.connect()
+    try:
+        written = []
+        for gid, game_df in df.groupby(df[gid_col].astype(str).str.zfill(10), sort=False):
+            path = game_path(kind, endpoint, gid, game_dates.get(gid), root, version)
+            _write_parquet_atomic(con, game_df.reset_index(drop=True), path)
+            written.append((gid, os.path.relpath(path, table_dir)))
+    finally:
+        con.close()
+
+    with _locked(table_dir, exclusive=True):
+        previous = _read_index(table_dir)
+        _append_index(table_dir, written)
+        for gid, rel in written:
+            old = previous.get(gid)
+            # compacted files hold other games too; their stale rows go at the next compaction
+            if old and old != rel and not _is_compacted(old):
+                try:
+                    os.remove(os.path.join(table_dir, old))
+                except FileNotFoundError:
+                    pass
+    return len(written)
+
+
+# ============================================================
+# READ (through the index)
+# ============================================================
+
+def archived_gameids(kind: str, endpoint: str, season: Optional[str] = None, root: str = ARCHIVE_ROOT) -> set:
+    """gameIds with archived rows (optionally one season), straight from the index."""
+    table_dir = _table_dir(kind, endpoint, root)
+    with _locked(table_dir, exclusive=False):
+        return set(_season_entries(_read_index(table_dir), season))
+
+
+def archive_files(kind: str, endpoint: str, season: Optional[str] = None, root: str = ARCHIVE_ROOT) -> List[str]:
+    """Files currently referenced by the index (segments and compacted season files)."""
+    table_dir = _table_dir(kind, endpoint, root)
+    if not os.path.isdir(table_dir):
+        return []
+    with _locked(table_dir, exclusive=False):
+        entries = _season_entries(_read_index(table_dir), season)
+    return sorted({os.path.join(table_dir, rel) for rel in entries.values()})
+
+
+def _read_entries(con: duckdb.DuckDBPyConnection, table_dir: str, entries: Dict[str, str]) -> pd.DataFrame:
+    """Rows of every (gid, file) entry; rows a compacted file holds for superseded games are skipped."""
+    if not entries:
+        return pd.DataFrame()
+    files = sorted({os.path.join(table_dir, rel) for rel in entries.values()})
+    src = "read_parquet(?, union_by_name=true, hive_partitioning=false, filename=true)"
+    gid_col = next(
+        r[0] for r in con.execute(f"DESCRIBE SELECT * FROM {src}", [files]).fetchall() if r[0].lower() == "gameid"
+    )
+    con.register(
+        "archive_live",
+        pd.DataFrame({"gid": list(entries), "file": [os.path.join(table_dir, rel) for rel in entries.values()]}),
+    )
+    try:
+        return con.execute(
+            f"""
+            SELECT a.* EXCLUDE (filename)
+            FROM {src} a
+            SEMI JOIN archive_live l
+              ON lpad(CAST(a."{gid_col}" AS VARCHAR), 10, '0') = l.gid AND a.filename = l.file
+            """,
+            [files],
+        ).df()
+    finally:
+        con.unregister("archive_live")
+
+
+def read_archive(
+    kind: str,
+    endpoint: str,
+    season: Optional[str] = None,
+    root: str = ARCHIVE_ROOT,
+    gameids: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Load the latest archived rows for one table (optionally one season / some games)."""
+    table_dir = _table_dir(kind, endpoint, root)
+    if not os.path.isdir(table_dir):
+        return pd.DataFrame()
+
+    con = duckdb.connect()
+    try:
+        with _locked(table_dir, exclusive=False):
+            entries = _season_entries(_read_index(table_dir), season)
+            if gameids is not None:
+                wanted = {str(g).zfill(10) for g in gameids}
+                entries = {gid: rel for gid, rel in entries.items() if gid in wanted}
+            return _read_entries(con, table_dir, entries)
+    finally:
+        con.close()
+
+
+# ============================================================
+# COMPACTION
+# ============================================================
+
+def compact_season(kind: str, endpoint: str, season: str, root: str = ARCHIVE_ROOT, min_segments: int = 1) -> int:
+    """
+    Fold a season's live segments (and its previous compacted file) into one compacted
+    file. The merge runs without the lock; the index swap only repoints games whose entry
+    did not change meanwhile, so concurrent writers are never lost. Returns games compacted.
+    """
+    table_dir = _table_dir(kind, endpoint, root)
+    if not os.path.isdir(table_dir):
+        return 0
+
+    with _locked(table_dir, exclusive=False):
+        snapshot = _season_entries(_read_index(table_dir), season)
+    if sum(1 for rel in snapshot.values() if not _is_compacted(rel)) < max(1, min_segments):
+        return 0
+
+    path = _compacted_path(table_dir, season)
+    con = duckdb.connect()
+    try:
+        _write_parquet_atomic(con, _read_entries(con, table_dir, snapshot), path)
+    finally:
+        con.close()
+    rel_new = os.path.relpath(path, table_dir)
+
+    with _locked(table_dir, exclusive=True):
+        index = _read_index(table_dir)
+        moved = {gid for gid, rel in snapshot.items() if index.get(gid) == rel}
+        for gid in moved:
+            index[gid] = rel_new
+        _rewrite_index(table_dir, (f"{gid}\t{rel}\n" for gid, rel in index.items()))
+
+        live = set(index.values())
+        for rel in set(snapshot.values()) - live:
+            try:
+                os.remove(os.path.join(table_dir, rel))
+                os.rmdir(os.path.dirname(os.path.join(table_dir, rel)))
+            except OSError:
+                pass  # already gone / gameDate dir still holds other segments
+        if not moved:
+            os.remove(path)
+    return len(moved)
+
+
+def compact_archive(
+    kinds: Iterable[str],
+    endpoints: Iterable[str],
+    root: str = ARCHIVE_ROOT,
+    min_segments: int = NBA_COMPACT_SEGMENTS,
+) -> int:
+    """Compact every season of the given tables that has at least min_segments live segments."""
+    total = 0
+    for kind in kinds:
+        for endpoint in endpoints:
+            table_dir = _table_dir(kind, endpoint, root)
+            if not os.path.isdir(table_dir):
+                continue
+            seasons = sorted({d.split("=", 1)[1] for d in os.listdir(table_dir) if d.startswith("season=")})
+            for season in seasons:
+                try:
+                    n = compact_season(kind, endpoint, season, root, min_segments)
+                except Exception as e:
+                    logger.error(f"Compaction failed for {kind}_{endpoint} {season}: {e}")
+                    continue
+                if n:
+                    logger.info(f"Compacted {kind}_{endpoint} {season}: {n} games")
+                    total += n
+    return total
+
+
+def compact_in_background(
+    kinds: Iterable[str],
+    endpoints: Iterable[str],
+    root: str = ARCHIVE_ROOT,
+    min_segments: int = NBA_COMPACT_SEGMENTS,
+) -> threading.Thread:
+    """Run compact_archive on a daemon thread; join it before exiting."""
+    thread = threading.Thread(
+        target=compact_archive,
+        args=(list(kinds), list(endpoints), root, min_segments),
+        name="archive-compaction",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,201 @@
+# payload_cache.py
+import os
+import gzip
+import json
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+from nba_api.stats.library.http import NBAStatsResponse
+
+
+# Bump to invalidate every cached payload (e.g. after an nba_api response format change)
+FETCH_VERSION = 1
+
+
+def content_hash(payload: str) -> str:
+    """
+    sha256 of a payload without its "meta" block (request url / server time change on
+    every call), so re-fetching an unchanged box score yields the same hash.
+    """
+    try:
+        body = json.loads(payload)
+    except ValueError:
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    if isinstance(body, dict):
+        body.pop("meta", None)
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PayloadCache:
+    """
+    Content-addressed, gzip-compressed cache of raw nba_api box score payloads.
+
+    Layout under `root`:
+      objects/<h[:2]>/<h>.json.gz                  raw response body, h = content_hash(body)
+      refs/<endpoint>/v<FETCH_VERSION>/<gameId>.json   {"hash", "fetched_at", "game_date"}
+
+    TTL rules (by game age at read time):
+      - games older than `final_after_days` are final: cached payloads never expire
+        (games without a known date are never final)
+      - recent games expire `recent_ttl_hours` after they were fetched
+    """
+
+    def __init__(self, root: str, final_after_days: int = 3, recent_ttl_hours: float = 6.0, enabled: bool = True):
+        self.root = root
+        self.final_after_days = final_after_days
+        self.recent_ttl_hours = recent_ttl_hours
+        self.enabled = enabled
+        self._game_dates: Dict[str, datetime] = {}
+        # disabled cache: hashes of this process's fetches, so change detection still works
+        self._hashes: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "PayloadCache":
+        return cls(
+            root=os.getenv("NBA_CACHE_DIR", os.path.join(os.getcwd(), "data", "cache", "payloads")),
+            final_after_days=int(os.getenv("NBA_CACHE_FINAL_DAYS", "3")),
+            recent_ttl_hours=float(os.getenv("NBA_CACHE_RECENT_TTL_HOURS", "6")),
+            enabled=os.getenv("NBA_CACHE", "1") != "0",
+        )
+
+    # ---------- game dates (for TTL) ----------
+
+    def note_game_dates(self, log_df: pd.DataFrame) -> None:
+        """Remember GAME_ID -> GAME_DATE from a LeagueGameFinder log."""
+        if log_df is None or log_df.empty:
+            return
+        dates = pd.to_datetime(log_df["GAME_DATE"], errors="coerce")
+        with self._lock:
+            for gid, d in zip(log_df["GAME_ID"], dates):
+                if pd.notna(d):
+                    self._game_dates[str(gid).zfill(10)] = d.to_pydatetime()
+
+    def game_date(self, gid: str) -> Optional[datetime]:
+        return self._game_dates.get(str(gid).zfill(10))
+
+    # ---------- paths ----------
+
+    def _ref_path(self, endpoint: str, gid: str) -> str:
+        return os.path.join(self.root, "refs", endpoint, f"v{FETCH_VERSION}", f"{gid}.json")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.json.gz")
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    # ---------- read / write ----------
+
+    def _is_fresh(self, ref: dict, now: datetime) -> bool:
+        fetched_at = datetime.fromisoformat(ref["fetched_at"])
+        # no known game date: never final, the recent-game TTL applies
+        if ref.get("game_date") and now - datetime.fromisoformat(ref["game_date"]) >= timedelta(days=self.final_after_days):
+            return True
+        return now - fetched_at < timedelta(hours=self.recent_ttl_hours)
+
+    def read_ref(self, endpoint: str, gid: str) -> Optional[dict]:
+        if not self.enabled:
+            digest = self._hashes.get((endpoint, gid))
+            return {"hash": digest} if digest else None
+        path = self._ref_path(endpoint, gid)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, endpoint: str, gid: str) -> Optional[str]:
+        """Return the cached raw payload, or None on miss / expiry."""
+        if not self.enabled:
+            return None
+        ref = self.read_ref(endpoint, gid)
+        if ref is None:
+            return None
+        # a newer game date from the log beats what was recorded at fetch time
+        if self.game_date(gid) is not None:
+            ref["game_date"] = self.game_date(gid).isoformat()
+        if not self._is_fresh(ref, datetime.now()):
+            return None
+        try:
+            with gzip.open(self._object_path(ref["hash"]), "rt", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, endpoint: str, gid: str, payload: str) -> str:
+        """Store a raw payload; returns its content hash."""
+        digest = content_hash(payload)
+        if not self.enabled:
+            with self._lock:
+                self._hashes[(endpoint, gid)] = digest
+            return digest
+
+        obj_path = self._object_path(digest)
+        if not os.path.exists(obj_path):
+            self._atomic_write(obj_path, gzip.compress(payload.encode("utf-8")))
+
+        game_date = self.game_date(gid)
+        ref = {
+            "hash": digest,
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            "game_date": game_date.isoformat() if game_date else None,
+        }
+        self._atomic_write(self._ref_path(endpoint, gid), json.dumps(ref).encode("utf-8"))
+        return digest
+
+
+PAYLOAD_CACHE = PayloadCache.from_env()
+
+
+class CachedEndpoint:
+    """
+    Drop-in wrapper for an nba_api box score endpoint class (used in FD).
+    Calling it like the class returns a loaded endpoint instance; cache hits
+    are parsed from the stored payload without touching the network.
+    """
+
+    def __init__(self, endpoint: str, cls, cache: PayloadCache = PAYLOAD_CACHE):
+        self.endpoint = endpoint
+        self.cls = cls
+        self.cache = cache
+
+    def from_cache(self, game_id: str, **kwargs):
+        """Return a loaded endpoint instance from the cache, or None on miss / expiry."""
+        payload = self.cache.get(self.endpoint, game_id)
+        if payload is None:
+            return None
+        obj = self.cls(game_id=game_id, get_request=False, **kwargs)
+        obj.nba_response = NBAStatsResponse(response=payload, status_code=200, url=None)
+        obj.load_response()
+        return obj
+
+    def __call__(self, game_id: str, refresh: bool = False, **kwargs):
+        if not refresh:
+            obj = self.from_cache(game_id, **kwargs)
+            if obj is not None:
+                return obj
+
+        obj = self.cls(game_id=game_id, **kwargs)
+        # only cache payloads that parsed (load_response ran without raising) and have rows:
+        # an empty box score (game not played / posted yet) must be re-requested next time
+        if has_rows(obj):
+            self.cache.put(self.endpoint, game_id, obj.nba_response.get_response())
+        return obj
+
+
+def has_rows(obj) -> bool:
+    """True when a loaded box score endpoint has both player and team rows."""
+    frames = obj.get_data_frames()
+    return len(frames) >= 2 and not frames[0].empty and not frames[1].empty
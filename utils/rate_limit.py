@@ -0,0 +1,213 @@
+# rate_limit.py
+import os
+import time
+import random
+import threading
+from json import JSONDecodeError
+from typing import Callable, Optional, TypeVar
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError, Timeout
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+from utils import logger
+
+
+T = TypeVar("T")
+
+# Retry classes for stats.nba.com calls
+THROTTLED = "throttled"   # 429 / connection resets / empty bodies: slow down hard
+SERVER = "server"         # 5xx: slow down, retry
+TIMEOUT = "timeout"       # read/connect timeouts: slow down, retry
+PERMANENT = "permanent"   # everything else: do not retry
+EMPTY = "empty"           # response without rows (game not processed yet): retry on a later run
+
+RETRYABLE = {THROTTLED, SERVER, TIMEOUT}
+
+
+class FetchError(Exception):
+    """Raised by call_with_retry once a call fails permanently or runs out of retries."""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+def classify_error(exc: BaseException) -> str:
+    """
+    Map an exception from an nba_api call to a retry class.
+    Non-2xx responses arrive as HTTPError (see check_http_status): 429 -> THROTTLED,
+    5xx -> SERVER, other 4xx -> PERMANENT. Dropped connections and HTML/empty 200
+    bodies (JSON decode errors) are how stats.nba.com throttles otherwise.
+    """
+    if isinstance(exc, HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        if status == 429:
+            return THROTTLED
+        if 500 <= status < 600:
+            return SERVER
+        return PERMANENT
+    if isinstance(exc, (TimeoutError, Timeout, ReadTimeoutError)):
+        return TIMEOUT
+    if isinstance(exc, (RequestsConnectionError, ProtocolError, ConnectionError, JSONDecodeError)):
+        return THROTTLED
+    return PERMANENT
+
+
+def _raise_for_status(response, *args, **kwargs):
+    response.raise_for_status()
+
+
+def check_http_status() -> None:
+    """
+    nba_api never checks the HTTP status, so error bodies reach its JSON parser and
+    surface as JSONDecodeError. Hook its shared stats session so non-2xx responses
+    raise HTTPError (response attached) before parsing.
+    """
+    from nba_api.stats.library.http import NBAStatsHTTP
+
+    hooks = NBAStatsHTTP.get_session().hooks["response"]
+    if _raise_for_status not in hooks:
+        hooks.append(_raise_for_status)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every fetch worker, with AIMD rate control:
+      - additive increase (~`increase` req/s per second of healthy responses)
+      - multiplicative decrease on slow responses or throttling/server errors
+    Decreases are applied at most once per `cooldown` seconds so a burst of
+    concurrent failures does not collapse the rate to the floor.
+    """
+
+    def __init__(
+        self,
+        rate: float = 4.0,
+        min_rate: float = 0.5,
+        max_rate: float = 12.0,
+        burst: float = 4.0,
+        increase: float = 0.25,
+        slow_factor: float = 0.85,
+        error_factor: float = 0.5,
+        latency_target: float = 4.0,
+        cooldown: float = 2.0,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.slow_factor = slow_factor
+        self.error_factor = error_factor
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        return cls(
+            rate=float(os.getenv("NBA_RATE", "4")),
+            min_rate=float(os.getenv("NBA_RATE_MIN", "0.5")),
+            max_rate=float(os.getenv("NBA_RATE_MAX", "12")),
+            burst=float(os.getenv("NBA_RATE_BURST", "4")),
+            latency_target=float(os.getenv("NBA_LATENCY_TARGET", "4")),
+        )
+
+    def share(self, n: int) -> None:
+        """Shrink this limiter to a 1/n share of its budget (one of n processes calling the API)."""
+        if n <= 1:
+            return
+        with self._lock:
+            self.rate /= n
+            self.min_rate /= n
+            self.max_rate /= n
+            self.increase /= n
+            self.burst = max(1.0, self.burst / n)
+            self._tokens = min(self._tokens, self.burst)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def acquire(self) -> None:
+        """Block until a request token is available."""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def _decrease(self, factor: float, reason: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            old = self.rate
+            self.rate = max(self.min_rate, self.rate * factor)
+        logger.warning(f"Rate {old:.2f} -> {self.rate:.2f} req/s ({reason})")
+
+    def on_success(self, latency: float) -> None:
+        if latency > self.latency_target:
+            self._decrease(self.slow_factor, f"slow response {latency:.1f}s")
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_error(self, kind: str) -> None:
+        if kind in (THROTTLED, SERVER):
+            self._decrease(self.error_factor, kind)
+        elif kind == TIMEOUT:
+            self._decrease(self.slow_factor, kind)
+
+
+STATS_LIMITER = RateLimiter.from_env()
+check_http_status()
+NBA_MAX_RETRIES = int(os.getenv("NBA_MAX_RETRIES", "6"))
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    label: str,
+    limiter: Optional[RateLimiter] = None,
+    max_retries: int = NBA_MAX_RETRIES,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+) -> T:
+    """
+    Run fn() under the shared rate limiter.
+    Retryable failures (throttling, 5xx, timeouts) back off exponentially with
+    full jitter; permanent failures raise FetchError immediately.
+    """
+    limiter = limiter or STATS_LIMITER
+    attempt = 0
+
+    while True:
+        limiter.acquire()
+        start = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            kind = classify_error(e)
+            if kind not in RETRYABLE:
+                raise FetchError(kind, f"{label}: {e}") from e
+
+            limiter.on_error(kind)
+            attempt += 1
+            if attempt > max_retries:
+                raise FetchError(kind, f"{label}: max retries exceeded ({e})") from e
+
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            time.sleep(delay)
+            continue
+
+        limiter.on_success(time.monotonic() - start)
+        return result
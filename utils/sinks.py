@@ -0,0 +1,268 @@
+# sinks.py
+import abc
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from utils import logger
+from utils.duckdb_sink import delete_gameid_rows, record_ingested, table_info, upsert_delete_insert
+from utils.league_game_log import BULK_STARTERS_BENCH
+from utils.nba_fetch import payload_hashes
+from utils.parquet_archive import ARCHIVE_ROOT, archive_games
+from utils.snowflake_sink import NBA_SF_BATCH_GAMES, run_parallel, upsert_to_snowflake
+
+
+# Destinations for fetched box score batches. One fetch pipeline
+# (utils.nba_fetch.fetch_games_all_endpoints) hands every batch to a SinkFanout, which
+# feeds each configured sink on its own writer thread with its own batch size, so a game
+# is downloaded once per run however many destinations are configured.
+
+# raw.fetch_retry_queue error class for games fetched but not written by a sink.
+SINK_ERROR = "sink"
+
+
+class Sink(abc.ABC):
+    """
+    A destination for (endpoint, teams_df, players_df) batches of box score frames.
+    batch_games: games to accumulate per endpoint before write() (None: write every batch).
+    per_endpoint: False -> one writer thread for the sink, so it may hold connections;
+    True -> one writer thread per endpoint (write() must then be thread-safe).
+    """
+
+    name = "sink"
+    batch_games: Optional[int] = None
+    per_endpoint = False
+
+    @abc.abstractmethod
+    def write(
+        self,
+        endpoint: str,
+        teams_df: pd.DataFrame,
+        players_df: pd.DataFrame,
+        gids: List[str],
+        hashes: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Write one accumulated batch; raise on failure (the fan-out records the gids as failed)."""
+
+    def close(self) -> None:
+        pass
+
+
+def _drop_bulk_team_rows(conn, teams_df: pd.DataFrame) -> None:
+    """Box score starters/bench rows replace the single bulk-log row of the same game."""
+    sb_col = next((c for c in teams_df.columns if c.lower() == "startersbench"), None)
+    gid_col = next(c for c in teams_df.columns if c.lower() == "gameid")
+    if sb_col is None:
+        return
+    gids = sorted(set(teams_df.loc[teams_df[sb_col] != BULK_STARTERS_BENCH, gid_col].astype(str)))
+    schema, table, _ = table_info("traditional", is_team=True)
+    delete_gameid_rows(conn, schema, table, gids, "startersbench = ?", [BULK_STARTERS_BENCH])
+
+
+def upsert_endpoint_batch(conn, endpoint: str, teams_df: pd.DataFrame, players_df: pd.DataFrame) -> None:
+    """
+    Batch upsert for an endpoint (one call per table).
+    """
+    ts, tt, tkeys = table_info(endpoint, is_team=True)
+    ps, pt, pkeys = table_info(endpoint, is_team=False)
+
+    if teams_df is not None and not teams_df.empty:
+        if endpoint == "traditional":
+            _drop_bulk_team_rows(conn, teams_df)
+        upsert_delete_insert(conn, teams_df, schema=ts, table=tt, key_cols=tkeys)
+    if players_df is not None and not players_df.empty:
+        upsert_delete_insert(conn, players_df, schema=ps, table=pt, key_cols=pkeys)
+
+
+class DuckDBSink(Sink):
+    """
+    raw.teams_<ep> / raw.players_<ep> upserts + raw.ingest_manifest (utils.duckdb_sink).
+    Writes through its own cursor of `conn`, so the caller may keep using `conn`.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, conn, batch_games: Optional[int] = None):
+        self.conn = conn.cursor()
+        self.batch_games = batch_games
+
+    def write(self, endpoint, teams_df, players_df, gids, hashes=None) -> None:
+        upsert_endpoint_batch(self.conn, endpoint, teams_df, players_df)
+        if hashes is None:
+            hashes = payload_hashes(endpoint, gids)
+        record_ingested(self.conn, endpoint, teams_df, players_df, hashes)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class ArchiveSink(Sink):
+    """Per-game Parquet segments (utils.parquet_archive)."""
+
+    name = "archive"
+
+    def __init__(self, game_dates: Dict[str, str], root: str = ARCHIVE_ROOT, batch_games: Optional[int] = None):
+        self.game_dates = game_dates
+        self.root = root
+        self.batch_games = batch_games
+
+    def write(self, endpoint, teams_df, players_df, gids, hashes=None) -> None:
+        archive_games(teams_df, "teams", endpoint, self.game_dates, self.root)
+        archive_games(players_df, "players", endpoint, self.game_dates, self.root)
+
+
+class SnowflakeSink(Sink):
+    """
+    NBA.RAW MERGEs through a stage table (utils.snowflake_sink.upsert_to_snowflake).
+    One writer per endpoint, and each write runs its teams + players MERGEs on separate
+    pooled connections, so up to every table is in flight at once (bounded by the pool).
+    """
+
+    name = "snowflake"
+    per_endpoint = True
+
+    def __init__(self, pool, batch_games: Optional[int] = NBA_SF_BATCH_GAMES):
+        self.pool = pool
+        self.batch_games = batch_games
+
+    def write(self, endpoint, teams_df, players_df, gids, hashes=None) -> None:
+        tasks = {
+            "teams": lambda conn, df=teams_df.copy(): upsert_to_snowflake(df, endpoint, is_team=True, conn=conn),
+            "players": lambda conn, df=players_df.copy(): upsert_to_snowflake(df, endpoint, is_team=False, conn=conn),
+        }
+        done = run_parallel(self.pool, tasks)
+        failed = [kind for kind in tasks if kind not in done]
+        if failed:
+            raise RuntimeError(f"{endpoint} {'/'.join(failed)} upsert failed")
+
+
+# ============================================================
+# FAN-OUT (BOUNDED QUEUE PER SINK WRITER)
+# ============================================================
+
+# Batches waiting per sink writer. A full queue blocks the fetch loop (backpressure):
+# memory stays bounded when writes fall behind, and the run takes ~max(fetch, write).
+NBA_SINK_QUEUE_BATCHES = int(os.getenv("NBA_SINK_QUEUE_BATCHES", "4"))
+
+_STOP = object()
+
+
+class _SinkWriter:
+    """Writer thread for one sink (or one endpoint of it): accumulates batches per endpoint up to sink.batch_games."""
+
+    def __init__(self, sink: Sink, max_pending: int, label: Optional[str] = None):
+        self.sink = sink
+        self.label = label or sink.name
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_pending))
+        self.pending: Dict[str, list] = {}
+        self.failed: Dict[str, List[str]] = {}
+        self.busy = 0.0  # seconds spent in sink.write
+        self.blocked = 0.0  # seconds the producer waited on a full queue
+        self.thread = threading.Thread(target=self._run, name=f"sink-{self.label}", daemon=True)
+        self.thread.start()
+
+    def put(self, item) -> None:
+        start = time.perf_counter()
+        self.queue.put(item)
+        self.blocked += time.perf_counter() - start
+
+    def _write(self, endpoint: str) -> None:
+        parts = self.pending.pop(endpoint, [])
+        if not parts:
+            return
+        gids = [g for p in parts for g in p[2]]
+        start = time.perf_counter()
+        try:
+            teams_df = pd.concat([p[0] for p in parts], ignore_index=True)
+            players_df = pd.concat([p[1] for p in parts], ignore_index=True)
+            hashes = None
+            if any(p[3] is not None for p in parts):
+                hashes = {}
+                for p in parts:
+                    hashes.update(p[3] if p[3] is not None else payload_hashes(endpoint, p[2]))
+            self.sink.write(endpoint, teams_df, players_df, gids, hashes)
+            logger.info(f"{self.label}: wrote {endpoint} ({len(set(gids))} games)")
+        except Exception as e:
+            logger.error(f"{self.label}: write failed for {endpoint} ({len(set(gids))} games): {e}")
+            self.failed.setdefault(endpoint, []).extend(gids)
+        finally:
+            self.busy += time.perf_counter() - start
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                for endpoint in list(self.pending):
+                    self._write(endpoint)
+                return
+            endpoint, teams_df, players_df, gids, hashes = item
+            self.pending.setdefault(endpoint, []).append((teams_df, players_df, gids, hashes))
+            batch = self.sink.batch_games
+            if batch is None or sum(len(p[2]) for p in self.pending[endpoint]) >= batch:
+                self._write(endpoint)
+
+
+class SinkFanout:
+    """
+    on_batch callback for fetch_games_all_endpoints that hands every fetched batch to
+    each sink; the sinks write in parallel on their own threads while fetching goes on
+    (sinks with per_endpoint get one writer per endpoint).
+    Each writer takes at most `max_pending` queued batches; beyond that the caller blocks.
+    close() flushes and joins the writers and returns {sink name: {endpoint: failed gids}}.
+    Do not use a sink's connection from other threads until close() returns.
+    """
+
+    def __init__(self, sinks: List[Sink], max_pending: int = NBA_SINK_QUEUE_BATCHES):
+        self.started = time.perf_counter()
+        self.sinks = sinks
+        self.max_pending = max_pending
+        # (sink, endpoint) -> writer; endpoint is None unless the sink is per_endpoint
+        self.routes: Dict[tuple, _SinkWriter] = {}
+        self.writers: List[_SinkWriter] = []
+        for sink in sinks:
+            if not sink.per_endpoint:
+                self._writer(sink, None)
+
+    def _writer(self, sink: Sink, endpoint: Optional[str]) -> _SinkWriter:
+        key = (sink, endpoint if sink.per_endpoint else None)
+        if key not in self.routes:
+            label = f"{sink.name}[{endpoint}]" if sink.per_endpoint else sink.name
+            self.routes[key] = _SinkWriter(sink, self.max_pending, label)
+            self.writers.append(self.routes[key])
+        return self.routes[key]
+
+    def __call__(
+        self,
+        endpoint: str,
+        players_df: pd.DataFrame,
+        teams_df: pd.DataFrame,
+        ok_gids: List[str],
+        hashes: Optional[Dict[str, str]] = None,
+    ) -> None:
+        for sink in self.sinks:
+            self._writer(sink, endpoint).put((endpoint, teams_df, players_df, list(ok_gids), hashes))
+
+    def close(self) -> Dict[str, Dict[str, List[str]]]:
+        for writer in self.writers:
+            writer.put(_STOP)
+        for writer in self.writers:
+            writer.thread.join()
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.error(f"{sink.name}: close failed: {e}")
+
+        elapsed = time.perf_counter() - self.started
+        stages = ", ".join(f"{w.label} write {w.busy:.1f}s (fetch blocked {w.blocked:.1f}s)" for w in self.writers)
+        logger.info(f"Pipeline: {elapsed:.1f}s total; {stages}")
+
+        failures: Dict[str, Dict[str, List[str]]] = {}
+        for w in self.writers:
+            for endpoint, gids in w.failed.items():
+                failures.setdefault(w.sink.name, {}).setdefault(endpoint, []).extend(gids)
+        return failures
@@ -0,0 +1,351 @@
+# snowflake_sink.py
+import os
+import re
+import math
+import time
+import hashlib
+import queue
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+import pandas as pd
+
+from utils import logger
+from utils.league_game_log import BULK_STARTERS_BENCH
+
+
+T = TypeVar("T")
+
+
+SF_DATABASE = "NBA"
+SF_RAW_SCHEMA = "RAW"
+SF_STAGE_SCHEMA = "STAGE"
+
+# Per-row hash of the non-key columns, stored on RAW tables; MERGE skips matched rows
+# whose hash did not change, so rescrapes of unchanged games rewrite nothing.
+ROW_HASH_COL = "_ROW_HASH"
+
+# Connections kept open for concurrent per-table work
+NBA_SF_POOL = int(os.getenv("NBA_SF_POOL", "4"))
+
+# Games per endpoint accumulated before one stage load + MERGE (utils.sinks.SnowflakeSink)
+NBA_SF_BATCH_GAMES = int(os.getenv("NBA_SF_BATCH_GAMES", "500"))
+
+
+def get_snowflake_conn():
+    """Create and return a Snowflake connection."""
+    from snowflake.connector import connect
+
+    return connect(
+        account="RPOSWFZ-OIB57673",
+        user="grunk",
+        password=os.getenv("PAT"),  # or SNOWFLAKE_PASSWORD if you switch
+        warehouse="BACKEND_WH",
+        database=SF_DATABASE,
+        schema=SF_RAW_SCHEMA,
+    )
+
+
+def sf_table_info(endpoint: str, is_team: bool) -> Tuple[str, str, List[str]]:
+    """
+    Snowflake naming convention (mirrors duckdb_sink.table_info):
+      NBA.RAW.TEAMS_<ENDPOINT> / NBA.RAW.PLAYERS_<ENDPOINT>, staged via NBA.STAGE.<table>_STAGE
+    Returns (target_table, stage_table, key_cols).
+    """
+    if is_team:
+        target_table = f"TEAMS_{endpoint.upper()}"
+        if endpoint.lower() == "traditional":
+            key_cols = ["GAMEID", "TEAMID", "STARTERSBENCH"]
+        else:
+            key_cols = ["GAMEID", "TEAMID"]
+    else:
+        target_table = f"PLAYERS_{endpoint.upper()}"
+        key_cols = ["GAMEID", "TEAMID", "PERSONID"]
+    return target_table, f"{target_table}_STAGE", key_cols
+
+
+# Row hash recipe, shared by add_row_hash (fetched pandas frames) and row_hash_sql (typed
+# DuckDB rows): md5 over the non-key columns in upper-case name order, joined by \x1f, each
+# value in one canonical text form so both sides hash a row the same way:
+#   NULL -> ''; booleans -> 'true' / 'false'
+#   numbers, and text that reads as one (except leading-zero codes like '07'):
+#     integral and below 1e15 -> '12', otherwise 15 significant digits ('%.15g')
+#   anything else -> its trimmed text
+_NUMBER_RE = r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?"
+_CODE_RE = r"0\d+"
+
+
+def _hashed_cols(columns: List[str], key_cols: List[str]) -> List[str]:
+    def name(c: str) -> str:
+        return c.strip('"').upper()
+
+    keys = {name(k) for k in key_cols}
+    return sorted((c for c in columns if name(c) not in keys and name(c) != ROW_HASH_COL), key=name)
+
+
+def _canonical_number(x: float) -> str:
+    if math.isfinite(x) and x == math.trunc(x) and abs(x) < 1e15:
+        return str(int(x))
+    return format(x, ".15g")
+
+
+def _canonical_text(v) -> str:
+    if v is None or v is pd.NA or v is pd.NaT:
+        return ""
+    if pd.api.types.is_bool(v):
+        return "true" if v else "false"
+    if pd.api.types.is_number(v):
+        return "" if pd.isna(v) else _canonical_number(float(v))
+    t = str(v).strip()
+    if re.fullmatch(_NUMBER_RE, t) and not re.fullmatch(_CODE_RE, t):
+        return _canonical_number(float(t))
+    return t
+
+
+def add_row_hash(df: pd.DataFrame, key_cols: List[str]) -> pd.DataFrame:
+    """Add ROW_HASH_COL (recipe above) computed from the frame's values."""
+    cols = _hashed_cols(list(df.columns), key_cols)
+    if cols:
+        text = pd.concat([df[c].map(_canonical_text) for c in cols], axis=1).agg("\x1f".join, axis=1)
+    else:
+        text = pd.Series("", index=df.index)
+    df = df.copy()
+    df[ROW_HASH_COL] = [hashlib.md5(t.encode("utf-8")).hexdigest() for t in text]
+    return df
+
+
+def row_hash_sql(columns: List[str], key_cols: List[str]) -> str:
+    """DuckDB SQL expression computing the add_row_hash recipe inside a query."""
+    parts = []
+    for c in _hashed_cols(columns, key_cols):
+        v = f"TRIM(CAST({c} AS VARCHAR))"
+        d = f"CAST({v} AS DOUBLE)"
+        parts.append(
+            f"CASE WHEN {c} IS NULL THEN '' "
+            f"WHEN regexp_full_match({v}, '{_NUMBER_RE}') AND NOT regexp_full_match({v}, '{_CODE_RE}') THEN "
+            f"CASE WHEN {d} = TRUNC({d}) AND ABS({d}) < 1e15 THEN CAST(CAST({d} AS BIGINT) AS VARCHAR) "
+            f"ELSE printf('%.15g', {d}) END "
+            f"ELSE {v} END"
+        )
+    return f"MD5(CONCAT_WS(CHR(31), {', '.join(parts) or chr(39) * 2}))"
+
+
+_HASHED_TABLES = set()
+
+
+def ensure_row_hash_column(cur, table: str) -> None:
+    """Add ROW_HASH_COL to a table once per process (legacy rows start NULL and update once)."""
+    if table in _HASHED_TABLES:
+        return
+    cur.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {ROW_HASH_COL} STRING")
+    _HASHED_TABLES.add(table)
+
+
+def merge_sql(target_table: str, stage_table: str, columns: List[str], key_cols: List[str]) -> str:
+    """
+    MERGE NBA.STAGE.<stage_table> into NBA.RAW.<target_table> on key_cols.
+    Matched rows keep their current value where the staged value is NULL.
+    With ROW_HASH_COL staged, matched rows are only updated when the hash differs.
+    """
+    non_key_cols = [c for c in columns if c not in key_cols and c != ROW_HASH_COL]
+    update_clause = ", ".join([f"{c} = COALESCE(s.{c}, t.{c})" for c in non_key_cols])
+
+    matched = "WHEN MATCHED"
+    if ROW_HASH_COL in columns:
+        matched += f" AND (t.{ROW_HASH_COL} IS NULL OR t.{ROW_HASH_COL} <> s.{ROW_HASH_COL})"
+        update_clause += f", {ROW_HASH_COL} = s.{ROW_HASH_COL}"
+
+    return f"""
+        MERGE INTO {SF_DATABASE}.{SF_RAW_SCHEMA}.{target_table} AS t
+        USING {SF_DATABASE}.{SF_STAGE_SCHEMA}.{stage_table} AS s
+        ON {" AND ".join([f"t.{k} = s.{k}" for k in key_cols])}
+        {matched} THEN UPDATE SET {update_clause}
+        WHEN NOT MATCHED THEN INSERT ({','.join(columns)})
+        VALUES ({','.join(['s.' + c for c in columns])});
+    """
+
+
+def bulk_rows_delete_sql(target_table: str, stage_table: str) -> Optional[str]:
+    """
+    DELETE of the bulk game-log team rows (STARTERSBENCH = BULK_STARTERS_BENCH,
+    utils.league_game_log) of games staged with box score starters/bench rows. The MERGE
+    keys on STARTERSBENCH, so without it both would stay and team totals double-count.
+    None for tables that never hold bulk rows.
+    """
+    if target_table != sf_table_info("traditional", is_team=True)[0]:
+        return None
+    return f"""
+        DELETE FROM {SF_DATABASE}.{SF_RAW_SCHEMA}.{target_table}
+        WHERE STARTERSBENCH = '{BULK_STARTERS_BENCH}'
+          AND GAMEID IN (
+            SELECT GAMEID FROM {SF_DATABASE}.{SF_STAGE_SCHEMA}.{stage_table}
+            WHERE STARTERSBENCH <> '{BULK_STARTERS_BENCH}'
+          )
+    """
+
+
+def merge_stage(cur, target_table: str, stage_table: str, columns: List[str], key_cols: List[str]) -> None:
+    """
+    MERGE a loaded NBA.STAGE table into NBA.RAW (merge_sql); replaced bulk rows are deleted
+    first, in the same transaction.
+    """
+    delete_sql = bulk_rows_delete_sql(target_table, stage_table)
+    if delete_sql is None:
+        cur.execute(merge_sql(target_table, stage_table, columns, key_cols))
+        return
+    cur.execute("BEGIN")
+    try:
+        cur.execute(delete_sql)
+        cur.execute(merge_sql(target_table, stage_table, columns, key_cols))
+        cur.execute("COMMIT")
+    except Exception:
+        cur.execute("ROLLBACK")
+        raise
+
+
+def upsert_to_snowflake(df, endpoint, is_team, conn):
+    """
+    Upserts a DataFrame into Snowflake using a staging table and MERGE.
+    Handles both team and player endpoints.
+    """
+    from snowflake.connector.pandas_tools import write_pandas
+
+    # Normalize column names to uppercase for Snowflake
+    df.columns = [c.upper() for c in df.columns]
+
+    target_table, stage_table, key_cols = sf_table_info(endpoint, is_team)
+
+    # MERGE needs one source row per key (batches can repeat a game on rescrape)
+    df = df.drop_duplicates(subset=key_cols, keep="last")
+    df = add_row_hash(df, key_cols)
+
+    col_defs = ", ".join([f"{col} STRING" for col in df.columns])
+    create_stage_sql = f"""
+        CREATE TABLE IF NOT EXISTS STAGE.{stage_table} ({col_defs});
+    """
+    with conn.cursor() as cur:
+        cur.execute(create_stage_sql)
+        ensure_row_hash_column(cur, f"NBA.STAGE.{stage_table}")
+        ensure_row_hash_column(cur, f"NBA.RAW.{target_table}")
+        # leftovers from an interrupted run must not be merged again
+        cur.execute(f"TRUNCATE TABLE STAGE.{stage_table}")
+
+    try:
+        success, _, _, _ = write_pandas(
+            conn,
+            df,
+            table_name=stage_table,
+            schema="STAGE",
+            database="NBA",
+        )
+        if not success:
+            raise RuntimeError("stage load reported failure")
+    except Exception as e:
+        # the caller must not count the batch as written (run_parallel, SinkFanout)
+        logger.error(f"problem uploading data for {target_table}, {e}")
+        raise
+
+    with conn.cursor() as cur:
+        merge_stage(cur, target_table, stage_table, list(df.columns), key_cols)
+        cur.execute(f"TRUNCATE TABLE STAGE.{stage_table}")
+
+    logger.info(f"Upsert complete for {target_table} ({len(df)} rows).")
+
+
+# ============================================================
+# CONNECTION POOL / CONCURRENT EXECUTION
+# ============================================================
+
+class SnowflakePool:
+    """
+    Small thread-safe pool of reusable Snowflake connections.
+    Connections are opened lazily (up to `size`) and handed back after each use,
+    so concurrent per-table work does not pay a login per statement.
+    """
+
+    def __init__(self, size: int = NBA_SF_POOL, factory: Callable = get_snowflake_conn):
+        self.size = max(1, size)
+        self._factory = factory
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                return self._factory()
+        return self._idle.get()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+def run_async(conn, statements: Dict[Hashable, str], poll: float = 0.25) -> Dict[Hashable, list]:
+    """
+    Submit independent queries together with the connector's async execution and
+    return {key: rows}; total wait is the slowest query, not the sum.
+    """
+    query_ids = {}
+    for key, sql in statements.items():
+        with conn.cursor() as cur:
+            cur.execute_async(sql)
+            query_ids[key] = cur.sfqid
+
+    pending = dict(query_ids)
+    while pending:
+        for key, sfqid in list(pending.items()):
+            status = conn.get_query_status_throw_if_error(sfqid)
+            if not conn.is_still_running(status):
+                pending.pop(key)
+        if pending:
+            time.sleep(poll)
+
+    results = {}
+    for key, sfqid in query_ids.items():
+        with conn.cursor() as cur:
+            cur.get_results_from_sfqid(sfqid)
+            results[key] = cur.fetchall()
+    return results
+
+
+def run_parallel(pool: SnowflakePool, tasks: Dict[Hashable, Callable[..., T]]) -> Dict[Hashable, T]:
+    """
+    Run task(conn) for every task concurrently, each on a pooled connection.
+    Failed tasks are logged and left out of the result.
+    """
+    def _run(task):
+        with pool.connection() as conn:
+            return task(conn)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=pool.size) as ex:
+        futs = {key: ex.submit(_run, task) for key, task in tasks.items()}
+        for key, fut in futs.items():
+            try:
+                results[key] = fut.result()
+            except Exception as e:
+                logger.error(f"Snowflake task {key} failed: {e}")
+    return results